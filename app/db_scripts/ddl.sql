@@ -144,6 +144,8 @@ CREATE  TABLE callensights.cns_media_def (
 	cm_lang_code         VARCHAR(10)       ,
 	cm_product           VARCHAR(50)       ,
 	cm_lead_id           INT       ,
+	cm_upload_id         VARCHAR(1024)       ,
+	cm_probe_attempts    INT  DEFAULT ('0')  NOT NULL   ,
 	CONSTRAINT unq_cns_media_def UNIQUE ( cm_media_code ) ,
 	CONSTRAINT fk_cns_media_def_cns_lead_def FOREIGN KEY ( cm_lead_id ) REFERENCES callensights.cns_lead_def( cl_lead_id ) ON DELETE NO ACTION ON UPDATE NO ACTION,
 	CONSTRAINT fk_cns_media_def_cns_user_def FOREIGN KEY ( cm_user_id ) REFERENCES callensights.cns_user_def( cu_user_id ) ON DELETE NO ACTION ON UPDATE NO ACTION
@@ -153,6 +155,25 @@ CREATE INDEX fk_cns_media_def_cns_user_def ON callensights.cns_media_def ( cm_us
 
 CREATE INDEX fk_cns_media_def_cns_lead_def ON callensights.cns_media_def ( cm_lead_id );
 
+CREATE INDEX idx_cns_media_def_store_file ON callensights.cns_media_def ( cm_store_file );
+
+CREATE INDEX idx_cns_media_def_event ON callensights.cns_media_def ( cm_event_dt, cm_media_id );
+
+CREATE INDEX idx_cns_media_def_user_event ON callensights.cns_media_def ( cm_user_id, cm_event_dt, cm_media_id );
+
+CREATE INDEX idx_cns_media_def_lead_event ON callensights.cns_media_def ( cm_lead_id, cm_event_dt, cm_media_id );
+
+CREATE  TABLE callensights.cns_media_upload_part ( 
+	mp_part_id           INT    NOT NULL AUTO_INCREMENT  PRIMARY KEY,
+	mp_media_id          INT    NOT NULL   ,
+	mp_part_number       INT    NOT NULL   ,
+	mp_etag              VARCHAR(100)    NOT NULL   ,
+	mp_part_size         BIGINT       ,
+	mp_uploaded_dt       DATETIME  DEFAULT (now())     ,
+	CONSTRAINT unq_cns_media_upload_part UNIQUE ( mp_media_id, mp_part_number ) ,
+	CONSTRAINT fk_cns_media_upload_part FOREIGN KEY ( mp_media_id ) REFERENCES callensights.cns_media_def( cm_media_id ) ON DELETE CASCADE ON UPDATE NO ACTION
+ ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 CREATE  TABLE callensights.cns_media_status ( 
 	ms_status_id         INT    NOT NULL AUTO_INCREMENT  PRIMARY KEY,
 	ms_media_id          INT    NOT NULL   ,
@@ -324,6 +345,11 @@ ALTER TABLE callensights.cns_media_def MODIFY cm_bucket VARCHAR(100)     COMMENT
 
 ALTER TABLE callensights.cns_media_def MODIFY cm_event_dt DATETIME   DEFAULT (now())  COMMENT 'The date and time when the media file was registered';
 
+ALTER TABLE callensights.cns_media_def MODIFY cm_is_uploaded BOOLEAN  DEFAULT ('0')  NOT NULL   COMMENT 'set once the media file is confirmed in the storage bucket';
+
+-- Backfill cm_is_uploaded for existing rows before setting REQUIRE_UPLOADED_MEDIA, from the application root:
+--   python -m app.src.core.services.upload_state_service reconcile
+
 ALTER TABLE callensights.cns_media_def MODIFY cm_rep_name VARCHAR(100)     COMMENT 'representative name. Typically the user who uploaded the media file';
 
 ALTER TABLE callensights.cns_media_def MODIFY cm_conv_type VARCHAR(100)     COMMENT 'conversation type';
@@ -336,6 +362,18 @@ ALTER TABLE callensights.cns_media_def MODIFY cm_product VARCHAR(50)     COMMENT
 
 ALTER TABLE callensights.cns_media_def MODIFY cm_lead_id INT     COMMENT 'lead id refering to leads def';
 
+ALTER TABLE callensights.cns_media_def MODIFY cm_upload_id VARCHAR(1024)     COMMENT 'S3 multipart upload id while a multipart upload is in progress';
+
+ALTER TABLE callensights.cns_media_def MODIFY cm_probe_attempts INT  DEFAULT ('0')  NOT NULL   COMMENT 'failed header probes of the media file, stops retrying at MEDIA_PROBE_MAX_ATTEMPTS';
+
+ALTER TABLE callensights.cns_media_upload_part COMMENT 'parts of in-progress multipart media uploads';
+
+ALTER TABLE callensights.cns_media_upload_part MODIFY mp_part_number INT  NOT NULL   COMMENT 'S3 part number, 1 to 10000';
+
+ALTER TABLE callensights.cns_media_upload_part MODIFY mp_etag VARCHAR(100)  NOT NULL   COMMENT 'ETag returned by S3 for the uploaded part';
+
+ALTER TABLE callensights.cns_media_upload_part MODIFY mp_part_size BIGINT     COMMENT 'size of the part in bytes';
+
 ALTER TABLE callensights.cns_media_status COMMENT 'Process status of media';
 
 ALTER TABLE callensights.cns_media_status MODIFY ms_media_id INT  NOT NULL   COMMENT 'Media id refer to media def table';
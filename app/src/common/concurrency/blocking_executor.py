@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import lru_cache, partial
+from typing import Callable, Any, Dict, TypeVar
+
+from app.src.common.config.app_settings import get_app_settings
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for the blocking client calls (boto3, pymongo) made from async routes.
+    Tracks queue depth and how long work waits for a free thread, so pool saturation can be
+    told apart from slow backends.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cns-blocking")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        call = partial(func, *args, **kwargs)
+        with self._lock:
+            self._queued += 1
+
+        future = self._executor.submit(self._timed_call, call, time.perf_counter())
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _timed_call(self, call: Callable[[], T], submitted_at: float) -> T:
+        started_at = time.perf_counter()
+        wait = started_at - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._started += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._total_run += time.perf_counter() - started_at
+
+    def _on_done(self, future: Future) -> None:
+        # work cancelled before a thread picked it up never reaches _timed_call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started, completed = self._started, self._completed
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": completed,
+                "avg_wait_ms": round(self._total_wait * 1000 / started, 3) if started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "avg_run_ms": round(self._total_run * 1000 / completed, 3) if completed else 0.0
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_blocking_executor() -> BlockingExecutor:
+    settings = get_app_settings()
+    return BlockingExecutor(settings.BLOCKING_POOL_SIZE)
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking call on the shared executor without stalling the event loop.
+    """
+    return await get_blocking_executor().run(func, *args, **kwargs)
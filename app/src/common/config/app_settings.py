@@ -12,10 +12,17 @@ class Settings(BaseSettings):
     MYSQLDB_SECRET: str = os.environ['MYSQLDB_SECRET']
     CLERK_SECRET: str = os.environ['CLERK_SECRET']
     CLERK_AUDIENCE: str = os.environ['CLERK_AUDIENCE']
+    JWT_CACHE_SIZE: int = os.environ.get('JWT_CACHE_SIZE', 10000)
+    PRINCIPAL_CACHE_SIZE: int = os.environ.get('PRINCIPAL_CACHE_SIZE', 10000)
+    # Upper bound for a role change or user removal to reach the other workers
+    PRINCIPAL_CACHE_TTL: int = os.environ.get('PRINCIPAL_CACHE_TTL', 60)
     REGION: str = os.environ['REGION']
+    SECRET_CACHE_TTL: int = os.environ.get('SECRET_CACHE_TTL', 3600)
+    SECRET_REFRESH_AFTER: int = os.environ.get('SECRET_REFRESH_AFTER', 3000)
 
     # Database Configuration
     DEFAULT_SCHEMA: str = os.environ['DEFAULT_SCHEMA']
+    DATABASE_URL: Optional[str] = os.environ.get('DATABASE_URL')
 
     # AWS Buckets
     MEDIA_BUCKET: str = os.environ['MEDIA_BUCKET']
@@ -27,6 +34,83 @@ class Settings(BaseSettings):
     MEDIA_MAX_SIZE: int = os.environ['MEDIA_MAX_SIZE']
     IS_LOCAL: Optional[bool] = os.environ.get('IS_LOCAL', False)
 
+    # Database pool configuration (per worker process)
+    DB_POOL_SIZE: int = os.environ.get('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW: int = os.environ.get('DB_MAX_OVERFLOW', 20)
+    DB_POOL_TIMEOUT: int = os.environ.get('DB_POOL_TIMEOUT', 30)
+    DB_POOL_RECYCLE: int = os.environ.get('DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING: bool = os.environ.get('DB_POOL_PRE_PING', True)
+
+    # MongoDB client configuration (per worker process)
+    MONGO_URL: Optional[str] = os.environ.get('MONGO_URL')
+    MONGO_MAX_POOL_SIZE: int = os.environ.get('MONGO_MAX_POOL_SIZE', 50)
+    MONGO_MIN_POOL_SIZE: int = os.environ.get('MONGO_MIN_POOL_SIZE', 0)
+    MONGO_CONNECT_TIMEOUT_MS: int = os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 5000)
+    MONGO_SOCKET_TIMEOUT_MS: int = os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 30000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000)
+    # 'primary' keeps reads consistent with the writes just made; secondary reads are opt-in
+    MONGO_READ_PREFERENCE: str = os.environ.get('MONGO_READ_PREFERENCE', 'primary')
+    MONGO_ENSURE_INDEXES: bool = os.environ.get('MONGO_ENSURE_INDEXES', True)
+    # zlib or zstd (needs the zstandard package); unset stores transcripts/feedbacks uncompressed
+    DOCUMENT_COMPRESSION: Optional[str] = os.environ.get('DOCUMENT_COMPRESSION')
+    DOCUMENT_COMPRESSION_LEVEL: Optional[int] = os.environ.get('DOCUMENT_COMPRESSION_LEVEL')
+    DOCUMENT_COMPRESS_MIN_BYTES: int = os.environ.get('DOCUMENT_COMPRESS_MIN_BYTES', 1024)
+
+    # Thread pool for blocking boto3/pymongo calls (per worker process)
+    BLOCKING_POOL_SIZE: int = os.environ.get('BLOCKING_POOL_SIZE', 16)
+
+    # Size of each chunk read from S3 while streaming media to the client
+    MEDIA_STREAM_CHUNK_SIZE: int = os.environ.get('MEDIA_STREAM_CHUNK_SIZE', 256 * 1024)
+
+    # Presigned GET URLs handed out for media playback
+    MEDIA_URL_EXPIRY: int = os.environ.get('MEDIA_URL_EXPIRY', 900)
+    MEDIA_URL_REFRESH_MARGIN: int = os.environ.get('MEDIA_URL_REFRESH_MARGIN', 60)
+    MEDIA_URL_CACHE_SIZE: int = os.environ.get('MEDIA_URL_CACHE_SIZE', 10000)
+
+    # Multipart uploads of large recordings
+    MEDIA_PART_SIZE: int = os.environ.get('MEDIA_PART_SIZE', 16 * 1024 * 1024)
+    MEDIA_PART_URL_EXPIRY: int = os.environ.get('MEDIA_PART_URL_EXPIRY', 3600)
+    MEDIA_MAX_PARTS_PER_REQUEST: int = os.environ.get('MEDIA_MAX_PARTS_PER_REQUEST', 100)
+
+    # Upload-completion ingestion; the token is shared with the S3 event forwarder
+    INGEST_TOKEN: Optional[str] = os.environ.get('INGEST_TOKEN')
+    # Default seconds between runs of `upload_state_service watch`, which is started as one
+    # dedicated process (or replaced by a cron of `reconcile`), never inside the web workers
+    UPLOAD_RECONCILE_INTERVAL: int = os.environ.get('UPLOAD_RECONCILE_INTERVAL', 0)
+    # Refuse transcript/feedback reads of media whose upload is not confirmed. Only enable it
+    # after `python -m app.src.core.services.upload_state_service reconcile` has backfilled
+    # cm_is_uploaded for existing rows.
+    REQUIRE_UPLOADED_MEDIA: bool = os.environ.get('REQUIRE_UPLOADED_MEDIA', False)
+
+    # Header probing of uploaded media for duration and size
+    MEDIA_PROBE_BATCH_SIZE: int = os.environ.get('MEDIA_PROBE_BATCH_SIZE', 50)
+    MEDIA_PROBE_BLOCK_SIZE: int = os.environ.get('MEDIA_PROBE_BLOCK_SIZE', 64 * 1024)
+    # Failed probes (e.g. deleted keys, empty objects) after which a media is no longer tried
+    MEDIA_PROBE_MAX_ATTEMPTS: int = os.environ.get('MEDIA_PROBE_MAX_ATTEMPTS', 3)
+
+    # Page sizes of list endpoints
+    PAGE_SIZE_DEFAULT: int = os.environ.get('PAGE_SIZE_DEFAULT', 50)
+    PAGE_SIZE_MAX: int = os.environ.get('PAGE_SIZE_MAX', 500)
+
+    # Rows fetched per round trip by streaming exports
+    EXPORT_BATCH_SIZE: int = os.environ.get('EXPORT_BATCH_SIZE', 1000)
+
+    # In-process cache of completed transcripts and feedback
+    DOCUMENT_CACHE_BYTES: int = os.environ.get('DOCUMENT_CACHE_BYTES', 64 * 1024 * 1024)
+    TRANSCRIPT_WINDOW_MAX_SEGMENTS: int = os.environ.get('TRANSCRIPT_WINDOW_MAX_SEGMENTS', 500)
+
+    # Full-text search over transcripts
+    SEARCH_MAX_CANDIDATES: int = os.environ.get('SEARCH_MAX_CANDIDATES', 20000)
+    SEARCH_MAX_HIGHLIGHTS: int = os.environ.get('SEARCH_MAX_HIGHLIGHTS', 3)
+
+    # Server-sent status stream of transcription/feedback generation
+    STATUS_WATCH_INTERVAL: float = os.environ.get('STATUS_WATCH_INTERVAL', 2)
+    STATUS_STREAM_TIMEOUT: int = os.environ.get('STATUS_STREAM_TIMEOUT', 300)
+    STATUS_STREAM_HEARTBEAT: int = os.environ.get('STATUS_STREAM_HEARTBEAT', 15)
+    STATUS_STREAM_MAX_CODES: int = os.environ.get('STATUS_STREAM_MAX_CODES', 100)
+    STATUS_BULK_MAX_CODES: int = os.environ.get('STATUS_BULK_MAX_CODES', 500)
+
     # class Config:
     #     env_file = ".env"
 
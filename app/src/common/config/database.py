@@ -1,26 +1,61 @@
+import logging
+import threading
+import uuid
+from contextlib import asynccontextmanager
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Coroutine, List, Sequence
 
-from pymongo.results import InsertOneResult
-from sqlalchemy import create_engine, URL
-from sqlalchemy.orm import sessionmaker
-from pymongo import MongoClient
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.results import UpdateResult
+from sqlalchemy import URL, Executable, Row, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from pymongo import ASCENDING, MongoClient
 
 from app.src.common.config.secret_manager import SecretManager
 from app.src.common.config.app_settings import get_app_settings
+from app.src.common.enum.custom_error_code import CustomErrorCode
+from app.src.common.exceptions.application_exception import BaseAppException
+from app.src.common.media.segment_index import SEGMENT_TIME_KEYS, build_segment_index
+from app.src.common.search.transcript_index import TranscriptSearchIndex
+from app.src.common.storage.document_codec import REVISION_FIELD, decode_document, encode_document, projection_for
 
 
 class Database:
+    """
+    SQLAlchemy AsyncEngine and session factory shared by every repository of a worker process.
+    Use get_database() instead of instantiating this class directly.
+    """
+
     def __init__(self):
+        self.settings = get_app_settings()
         self.secret_mgr = SecretManager()
         self.db_url = self.get_db_url()
-        self.engine = create_engine(self.db_url)
-        self.Session = sessionmaker(self.engine)
+        self.engine = create_async_engine(self.db_url, **self.get_pool_options())
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    def get_pool_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"pool_pre_ping": self.settings.DB_POOL_PRE_PING}
+        if self.db_url.get_backend_name() != "sqlite":
+            options.update(
+                pool_size=self.settings.DB_POOL_SIZE,
+                max_overflow=self.settings.DB_MAX_OVERFLOW,
+                pool_timeout=self.settings.DB_POOL_TIMEOUT,
+                pool_recycle=self.settings.DB_POOL_RECYCLE
+            )
+        return options
 
     def get_db_url(self) -> URL:
         settings = get_app_settings()
+        if settings.DATABASE_URL:
+            # e.g. sqlite+aiosqlite:///./callensights.db for local runs and tests
+            return make_url(settings.DATABASE_URL)
+
         url = URL.create(
-            "mysql+mysqlconnector",
+            "mysql+aiomysql",
             username=self.secret_mgr.mysql_db_secret('username'),
             password=self.secret_mgr.mysql_db_secret('password'),
             host=self.secret_mgr.mysql_db_secret('host'),
@@ -28,81 +63,396 @@ class Database:
         )
         return url
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the connection pool usage, used to size the pool under load.
+        """
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return {"status": pool.status()}
+
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": self.settings.DB_MAX_OVERFLOW,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "status": pool.status()
+        }
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+class MongoPoolMetrics(ConnectionPoolListener):
+    """
+    Connection pool listener counting checkouts of the shared MongoClient.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+
+    def _incr(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr(connections_created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr(connections_closed=1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._incr(checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._incr(checkouts=1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._incr(checked_out=-1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_pool_size": get_app_settings().MONGO_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checked_out": self.checked_out,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed
+            }
+
+
+mongo_pool_metrics = MongoPoolMetrics()
+
+
+def get_mongo_url() -> str:
+    settings = get_app_settings()
+    if settings.MONGO_URL:
+        # e.g. mongodb://localhost:27017 for a local mongod
+        return settings.MONGO_URL
+
+    secret_mgr = SecretManager()
+    user_name = secret_mgr.mongo_db_secret('username')
+    password = secret_mgr.mongo_db_secret('password')
+    host = secret_mgr.mongo_db_secret("host")
+    return f"mongodb+srv://{user_name}:{password}@{host}/?retryWrites=true&w=majority"
+
+
+_mongo_client: Optional[MongoClient] = None
+_mongo_client_lock = threading.Lock()
+
+
+def get_mongo_client() -> MongoClient:
+    """
+    Long-lived MongoClient shared by the worker process; closed by close_mongo_client() on shutdown.
+    """
+    global _mongo_client
+    if _mongo_client is None:
+        with _mongo_client_lock:
+            if _mongo_client is None:
+                settings = get_app_settings()
+                _mongo_client = MongoClient(
+                    get_mongo_url(),
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                    readPreference=settings.MONGO_READ_PREFERENCE,
+                    event_listeners=[mongo_pool_metrics]
+                )
+    return _mongo_client
+
+
+def close_mongo_client() -> None:
+    global _mongo_client
+    with _mongo_client_lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+
 
 class MongoDB:
     """
     MongoDB Connector class for inserting transcriptions.
+    Uses the process-wide client unless one is given (e.g. a mongomock client in tests).
     """
 
-    def __init__(self, database="callensights"):
+    def __init__(self, database="callensights", client: Optional[MongoClient] = None):
         self.database = database
         self.settings = get_app_settings()
-        self.secret_mgr = SecretManager()
-        self.client: Optional[MongoClient] = None
+        self.client: Optional[MongoClient] = client
 
-    def get_connection(self):
+    def get_connection(self) -> MongoClient:
         """
-        Get MongoDB connection using the provided credentials.
+        Get the shared MongoDB client.
         """
+        if self.client is not None:
+            return self.client
+        return get_mongo_client()
 
-        user_name = self.secret_mgr.mongo_db_secret('username')
-        password = self.secret_mgr.mongo_db_secret('password')
-        host = self.secret_mgr.mongo_db_secret("host")
-        mongo_url = f"mongodb+srv://{user_name}:{password}@{host}/?retryWrites=true&w=majority"
-        self.client = MongoClient(mongo_url)
-        return self.client
+    def put_feedback(self, feedback, collection_name="feedbacks") -> UpdateResult:
+        """
+        Insert feedback data into MongoDB, replacing the feedback already stored for the media
+        under a new revision.
+        """
+        db = self.get_connection()[self.database]
+        collection = db[collection_name]
+        return collection.replace_one(
+            {"media_code": feedback["media_code"]}, self._encode(self._revised(feedback)), upsert=True
+        )
 
-    def put_feedback(self, feedback, collection_name="feedbacks") -> InsertOneResult:
+    def ensure_indexes(
+            self, collection_names: Sequence[str] = ("transcriptions", "feedbacks", "transcript_segments")
+    ) -> None:
         """
-        Insert feedback data into MongoDB.
+        Verify, or create, the unique media_code index every lookup of these collections relies on.
+        create_index is a no-op when an identical index already exists. A failing index (e.g. one
+        that duplicates already stored rows) is logged and does not stop the others.
         """
-        with self.get_connection() as client:
-            db = client[self.database]
-            collection = db[collection_name]
-            return collection.insert_one(feedback)
+        db = self.get_connection()[self.database]
+        for collection_name in collection_names:
+            try:
+                db[collection_name].create_index(
+                    [("media_code", ASCENDING)], unique=True, name="media_code_unique"
+                )
+            except Exception as e:
+                logging.error(f"Failed to ensure the media_code index of {collection_name}: {e}")
+        self.get_search_index().ensure_indexes()
 
-    def get_transcription(self, media_code: str, collection_name: str = "transcriptions") -> Dict[str, Any]:
+    def get_search_index(self) -> TranscriptSearchIndex:
+        return TranscriptSearchIndex(self.get_connection()[self.database])
+
+    def _encode(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get transcription data from the MongoDB.
+        Storage form of a transcript/feedback: compressed when DOCUMENT_COMPRESSION is set.
         """
-        with self.get_connection() as client:
-            db = client[self.database]
-            collection = db[collection_name]
-            response = collection.find_one({"media_code": media_code})
-            response = dict(response).copy()
-            del response['_id']
-            return response
+        if not self.settings.DOCUMENT_COMPRESSION:
+            return document
+        return encode_document(
+            document,
+            self.settings.DOCUMENT_COMPRESSION,
+            int(self.settings.DOCUMENT_COMPRESS_MIN_BYTES),
+            self.settings.DOCUMENT_COMPRESSION_LEVEL
+        )
 
-    def put_transcription(self, transcription, collection_name="transcriptions") -> InsertOneResult:
+    @staticmethod
+    def _revised(document: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Insert transcription data into MongoDB.
+        Copy of a document about to be written, stamped with a new revision.
         """
-        with self.get_connection() as client:
-            db = client[self.database]
-            collection = db[collection_name]
-            return collection.insert_one(transcription)
+        return {**document, REVISION_FIELD: uuid.uuid4().hex}
 
-    def get_feedback(self, media_code: str, collection_name="feedbacks") -> Dict[str, Any]:
+    def get_revision(self, media_code: str, collection_name: str) -> Optional[str]:
         """
-        Get Feedback data from the MongoDB.
+        Revision of the transcript/feedback of a media, read without its content: None when there
+        is no document, "" for documents written before revisions were stored.
         """
-        with self.get_connection() as client:
-            db = client[self.database]
-            collection = db[collection_name]
-            response = collection.find_one({"media_code": media_code})
-            response = dict(response).copy()
-            del response['_id']
-            return response
+        db = self.get_connection()[self.database]
+        document = db[collection_name].find_one({"media_code": media_code}, {"_id": 0, REVISION_FIELD: 1})
+        if document is None:
+            return None
+        return document.get(REVISION_FIELD, "")
+
+    def _find_by_media_code(
+            self, media_code: str, collection_name: str, fields: Optional[List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        db = self.get_connection()[self.database]
+        collection = db[collection_name]
+        document = collection.find_one({"media_code": media_code}, projection_for(fields))
+        return decode_document(document, fields)
+
+    def get_transcription(
+            self, media_code: str, collection_name: str = "transcriptions", fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get transcription data from the MongoDB, without _id and limited to `fields` when given.
+        """
+        return self._find_by_media_code(media_code, collection_name, fields)
+
+    def put_transcription(
+            self, transcription, owner_id: Optional[int] = None, collection_name="transcriptions"
+    ) -> UpdateResult:
+        """
+        Insert transcription data into MongoDB, replacing the transcription already stored for
+        the media under a new revision, along with the offset index of its segments and its postings in the
+        full-text search index. `owner_id` is the user id of the media, which searches of
+        non-admins filter postings on.
+        """
+        db = self.get_connection()[self.database]
+        collection = db[collection_name]
+        result = collection.replace_one(
+            {"media_code": transcription["media_code"]}, self._encode(self._revised(transcription)), upsert=True
+        )
+        if isinstance(transcription.get("segments"), list):
+            self._put_segment_index(
+                build_segment_index(transcription["media_code"], transcription["segments"])
+            )
+        self.get_search_index().index_transcript(transcription, owner_id)
+        return result
 
+    def search_transcripts(
+            self,
+            query: str,
+            owner_ids: Optional[List[int]],
+            offset: int,
+            limit: int,
+            max_candidates: int,
+            max_highlights: int
+    ) -> Dict[str, Any]:
+        """
+        Ranked full-text search over transcripts, limited to media of `owner_ids` unless it is None.
+        """
+        return self.get_search_index().search(query, owner_ids, offset, limit, max_candidates, max_highlights)
+
+    def _put_segment_index(self, index: Dict[str, Any], collection_name="transcript_segments") -> None:
+        db = self.get_connection()[self.database]
+        db[collection_name].replace_one({"media_code": index["media_code"]}, index, upsert=True)
+
+    def get_segment_index(
+            self, media_code: str, collection_name="transcript_segments"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Offset index of the transcript segments. Transcripts written before the index existed get
+        theirs built from the segment timings alone on first use.
+        """
+        db = self.get_connection()[self.database]
+        index = db[collection_name].find_one({"media_code": media_code}, {"_id": 0})
+        if index is not None:
+            return index
 
-def get_db_session():
-    db = Database()
-    session = db.Session()
+        fields = [f"segments.{key}" for keys in SEGMENT_TIME_KEYS for key in keys]
+        timings = self.get_transcription(media_code, fields=fields)
+        if timings is None:
+            return None
+        index = build_segment_index(media_code, timings.get("segments") or [])
+        self._put_segment_index(dict(index), collection_name)
+        return index
 
+    def get_transcription_segments(
+            self, media_code: str, skip: int, limit: int, collection_name: str = "transcriptions"
+    ) -> List[Dict[str, Any]]:
+        """
+        Segments [skip, skip + limit) of a transcription; the server slices the array.
+        """
+        db = self.get_connection()[self.database]
+        collection = db[collection_name]
+        document = collection.find_one(
+            {"media_code": media_code},
+            {"_id": 0, "media_code": 1, "segments": {"$slice": [skip, limit]}}
+        )
+        if document is None:
+            return []
+        return document.get("segments") or []
+
+    def get_feedback(
+            self, media_code: str, collection_name="feedbacks", fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get Feedback data from the MongoDB, without _id and limited to `fields` when given.
+        """
+        return self._find_by_media_code(media_code, collection_name, fields)
+
+
+@lru_cache
+def get_database() -> Database:
+    return Database()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Unit of work: one session for the whole block, committed once on success,
+    rolled back on error and always closed.
+    """
+    session = get_database().Session()
     try:
-        return session
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
     finally:
-        session.close()
+        await session.close()
+
+
+async def stream_partitions(statement: Executable, yield_per: int) -> AsyncIterator[Sequence[Row]]:
+    """
+    Runs `statement` on its own session through a server-side cursor and yields the rows in
+    partitions of `yield_per`, so arbitrarily large results never sit in memory at once.
+    The session lives as long as the iteration, independent of the request that started it.
+    """
+    async with session_scope() as session:
+        result = await session.stream(statement.execution_options(yield_per=yield_per))
+        async for partition in result.partitions():
+            yield partition
+
+
+async def get_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Request scoped unit of work. FastAPI caches the dependency per request, so every
+    repository resolved for the request shares this session. UnitOfWorkRoute commits it
+    before the response goes out; the commit here only catches anything used afterwards.
+    """
+    async with session_scope() as session:
+        request.state.db_session = session
+        yield session
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Commits the request's session as soon as the endpoint has returned, before the response
+    is sent. Yield dependencies only exit after the response on this FastAPI version, so a
+    failed commit would otherwise follow an already sent 200, and a client's next call could
+    race the uncommitted rows. Committing also hands the connection back to the pool before
+    a streaming body starts.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            session: Optional[AsyncSession] = getattr(request.state, "db_session", None)
+            if session is not None:
+                try:
+                    await session.commit()
+                except SQLAlchemyError as e:
+                    await session.rollback()
+                    raise BaseAppException(
+                        status_code=500,
+                        description=str(e),
+                        custom_error_code=CustomErrorCode.DATABASE_ERROR
+                    )
+            return response
+
+        return route_handler
 
 
 @lru_cache
@@ -1,34 +1,121 @@
 import json
+import logging
+import threading
+import time
 from functools import lru_cache
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 import boto3 as aws
 
 from app.src.common.config.app_settings import get_app_settings
 
 
+class SecretStore:
+    """
+    Process-wide in-memory cache of Secrets Manager secrets.
+
+    Each secret is downloaded once and kept for `ttl` seconds. Once an entry is older than
+    `refresh_after` seconds it keeps being served while a background thread re-fetches it,
+    so requests only wait on Secrets Manager for the very first fetch or after a failed refresh.
+    """
+
+    def __init__(self, ttl: int, refresh_after: int) -> None:
+        self.settings = get_app_settings()
+        self.ttl = ttl
+        self.refresh_after = min(refresh_after, ttl)
+        self._client = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        # secret id -> (secret string, parsed json or None, fetched at)
+        self._entries: Dict[str, Tuple[str, Optional[Dict[str, Any]], float]] = {}
+        self._refreshing: set = set()
+
+    @property
+    def client(self):
+        if self._client is None:
+            session = aws.session.Session()
+            self._client = session.client(
+                service_name="secretsmanager",
+                region_name=self.settings.REGION
+            )
+        return self._client
+
+    def get_secret_string(self, secret_id: str) -> str:
+        return self._get_entry(secret_id)[0]
+
+    def get_secret_dict(self, secret_id: str) -> Dict[str, Any]:
+        secret_string, kvs, fetched_at = self._get_entry(secret_id)
+        if kvs is None:
+            kvs = json.loads(secret_string)
+            with self._lock:
+                if self._entries.get(secret_id, (None, None, None))[2] == fetched_at:
+                    self._entries[secret_id] = (secret_string, kvs, fetched_at)
+        return kvs
+
+    def invalidate(self, secret_id: Optional[str] = None) -> None:
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(secret_id, None)
+
+    def _get_entry(self, secret_id: str) -> Tuple[str, Optional[Dict[str, Any]], float]:
+        entry = self._entries.get(secret_id)
+        if entry is None or time.monotonic() - entry[2] >= self.ttl:
+            with self._fetch_lock:
+                entry = self._entries.get(secret_id)
+                if entry is None or time.monotonic() - entry[2] >= self.ttl:
+                    return self._fetch(secret_id)
+                return entry
+
+        if time.monotonic() - entry[2] >= self.refresh_after:
+            self._refresh_in_background(secret_id)
+        return entry
+
+    def _fetch(self, secret_id: str) -> Tuple[str, Optional[Dict[str, Any]], float]:
+        response = self.client.get_secret_value(SecretId=secret_id)
+        entry = (response.get('SecretString'), None, time.monotonic())
+        with self._lock:
+            self._entries[secret_id] = entry
+        return entry
+
+    def _refresh_in_background(self, secret_id: str) -> None:
+        with self._lock:
+            if secret_id in self._refreshing:
+                return
+            self._refreshing.add(secret_id)
+
+        def refresh() -> None:
+            try:
+                self._fetch(secret_id)
+            except Exception as e:
+                logging.error(f"Failed to refresh secret '{secret_id}': {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(secret_id)
+
+        threading.Thread(target=refresh, name="secret-refresh", daemon=True).start()
+
+
+@lru_cache
+def get_secret_store() -> SecretStore:
+    settings = get_app_settings()
+    return SecretStore(settings.SECRET_CACHE_TTL, settings.SECRET_REFRESH_AFTER)
+
+
 class SecretManager:
     def __init__(self) -> None:
         self.settings = get_app_settings()
-        session = aws.session.Session()
-        self.client = session.client(
-            service_name="secretsmanager",
-            region_name=self.settings.REGION
-        )
+        self.store = get_secret_store()
 
     def _get_db_secret(self, secret: str, name: str) -> Any:
-        response = self.client.get_secret_value(
-            SecretId=secret
-        )
-        kvs = json.loads(response.get('SecretString'))
+        kvs = self.store.get_secret_dict(secret)
 
         return kvs.get(name)
 
-    @lru_cache
     def mongo_db_secret(self, name: str) -> Any:
         return self._get_db_secret(self.settings.MONGODB_SECRET, name)
 
-    @lru_cache
     def mysql_db_secret(self, name: str) -> Any:
         return self._get_db_secret(self.settings.MYSQLDB_SECRET, name)
 
@@ -20,6 +20,11 @@ ALLOWED_TYPES = [
     "avi"
 ]
 
+# cns_media_status codes of a finished transcription / feedback generation
+COMPLETED_STATUS_CODES = ["S", "C"]
+# ... and of one that will not change any more
+TERMINAL_STATUS_CODES = COMPLETED_STATUS_CODES + ["E"]
+
 ALLOWED_ORIGINS = ["*"]
 ALLOWED_METHODS = ["*"]
 ALLOWED_HEADERS = ["*"]
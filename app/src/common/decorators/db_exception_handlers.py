@@ -1,5 +1,6 @@
 from functools import wraps
-from typing import Callable
+from inspect import iscoroutinefunction
+from typing import Callable, Dict, Any, Tuple
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -7,24 +8,42 @@ from app.src.common.exceptions.application_exception import BaseAppException
 from app.src.common.enum.custom_error_code import CustomErrorCode
 
 
+def _to_app_exception(e: Exception, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> BaseAppException:
+    if isinstance(e, BaseAppException):
+        return e
+
+    if isinstance(e, SQLAlchemyError):
+        return BaseAppException(
+            status_code=500,
+            description=str(e),
+            custom_error_code=CustomErrorCode.DATABASE_ERROR,
+            data={'args': args, "kwargs": kwargs}
+        )
+
+    return BaseAppException(
+        status_code=500,
+        description=str(e),
+        custom_error_code=CustomErrorCode.UNKNOWN_ERROR,
+        data={'args': args, "kwargs": kwargs}
+    )
+
+
 def handle_db_exception(func: Callable) -> Callable:
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                raise _to_app_exception(e, args, kwargs)
+
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except SQLAlchemyError as e:
-            raise BaseAppException(
-                status_code=500,
-                description=str(e),
-                custom_error_code=CustomErrorCode.DATABASE_ERROR,
-                data={'args': args, "kwargs": kwargs}
-            )
         except Exception as e:
-            raise BaseAppException(
-                status_code=500,
-                description=str(e),
-                custom_error_code=CustomErrorCode.UNKNOWN_ERROR,
-                data={'args': args, "kwargs": kwargs}
-            )
+            raise _to_app_exception(e, args, kwargs)
 
     return wrapper
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class AccessOutcome(Enum):
+    GRANTED = "GRANTED"
+    NO_SUCH_USER = "NO_SUCH_USER"
+    NO_SUCH_RESOURCE = "NO_SUCH_RESOURCE"
+    NOT_ASSIGNED = "NOT_ASSIGNED"
@@ -12,3 +12,6 @@ class CustomErrorCode(Enum):
     NO_SUCH_LEAD = "NO_SUCH_LEAD_ERROR_001"
     NOT_ASSIGNED_TO_USER = "NOT_ASSIGNED_TO_USER_001"
     INVALID_MEDIA = "INVALID_MEDIA_ERROR_001"
+    INVALID_RANGE = "INVALID_RANGE_ERROR_001"
+    INVALID_UPLOAD = "INVALID_UPLOAD_ERROR_001"
+    INVALID_CURSOR = "INVALID_CURSOR_ERROR_001"
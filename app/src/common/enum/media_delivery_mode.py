@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class MediaDeliveryMode(Enum):
+    STREAM = "stream"
+    URL = "url"
+    REDIRECT = "redirect"
@@ -9,6 +9,18 @@ class MediaRouterPaths(Enum):
     GET_MEDIA = "/get-media"
     GET_FEEDBACK = "/get-feedback"
     GET_TRANSCRIPT = "/get-transcript"
+    TRANSCRIPT_WINDOW = "/transcript-window"
+    SEARCH_TRANSCRIPTS = "/search-transcripts"
+    MULTIPART_INITIATE = "/multipart/initiate"
+    MULTIPART_PRESIGN = "/multipart/presign"
+    MULTIPART_PARTS = "/multipart/parts"
+    MULTIPART_COMPLETE = "/multipart/complete"
+    MULTIPART_ABORT = "/multipart/abort"
+    S3_EVENTS = "/events/s3"
+    EXPORT_UPLOADS = "/export-uploads"
+    STATUS_STREAM = "/status-stream"
+    STATUSES = "/statuses"
+    MEDIA_DETAIL = "/detail"
 
 
 class LeadRouterPaths(Enum):
@@ -20,9 +32,16 @@ class LeadRouterPaths(Enum):
     UPDATE_LEAD_STAGE = "/update-lead-stage"
     ASSIGN_TO = "/assign_to"
     ADD_COMMENT = "/add-comment"
+    EXPORT_ACTIVITY = "/export-activity"
 
 
 class UserRouterPaths(Enum):
     PREFIX = "/user"
 
     WORKSPACE = "/workspace"
+
+
+class OpsRouterPaths(Enum):
+    PREFIX = "/ops"
+
+    METRICS = "/metrics"
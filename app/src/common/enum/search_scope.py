@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SearchScope(Enum):
+    OWN = "own"
+    TEAM = "team"
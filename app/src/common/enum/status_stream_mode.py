@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class StatusStreamMode(Enum):
+    SSE = "sse"
+    LONG_POLL = "long-poll"
@@ -75,3 +75,21 @@ class InvalidMediaException(BaseAppException):
             data=self.data,
             custom_error_code=self.custom_error_code
         )
+
+
+class InvalidRangeException(BaseAppException):
+    def __init__(
+            self,
+            data: Optional[Dict[str, Any]] = None
+    ):
+        self.status_code = 416
+        self.description = "Requested range not satisfiable"
+        self.data = data
+        self.custom_error_code = CustomErrorCode.INVALID_RANGE
+
+        super().__init__(
+            status_code=self.status_code,
+            description=self.description,
+            data=self.data,
+            custom_error_code=self.custom_error_code
+        )
@@ -0,0 +1,191 @@
+import struct
+from typing import Callable, Optional, Tuple
+
+# fetch(offset, length) -> (bytes read, total object size)
+Fetch = Callable[[int, int], Tuple[bytes, int]]
+
+MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+class RangeReader:
+    """
+    Random access over a remote object through ranged reads. Every miss fetches at least
+    `block_size` bytes from the requested offset, so parsers walking nearby headers cost
+    one request per region of the file rather than one per field.
+    """
+
+    def __init__(self, fetch: Fetch, block_size: int = 64 * 1024) -> None:
+        self.fetch = fetch
+        self.block_size = block_size
+        self.size: Optional[int] = None
+        self.requests = 0
+        self._start = 0
+        self._buffer = b""
+
+    def read(self, offset: int, length: int) -> bytes:
+        end = offset + length
+        if self._start <= offset and end <= self._start + len(self._buffer):
+            return self._buffer[offset - self._start:end - self._start]
+        if self.size is not None and offset >= self.size:
+            return b""
+
+        self._buffer, self.size = self.fetch(offset, max(length, self.block_size))
+        self._start = offset
+        self.requests += 1
+        return self._buffer[:length]
+
+    def get_size(self) -> int:
+        if self.size is None:
+            self.read(0, 1)
+        return self.size
+
+
+def probe_duration(file_type: str, reader: RangeReader) -> Optional[float]:
+    """
+    Duration in seconds read from the container header, or None when the format is not
+    supported or the header could not be understood.
+    """
+    parser = {
+        "wav": _wav_duration,
+        "mp3": _mp3_duration,
+        "m4a": _mp4_duration,
+        "mp4": _mp4_duration,
+    }.get((file_type or "").lower())
+    if parser is None:
+        return None
+    try:
+        return parser(reader)
+    except (struct.error, IndexError, ZeroDivisionError):
+        return None
+
+
+def _wav_duration(reader: RangeReader) -> Optional[float]:
+    header = reader.read(0, 12)
+    if header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+        return None
+
+    size = reader.get_size()
+    offset = 12
+    byte_rate = None
+    data_size_64 = None
+    while offset + 8 <= size:
+        chunk = reader.read(offset, 8)
+        chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:8])[0]
+        if chunk_id == b"fmt ":
+            byte_rate = struct.unpack("<I", reader.read(offset + 16, 4))[0]
+        elif chunk_id == b"ds64":
+            data_size_64 = struct.unpack("<Q", reader.read(offset + 16, 8))[0]
+        elif chunk_id == b"data":
+            if chunk_size == 0xFFFFFFFF and data_size_64 is not None:
+                chunk_size = data_size_64
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF; the rest of the file is audio.
+            if chunk_size in (0, 0xFFFFFFFF) or offset + 8 + chunk_size > size:
+                chunk_size = size - offset - 8
+            return chunk_size / byte_rate if byte_rate else None
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _mp3_duration(reader: RangeReader) -> Optional[float]:
+    offset = 0
+    id3 = reader.read(0, 10)
+    if id3[:3] == b"ID3" and len(id3) == 10:
+        tag_size = (id3[6] << 21) | (id3[7] << 14) | (id3[8] << 7) | id3[9]
+        offset = 10 + tag_size + (10 if id3[5] & 0x10 else 0)
+
+    window = reader.read(offset, 8192)
+    for i in range(len(window) - 4):
+        frame = _mp3_frame(window[i:i + 4])
+        if frame is None:
+            continue
+
+        frame_start = offset + i
+        version, layer, bitrate, sample_rate, mono = frame
+        samples_per_frame = 384 if layer == 1 else 1152 if layer == 2 or version == 3 else 576
+
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        xing = reader.read(frame_start + 4 + side_info, 12)
+        if xing[:4] in (b"Xing", b"Info") and struct.unpack(">I", xing[4:8])[0] & 0x1:
+            frames = struct.unpack(">I", xing[8:12])[0]
+            return frames * samples_per_frame / sample_rate
+
+        vbri = reader.read(frame_start + 36, 18)
+        if vbri[:4] == b"VBRI":
+            frames = struct.unpack(">I", vbri[14:18])[0]
+            return frames * samples_per_frame / sample_rate
+
+        return (reader.get_size() - frame_start) * 8 / (bitrate * 1000)
+    return None
+
+
+def _mp3_frame(header: bytes) -> Optional[Tuple[int, int, int, int, bool]]:
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3
+    layer = 4 - ((header[1] >> 1) & 0x3)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = MP3_BITRATES[(1 if version == 3 else 2, layer)][bitrate_index]
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    mono = (header[3] >> 6) == 0x3
+    return version, layer, bitrate, sample_rate, mono
+
+
+def _mp4_box(reader: RangeReader, offset: int, limit: int) -> Optional[Tuple[bytes, int, int]]:
+    header = reader.read(offset, 16)
+    if len(header) < 8:
+        return None
+    box_size, box_type = struct.unpack(">I", header[:4])[0], header[4:8]
+    header_size = 8
+    if box_size == 1:
+        box_size, header_size = struct.unpack(">Q", header[8:16])[0], 16
+    elif box_size == 0:
+        box_size = limit - offset
+    if box_size < header_size:
+        return None
+    return box_type, box_size, header_size
+
+
+def _mp4_duration(reader: RangeReader) -> Optional[float]:
+    # Top level boxes are skipped by their sizes, so an mdat in front of moov costs one jump.
+    size = reader.get_size()
+    offset = 0
+    while offset + 8 <= size:
+        box = _mp4_box(reader, offset, size)
+        if box is None:
+            return None
+        box_type, box_size, header_size = box
+        if box_type == b"moov":
+            end = offset + box_size
+            child = offset + header_size
+            while child + 8 <= end:
+                child_box = _mp4_box(reader, child, end)
+                if child_box is None:
+                    return None
+                child_type, child_size, child_header_size = child_box
+                if child_type == b"mvhd":
+                    body = reader.read(child + child_header_size, 32)
+                    if body[0] == 1:
+                        timescale, duration = struct.unpack(">IQ", body[20:32])
+                    else:
+                        timescale, duration = struct.unpack(">II", body[12:20])
+                    return duration / timescale if timescale else None
+                child += child_size
+            return None
+        offset += box_size
+    return None
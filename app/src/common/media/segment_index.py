@@ -0,0 +1,57 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+# Timing keys of a transcript segment, by transcriber: {"start", "end"} or {"start_time", "end_time"}
+SEGMENT_TIME_KEYS = (("start", "end"), ("start_time", "end_time"))
+
+
+def segment_bounds(segment: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    (start, end) of a segment in seconds, or None for a bound the segment does not carry.
+    """
+    for start_key, end_key in SEGMENT_TIME_KEYS:
+        if start_key in segment or end_key in segment:
+            start, end = segment.get(start_key), segment.get(end_key)
+            return (
+                float(start) if start is not None else None,
+                float(end) if end is not None else None,
+            )
+    return None, None
+
+
+def build_segment_index(media_code: str, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Offset index of a transcript: segment count plus the start and end second of every segment,
+    stored next to the transcript so a time range maps to segment positions without reading it.
+    Missing bounds are carried over from the neighbouring segment to keep both lists sorted.
+    """
+    starts: List[float] = []
+    ends: List[float] = []
+    previous = 0.0
+    for segment in segments:
+        start, end = segment_bounds(segment)
+        start = previous if start is None else max(start, previous)
+        end = start if end is None else max(end, start)
+        starts.append(start)
+        ends.append(end)
+        previous = start
+
+    return {"media_code": media_code, "count": len(segments), "starts": starts, "ends": ends}
+
+
+def window_for_time_range(
+        index: Dict[str, Any], from_time: Optional[float], to_time: Optional[float]
+) -> Tuple[int, int]:
+    """
+    [first, last) positions of the segments overlapping [from_time, to_time).
+    """
+    first = 0
+    last = index["count"]
+    if from_time is not None:
+        # the last segment starting at or before from_time, unless it is already over
+        first = max(bisect_right(index["starts"], from_time) - 1, 0)
+        if first < last and index["ends"][first] <= from_time:
+            first += 1
+    if to_time is not None:
+        last = bisect_left(index["starts"], to_time)
+    return first, max(first, last)
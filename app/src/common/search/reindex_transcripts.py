@@ -0,0 +1,70 @@
+"""
+Backfill the transcript search index for transcripts stored before it existed or indexed
+without their owner, or rebuild it.
+
+    python -m app.src.common.search.reindex_transcripts
+    python -m app.src.common.search.reindex_transcripts --all --batch-size 200
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List
+
+from app.src.common.config.database import get_mongodb, session_scope
+from app.src.common.storage.document_codec import decode_document, projection_for
+from app.src.core.repositories.media_repository import MediaRepository
+
+FIELDS = ["media_code", "segments", "text"]
+
+
+async def _index_batch(documents: List[Dict[str, Any]]) -> None:
+    async with session_scope() as session:
+        owners = await MediaRepository(session).get_media_owners(
+            [document["media_code"] for document in documents]
+        )
+    search_index = get_mongodb().get_search_index()
+    for document in documents:
+        search_index.index_transcript(decode_document(document, FIELDS), owners.get(document["media_code"]))
+
+
+async def reindex_transcripts(batch_size: int, reindex_all: bool) -> Dict[str, Any]:
+    """
+    Writes the postings of every transcript, with the owner of its media read from MySQL once
+    per batch of `batch_size`. Unless `reindex_all`, transcripts already indexed with their
+    owner are skipped, so an interrupted run can simply be restarted. Re-indexing a transcript
+    replaces its postings and corrects the corpus statistics, so a full run is safe as well.
+    """
+    db = get_mongodb().get_connection()[get_mongodb().database]
+    search_index = get_mongodb().get_search_index()
+
+    scanned = indexed = 0
+    batch: List[Dict[str, Any]] = []
+    for document in db["transcriptions"].find({}, projection_for(FIELDS), batch_size=batch_size):
+        scanned += 1
+        if not reindex_all and db[search_index.DOCS].find_one(
+                {"media_code": document["media_code"], "owner_id": {"$ne": None}}, {"_id": 1}
+        ):
+            continue
+        batch.append(document)
+        if len(batch) >= batch_size:
+            await _index_batch(batch)
+            indexed += len(batch)
+            batch = []
+    if batch:
+        await _index_batch(batch)
+        indexed += len(batch)
+
+    return {"scanned": scanned, "indexed": indexed}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--all", dest="reindex_all", action="store_true", help="also re-index indexed transcripts")
+
+    args = parser.parse_args()
+    get_mongodb().get_search_index().ensure_indexes()
+    print(await reindex_transcripts(args.batch_size, args.reindex_all))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,308 @@
+import html
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.database import Database
+
+from app.src.common.storage.document_codec import decode_document, projection_for
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def transcript_segments(transcription: Dict[str, Any]) -> Tuple[List[str], bool]:
+    """
+    Text of every segment of a transcription, and whether it has segments at all.
+    A transcription without segments is indexed as a single segment of its "text".
+    """
+    segments = transcription.get("segments")
+    if isinstance(segments, list):
+        return [str(segment.get("text") or "") if isinstance(segment, dict) else "" for segment in segments], True
+    return [str(transcription.get("text") or "")], False
+
+
+def highlight(text: str, terms: Sequence[str], tag: str = "em") -> str:
+    """
+    HTML-escaped text with every token that is one of `terms` wrapped in <tag></tag>.
+    The text between tokens is escaped piecewise so entities are never highlighted into.
+    """
+    wanted = set(terms)
+    parts = []
+    end = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        parts.append(html.escape(text[end:match.start()]))
+        token = html.escape(match.group(0))
+        parts.append(f"<{tag}>{token}</{tag}>" if match.group(0).lower() in wanted else token)
+        end = match.end()
+    parts.append(html.escape(text[end:]))
+    return "".join(parts)
+
+
+class TranscriptSearchIndex:
+    """
+    Inverted index over transcript text kept in three Mongo collections:
+
+    - transcript_terms: one posting per (term, media_code) with the owner (user id) of the
+      media, the term frequency and the positions of the segments containing it.
+    - transcript_search_docs: token length of every indexed transcript.
+    - transcript_search_stats: corpus document count and total length, for BM25.
+
+    Postings of a transcript are replaced whenever it is (re)written, so the index follows
+    put_transcription without a separate build step.
+    """
+
+    TERMS = "transcript_terms"
+    DOCS = "transcript_search_docs"
+    STATS = "transcript_search_stats"
+    CORPUS_ID = "corpus"
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+
+    def ensure_indexes(self) -> None:
+        indexes = (
+            (
+                self.TERMS,
+                [("term", ASCENDING), ("media_code", ASCENDING)],
+                {"unique": True, "name": "term_media_code_unique"}
+            ),
+            (
+                self.TERMS,
+                [("term", ASCENDING), ("owner_id", ASCENDING), ("media_code", ASCENDING)],
+                {"name": "term_owner_media_code"}
+            ),
+            (self.TERMS, [("media_code", ASCENDING)], {"name": "media_code"}),
+            (self.DOCS, [("media_code", ASCENDING)], {"unique": True, "name": "media_code_unique"}),
+        )
+        for collection_name, keys, options in indexes:
+            try:
+                self.db[collection_name].create_index(keys, **options)
+            except Exception as e:
+                logging.error(f"Failed to ensure the {options['name']} index of {collection_name}: {e}")
+
+    def index_transcript(self, transcription: Dict[str, Any], owner_id: Optional[int]) -> None:
+        """
+        Replaces the postings of a transcript. Postings without an `owner_id` only turn up in
+        unrestricted (admin) searches until reindex_transcripts fills the owner in.
+        """
+        media_code = transcription["media_code"]
+        texts, has_segments = transcript_segments(transcription)
+
+        term_positions: Dict[str, List[int]] = defaultdict(list)
+        term_frequency: Counter = Counter()
+        length = 0
+        for position, text in enumerate(texts):
+            tokens = tokenize(text)
+            length += len(tokens)
+            term_frequency.update(tokens)
+            for term in set(tokens):
+                term_positions[term].append(position)
+
+        previous = self.db[self.DOCS].find_one_and_update(
+            {"media_code": media_code},
+            {"$set": {
+                "media_code": media_code, "owner_id": owner_id, "length": length, "has_segments": has_segments
+            }},
+            projection={"_id": 0, "length": 1},
+            upsert=True
+        )
+        self.db[self.TERMS].delete_many({"media_code": media_code})
+        if term_positions:
+            self.db[self.TERMS].insert_many(
+                [
+                    {
+                        "term": term,
+                        "media_code": media_code,
+                        "owner_id": owner_id,
+                        "tf": term_frequency[term],
+                        "positions": positions
+                    }
+                    for term, positions in term_positions.items()
+                ],
+                ordered=False
+            )
+        self.db[self.STATS].bulk_write([
+            UpdateOne(
+                {"_id": self.CORPUS_ID},
+                {"$inc": {
+                    "doc_count": 0 if previous else 1,
+                    "total_length": length - (previous or {}).get("length", 0)
+                }},
+                upsert=True
+            )
+        ])
+
+    def search(
+            self,
+            query: str,
+            owner_ids: Optional[List[int]],
+            offset: int,
+            limit: int,
+            max_candidates: int,
+            max_highlights: int
+    ) -> Dict[str, Any]:
+        """
+        Ranked media codes whose transcript has a segment containing every query term,
+        restricted to media owned by `owner_ids` unless it is None. Scores are BM25 over the whole
+        transcript; hits are the matching segments of each result, highlighted.
+
+        Postings are read one term at a time from the rarest up: the rarest over the owners'
+        postings, every next one only over the media codes still matching, so the candidates
+        are a true intersection and no query grows with the owners' history. When the
+        rarest term alone has more than `max_candidates` postings, only the first ones in
+        media_code order are considered and the result is flagged as truncated.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or owner_ids == []:
+            return {"total": 0, "items": [], "truncated": False}
+
+        document_frequency = {term: self.db[self.TERMS].count_documents({"term": term}) for term in terms}
+        if not all(document_frequency.values()):
+            return {"total": 0, "items": [], "truncated": False}
+
+        truncated = False
+        candidates: Optional[List[str]] = None
+        postings: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for term in sorted(terms, key=lambda item: document_frequency[item]):
+            criteria: Dict[str, Any] = {"term": term}
+            if candidates is not None:
+                criteria["media_code"] = {"$in": candidates}
+            elif owner_ids is not None:
+                criteria["owner_id"] = {"$in": owner_ids}
+            cursor = self.db[self.TERMS].find(
+                criteria, {"_id": 0, "term": 1, "media_code": 1, "tf": 1, "positions": 1}
+            )
+            if candidates is None:
+                cursor = cursor.sort("media_code", ASCENDING).limit(max_candidates + 1)
+            found = list(cursor)
+            if len(found) > max_candidates:
+                found = found[:max_candidates]
+                truncated = True
+            candidates = [posting["media_code"] for posting in found]
+            if not candidates:
+                return {"total": 0, "items": [], "truncated": truncated}
+            for posting in found:
+                postings[posting["media_code"]][term] = posting
+
+        matches: Dict[str, List[int]] = {}
+        for media_code, by_term in postings.items():
+            if len(by_term) < len(terms):
+                continue
+            positions = set(by_term[terms[0]]["positions"])
+            for term in terms[1:]:
+                positions.intersection_update(by_term[term]["positions"])
+            if positions:
+                matches[media_code] = sorted(positions)
+        if not matches:
+            return {"total": 0, "items": [], "truncated": truncated}
+
+        ranked = sorted(
+            self._score(terms, {code: postings[code] for code in matches}, document_frequency).items(),
+            key=lambda item: (-item[1], item[0])
+        )
+        page = ranked[offset:offset + limit]
+        hits = self._highlights(
+            {code: matches[code][:max_highlights] for code, _ in page}, terms
+        )
+        items = [
+            {
+                "media_code": code,
+                "score": round(score, 4),
+                "hit_count": len(matches[code]),
+                "hits": hits.get(code, [])
+            }
+            for code, score in page
+        ]
+        return {"total": len(ranked), "items": items, "truncated": truncated}
+
+    def _score(
+            self,
+            terms: List[str],
+            postings: Dict[str, Dict[str, Dict[str, Any]]],
+            document_frequency: Dict[str, int]
+    ) -> Dict[str, float]:
+        stats = self.db[self.STATS].find_one({"_id": self.CORPUS_ID}) or {}
+        doc_count = max(stats.get("doc_count", 0), 1)
+        avg_length = max(stats.get("total_length", 0), 1) / doc_count
+        lengths = {
+            doc["media_code"]: doc.get("length", 0)
+            for doc in self.db[self.DOCS].find(
+                {"media_code": {"$in": list(postings)}}, {"_id": 0, "media_code": 1, "length": 1}
+            )
+        }
+        idf = {
+            term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+        scores = {}
+        for media_code, by_term in postings.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths.get(media_code, avg_length) / avg_length)
+            scores[media_code] = sum(
+                idf[term] * by_term[term]["tf"] * (BM25_K1 + 1) / (by_term[term]["tf"] + norm)
+                for term in terms
+            )
+        return scores
+
+    def _highlights(self, positions: Dict[str, List[int]], terms: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Highlighted hit segments of the page, read in one aggregation over the segmented
+        transcripts (array positions resolved server-side) and one find for the rest.
+        """
+        segmented = {
+            doc["media_code"]: doc.get("has_segments", True)
+            for doc in self.db[self.DOCS].find(
+                {"media_code": {"$in": list(positions)}}, {"_id": 0, "media_code": 1, "has_segments": 1}
+            )
+        }
+        wanted = sorted({position for hit_positions in positions.values() for position in hit_positions})
+        hits: Dict[str, List[Dict[str, Any]]] = {}
+
+        segmented_codes = [code for code in positions if segmented.get(code, True)]
+        if segmented_codes:
+            last = {"$subtract": [{"$size": "$segments"}, 1]}
+            documents = self.db["transcriptions"].aggregate([
+                {"$match": {"media_code": {"$in": segmented_codes}}},
+                {"$project": {
+                    "_id": 0,
+                    "media_code": 1,
+                    "segments": {"$map": {
+                        "input": wanted,
+                        "as": "position",
+                        "in": {"$arrayElemAt": ["$segments", {"$min": ["$$position", last]}]}
+                    }}
+                }}
+            ])
+            for document in documents:
+                by_position = dict(zip(wanted, document.get("segments") or []))
+                hits[document["media_code"]] = [
+                    {
+                        "index": position,
+                        "start": by_position[position].get("start", by_position[position].get("start_time")),
+                        "end": by_position[position].get("end", by_position[position].get("end_time")),
+                        "text": highlight(str(by_position[position].get("text") or ""), terms)
+                    }
+                    for position in positions[document["media_code"]]
+                    if isinstance(by_position.get(position), dict)
+                ]
+
+        plain_codes = [code for code in positions if not segmented.get(code, True)]
+        if plain_codes:
+            documents = self.db["transcriptions"].find(
+                {"media_code": {"$in": plain_codes}}, projection_for(["media_code", "text"])
+            )
+            for document in documents:
+                document = decode_document(document, ["text"])
+                hits[document["media_code"]] = [
+                    {"index": 0, "start": None, "end": None, "text": highlight(str(document.get("text") or ""), terms)}
+                ]
+        return hits
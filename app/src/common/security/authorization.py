@@ -1,13 +1,19 @@
+import hmac
 import jwt
 import logging
-from typing import Optional, TypedDict
+import time
+from hashlib import sha256
+from typing import Optional, TypedDict, Dict, Any
 from botocore.exceptions import ClientError
-import boto3
 
+from app.src.common.cache.ttl_cache import TTLCache
 from app.src.common.config.app_settings import get_app_settings
+from app.src.common.config.secret_manager import get_secret_store
 from fastapi import Request, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+KEY_RELOAD_INTERVAL = 60
+
 
 class DecodedPayload(TypedDict, total=False):
     """
@@ -31,22 +37,25 @@ class JWTDecoder:
     """
     JWTDecoder class for decoding JWT tokens using RSA256 algorithm.
 
+    The Clerk public key is served from the process-wide secret store, and tokens that
+    already passed verification are kept in a bounded LRU until their `exp`.
+
     Attributes:
         decoding_algorithm (str): Algorithm used for decoding.
         audience (str): Expected audience claim value.
-        boto_session (boto3.session.Session): Boto3 session for AWS services.
-        boto_client (boto3.client): Boto3 client for AWS Secrets Manager.
+        verified_tokens (TTLCache): Verified payloads keyed by the token's SHA-256 digest.
+        key_reloads (int): Number of times the key was re-fetched after a signature failure.
     """
 
     def __init__(self):
         self.settings = get_app_settings()
         self.decoding_algorithm = "RS256"
         self.audience = self.settings.CLERK_AUDIENCE
-        self.boto_session = boto3.session.Session()
-        self.boto_client = self.boto_session.client(
-            service_name="secretsmanager",
-            region_name="us-east-1",
+        self.verified_tokens: TTLCache[DecodedPayload] = TTLCache(
+            maxsize=self.settings.JWT_CACHE_SIZE
         )
+        self.key_reloads = 0
+        self._last_key_reload = 0.0
 
     def extract_bearer_token(self, authorization_header: str) -> Optional[str]:
         """
@@ -68,6 +77,8 @@ class JWTDecoder:
     def decode_jwt(self, token: str) -> DecodedPayload:
         """
         Decodes the JWT token using the specified algorithm and validates its claims.
+        A token seen before is answered from the verified-token cache. When verification
+        fails with a cached key, the key is re-fetched once to pick up a rotation.
 
         Args:
             token (str): JWT token to be decoded.
@@ -79,16 +90,18 @@ class JWTDecoder:
             jwt.ExpiredSignatureError: If the token has expired.
             jwt.InvalidTokenError: If the token is invalid.
         """
-        secret = self.get_secret()
-        try:
-            payload = jwt.decode(
-                token,
-                secret,
-                algorithms=[self.decoding_algorithm],
-                audience=self.audience,
-                verify_signature=True,
-            )
+        token_hash = sha256(token.encode()).hexdigest()
+        payload = self.verified_tokens.get(token_hash)
+        if payload is not None:
             return payload
+
+        try:
+            try:
+                payload = self._verify(token, self.get_secret())
+            except jwt.InvalidSignatureError:
+                if not self._reload_key():
+                    raise
+                payload = self._verify(token, self.get_secret())
         except jwt.ExpiredSignatureError:
             logging.error("Token has expired.")
             raise
@@ -96,9 +109,37 @@ class JWTDecoder:
             logging.error("Invalid token.")
             raise
 
+        if payload.get("exp") is not None:
+            self.verified_tokens.set(token_hash, payload, expires_at=payload["exp"])
+        return payload
+
+    def _verify(self, token: str, secret: str) -> DecodedPayload:
+        return jwt.decode(
+            token,
+            secret,
+            algorithms=[self.decoding_algorithm],
+            audience=self.audience,
+            verify_signature=True,
+        )
+
+    def _reload_key(self) -> bool:
+        # bounded so that a flood of forged tokens cannot hammer Secrets Manager
+        if time.monotonic() - self._last_key_reload < KEY_RELOAD_INTERVAL:
+            return False
+        self._last_key_reload = time.monotonic()
+        self.key_reloads += 1
+        get_secret_store().invalidate(self.settings.CLERK_SECRET)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.verified_tokens.get_stats()
+        stats["key_reloads"] = self.key_reloads
+        return stats
+
     def get_secret(self) -> str:
         """
-        Retrieves the secret from AWS Secrets Manager.
+        Retrieves the verification key from the secret store, which refreshes it from
+        AWS Secrets Manager periodically.
 
         Returns:
             str: Secret value.
@@ -110,15 +151,11 @@ class JWTDecoder:
         SECRET_NAME = self.settings.CLERK_SECRET
 
         try:
-            get_secret_value_response = self.boto_client.get_secret_value(
-                SecretId=SECRET_NAME
-            )
+            return get_secret_store().get_secret_string(SECRET_NAME)
         except ClientError as e:
             logging.error(f"Failed to retrieve secret '{SECRET_NAME}': {e}")
             raise Exception(f"Failed to retrieve secret '{SECRET_NAME}': {e}") from e
 
-        return get_secret_value_response["SecretString"]
-
 
 def main():
     """
@@ -196,5 +233,24 @@ class JWTBearer(HTTPBearer):
             raise HTTPException(status_code=403, detail="Invalid authorization code.")
 
 
+class ServiceTokenBearer(HTTPBearer):
+    """
+    Authenticates machine callers (e.g. the S3 event forwarder) with the static INGEST_TOKEN.
+    """
+
+    def __init__(self, auto_error: bool = True):
+        super(ServiceTokenBearer, self).__init__(auto_error=auto_error)
+
+    async def __call__(self, request: Request) -> None:
+        credentials: HTTPAuthorizationCredentials = await super(
+            ServiceTokenBearer, self
+        ).__call__(request)
+        token = get_app_settings().INGEST_TOKEN
+        if not credentials or credentials.scheme != "Bearer" or not token:
+            raise HTTPException(status_code=403, detail="Invalid authorization code.")
+        if not hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+            raise HTTPException(status_code=403, detail="Invalid authorization code.")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.src.common.cache.ttl_cache import TTLCache
+from app.src.common.config.app_settings import get_app_settings
+
+
+class Principal(BaseModel):
+    """
+    Resolved identity of a Clerk user: internal id, role and reporting line.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    user_id: int
+    clerk_id: str
+    role: Optional[str] = None
+    manager_id: Optional[int] = None
+    user_group: Optional[int] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return (self.role or "").upper() == 'ADMIN'
+
+
+@lru_cache
+def get_principal_cache() -> TTLCache[Principal]:
+    """
+    Process-wide clerk_id -> Principal cache, invalidated by UserRepository on update/delete
+    once the change is committed. Other workers are not notified: there a role change or a
+    removed user takes effect when the entry expires, i.e. within PRINCIPAL_CACHE_TTL seconds.
+    """
+    settings = get_app_settings()
+    return TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
+
+
+PENDING_EVICTIONS = "evict_principals"
+
+
+def evict_principal_on_commit(session: AsyncSession, clerk_id: str) -> None:
+    """
+    Drops the cached principal once `session` commits. Evicting before the commit would let a
+    concurrent request re-cache the old row until the entry expires.
+    """
+    session.info.setdefault(PENDING_EVICTIONS, set()).add(clerk_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_principals(session: Session) -> None:
+    for clerk_id in session.info.pop(PENDING_EVICTIONS, ()):
+        get_principal_cache().pop(clerk_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_evictions(session: Session) -> None:
+    session.info.pop(PENDING_EVICTIONS, None)
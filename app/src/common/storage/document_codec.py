@@ -0,0 +1,111 @@
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+import bson
+from bson import Binary
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for DOCUMENT_COMPRESSION=zstd
+    zstandard = None
+
+SCHEMA_VERSION = 2
+SCHEMA_FIELD = "_schema"
+CODEC_FIELD = "_codec"
+PACKED_FIELD = "_packed"
+REVISION_FIELD = "_revision"
+CODECS = ("zlib", "zstd")
+
+# Fields that stay plain: lookups filter on media_code, transcript windows, the segment
+# offset index and search highlights slice "segments" server-side, and the revision is read
+# on its own to validate cached documents.
+RAW_FIELDS = frozenset({"_id", "media_code", "segments", REVISION_FIELD})
+
+
+def _compress(codec: str, data: bytes, level: Optional[int]) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(data, 6 if level is None else level)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd document compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"Unsupported document codec '{codec}'")
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd document compression requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported document codec '{codec}'")
+
+
+def is_encoded(document: Dict[str, Any]) -> bool:
+    return document.get(SCHEMA_FIELD) == SCHEMA_VERSION
+
+
+def encode_document(
+        document: Dict[str, Any], codec: str, min_bytes: int = 1024, level: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Storage form of a transcript/feedback document: every top-level field outside RAW_FIELDS
+    whose BSON is at least `min_bytes` long is compressed into its own blob under _packed,
+    so a read can inflate just the fields it asked for. BSON keeps every stored type
+    (datetime, ObjectId, Decimal128, bytes) intact through the round trip.
+    """
+    if is_encoded(document):
+        return document
+
+    encoded: Dict[str, Any] = {}
+    packed: Dict[str, Binary] = {}
+    for field, value in document.items():
+        if field not in RAW_FIELDS:
+            data = bson.encode({"v": value})
+            if len(data) >= min_bytes:
+                packed[field] = Binary(_compress(codec, data, level))
+                continue
+        encoded[field] = value
+
+    if not packed:
+        return document
+    encoded.update({SCHEMA_FIELD: SCHEMA_VERSION, CODEC_FIELD: codec, PACKED_FIELD: packed})
+    return encoded
+
+
+def decode_document(document: Optional[Dict[str, Any]], fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Plain form of a stored document; documents written before compression pass through.
+    With `fields`, only those packed fields are decompressed (dotted paths by their root).
+    """
+    if document is None or not is_encoded(document):
+        return document
+
+    codec = document[CODEC_FIELD]
+    packed = document.get(PACKED_FIELD) or {}
+    wanted = None if fields is None else {field.split(".", 1)[0] for field in fields}
+    decoded = {
+        field: value for field, value in document.items()
+        if field not in (SCHEMA_FIELD, CODEC_FIELD, PACKED_FIELD)
+    }
+    for field, blob in packed.items():
+        if wanted is None or field in wanted:
+            decoded[field] = bson.decode(_decompress(codec, bytes(blob)))["v"]
+    return decoded
+
+
+def projection_for(fields: Optional[Iterable[str]]) -> Dict[str, int]:
+    """
+    find() projection returning `fields` whether they are stored plain or packed, or every field
+    but the revision without `fields`.
+    """
+    projection = {"_id": 0}
+    if not fields:
+        projection[REVISION_FIELD] = 0
+    else:
+        for field in fields:
+            projection[field] = 1
+            projection[f"{PACKED_FIELD}.{field.split('.', 1)[0]}"] = 1
+        projection.update({SCHEMA_FIELD: 1, CODEC_FIELD: 1})
+    return projection
@@ -0,0 +1,155 @@
+"""
+Convert stored transcripts/feedbacks to or from the compressed document format, and measure
+the size/latency trade-off of each codec on a sample of real documents.
+
+    python -m app.src.common.storage.migrate_documents migrate --codec zlib --batch-size 500
+    python -m app.src.common.storage.migrate_documents migrate --codec none
+    python -m app.src.common.storage.migrate_documents benchmark --sample 200
+"""
+import argparse
+import time
+from typing import Any, Dict, List, Optional
+
+import bson
+from pymongo import ReplaceOne
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.common.config.database import get_mongodb
+from app.src.common.storage.document_codec import (
+    CODECS, SCHEMA_FIELD, SCHEMA_VERSION, decode_document, encode_document, zstandard
+)
+
+COLLECTIONS = ("transcriptions", "feedbacks")
+
+
+def migrate_collection(
+        collection_name: str, codec: Optional[str], batch_size: int, min_bytes: int, level: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Rewrites the documents of a collection in batches of `batch_size` replaces. With a codec,
+    plain documents are compressed; without one, compressed documents are inflated back.
+    Already converted documents are skipped, so an interrupted run can simply be restarted.
+    """
+    collection = get_mongodb().get_connection()[get_mongodb().database][collection_name]
+    if codec:
+        criteria = {SCHEMA_FIELD: {"$ne": SCHEMA_VERSION}}
+    else:
+        criteria = {SCHEMA_FIELD: SCHEMA_VERSION}
+
+    scanned = converted = bytes_before = bytes_after = 0
+    batch: List[ReplaceOne] = []
+    for document in collection.find(criteria, batch_size=batch_size):
+        scanned += 1
+        if codec:
+            stored = encode_document(document, codec, min_bytes, level)
+        else:
+            stored = decode_document(document)
+        if stored is document:
+            continue
+
+        converted += 1
+        bytes_before += len(bson.encode(document))
+        bytes_after += len(bson.encode(stored))
+        batch.append(ReplaceOne({"_id": document["_id"]}, stored))
+        if len(batch) >= batch_size:
+            collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.bulk_write(batch, ordered=False)
+
+    return {
+        "collection": collection_name,
+        "scanned": scanned,
+        "converted": converted,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after
+    }
+
+
+def benchmark_collection(collection_name: str, sample: int, min_bytes: int) -> List[Dict[str, Any]]:
+    """
+    Stored size and encode/decode latency of every available codec on up to `sample` plain
+    documents, next to the uncompressed baseline. The single-field decode column is the cost
+    of a read that asks for one packed field only.
+    """
+    collection = get_mongodb().get_connection()[get_mongodb().database][collection_name]
+    documents = [
+        decode_document(document)
+        for document in collection.aggregate([{"$sample": {"size": sample}}])
+    ]
+    if not documents:
+        return []
+
+    raw_bytes = sum(len(bson.encode(document)) for document in documents)
+    rows = [{
+        "collection": collection_name,
+        "codec": "none",
+        "documents": len(documents),
+        "bytes": raw_bytes,
+        "ratio": 1.0,
+        "encode_ms": 0.0,
+        "decode_ms": 0.0,
+        "field_decode_ms": 0.0
+    }]
+
+    variants = [("zlib", 1), ("zlib", 6)]
+    if zstandard is not None:
+        variants += [("zstd", 3), ("zstd", 10)]
+    for codec, level in variants:
+        started = time.perf_counter()
+        encoded = [encode_document(document, codec, min_bytes, level) for document in documents]
+        encode_ms = (time.perf_counter() - started) * 1000 / len(documents)
+
+        started = time.perf_counter()
+        for document in encoded:
+            decode_document(document)
+        decode_ms = (time.perf_counter() - started) * 1000 / len(documents)
+
+        started = time.perf_counter()
+        for document in encoded:
+            packed = list(document.get("_packed") or {})
+            decode_document(document, packed[:1])
+        field_decode_ms = (time.perf_counter() - started) * 1000 / len(documents)
+
+        encoded_bytes = sum(len(bson.encode(document)) for document in encoded)
+        rows.append({
+            "collection": collection_name,
+            "codec": f"{codec}-{level}",
+            "documents": len(documents),
+            "bytes": encoded_bytes,
+            "ratio": round(raw_bytes / max(encoded_bytes, 1), 2),
+            "encode_ms": round(encode_ms, 3),
+            "decode_ms": round(decode_ms, 3),
+            "field_decode_ms": round(field_decode_ms, 3)
+        })
+    return rows
+
+
+def main() -> None:
+    settings = get_app_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="convert stored documents in batches")
+    migrate.add_argument("--codec", choices=CODECS + ("none",), default=settings.DOCUMENT_COMPRESSION or "zlib")
+    migrate.add_argument("--level", type=int, default=settings.DOCUMENT_COMPRESSION_LEVEL)
+    migrate.add_argument("--batch-size", type=int, default=500)
+    migrate.add_argument("--collection", choices=COLLECTIONS, action="append")
+
+    benchmark = commands.add_parser("benchmark", help="report size and latency per codec")
+    benchmark.add_argument("--sample", type=int, default=200)
+    benchmark.add_argument("--collection", choices=COLLECTIONS, action="append")
+
+    args = parser.parse_args()
+    min_bytes = int(settings.DOCUMENT_COMPRESS_MIN_BYTES)
+    for collection_name in args.collection or COLLECTIONS:
+        if args.command == "migrate":
+            codec = None if args.codec == "none" else args.codec
+            print(migrate_collection(collection_name, codec, args.batch_size, min_bytes, args.level))
+        else:
+            for row in benchmark_collection(collection_name, args.sample, min_bytes):
+                print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from datetime import datetime, date
 
 Base = declarative_base()
@@ -48,6 +48,12 @@ class User(Base):
 
 class Media(Base):
     __tablename__ = "cns_media_def"
+    __table_args__ = (
+        Index('idx_cns_media_def_store_file', 'cm_store_file'),
+        Index('idx_cns_media_def_event', 'cm_event_dt', 'cm_media_id'),
+        Index('idx_cns_media_def_user_event', 'cm_user_id', 'cm_event_dt', 'cm_media_id'),
+        Index('idx_cns_media_def_lead_event', 'cm_lead_id', 'cm_event_dt', 'cm_media_id'),
+    )
 
     id: Mapped[int] = mapped_column('cm_media_id', primary_key=True)
     media_code: Mapped[str] = mapped_column('cm_media_code', unique=True)
@@ -69,6 +75,19 @@ class Media(Base):
     lang_code: Mapped[str] = mapped_column('cm_lang_code')
     product: Mapped[str] = mapped_column('cm_product')
     lead_id: Mapped[str] = mapped_column('cm_lead_id')
+    upload_id: Mapped[str] = mapped_column('cm_upload_id', nullable=True)
+    probe_attempts: Mapped[int] = mapped_column('cm_probe_attempts', nullable=False, default=0)
+
+
+class MediaUploadPart(Base):
+    __tablename__ = "cns_media_upload_part"
+
+    id: Mapped[int] = mapped_column('mp_part_id', primary_key=True)
+    media_id: Mapped[int] = mapped_column('mp_media_id', ForeignKey('cns_media_def.cm_media_id'), nullable=False)
+    part_number: Mapped[int] = mapped_column('mp_part_number', nullable=False)
+    etag: Mapped[str] = mapped_column('mp_etag', nullable=False)
+    part_size: Mapped[int] = mapped_column('mp_part_size')
+    uploaded_dt: Mapped[datetime] = mapped_column('mp_uploaded_dt', default=datetime.now)
 
 
 class MediaStatus(Base):
@@ -0,0 +1,127 @@
+from typing import Dict, Any, List, Hashable, Iterable, Optional, Tuple, Type
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.common.config.database import get_db_session
+from app.src.common.decorators.db_exception_handlers import handle_db_exception
+from app.src.common.enum.access_outcome import AccessOutcome
+from app.src.common.exceptions.exceptions import (
+    NoUserFoundException,
+    NoLeadFoundException,
+    NotAssignedToUserException,
+    InvalidMediaException
+)
+from app.src.common.security.principal import Principal, get_principal_cache
+from app.src.core.models.db_models import Base, User, Lead, Media
+from app.src.core.repositories.geniric_repository import GenericDBRepository
+
+
+class AccessRepository(GenericDBRepository):
+    """
+    Resolves user existence, admin role and resource assignment for a principal and a batch
+    of leads or media in a single statement: the user row is outer joined to every requested
+    resource, so a missing user, a missing resource and an unassigned resource can be told apart.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession = Depends(get_db_session)
+    ) -> None:
+        super().__init__(User, session)
+
+    async def check_leads(self, user_id: str, lead_ids: Iterable[int]) -> Dict[int, AccessOutcome]:
+        return await self._check(user_id, list(lead_ids), Lead, Lead.id, Lead.assigned_to)
+
+    async def check_media(self, user_id: str, media_codes: Iterable[str]) -> Dict[str, AccessOutcome]:
+        return await self._check(user_id, list(media_codes), Media, Media.media_code, Media.user_id)
+
+    async def assume_lead_access(self, user_id: str, lead_id: int) -> None:
+        await self.assume_leads_access(user_id, [lead_id])
+
+    async def assume_leads_access(self, user_id: str, lead_ids: List[int]) -> None:
+        outcomes = await self.check_leads(user_id, lead_ids)
+        for lead_id, outcome in outcomes.items():
+            if outcome == AccessOutcome.NO_SUCH_USER:
+                raise NoUserFoundException(data={'user_id': user_id})
+            if outcome == AccessOutcome.NO_SUCH_RESOURCE:
+                raise NoLeadFoundException(data={'lead_id': lead_id})
+            if outcome == AccessOutcome.NOT_ASSIGNED:
+                raise NotAssignedToUserException(data={'lead_id': lead_id, 'user_id': user_id})
+
+    async def assume_media_access(self, user_id: str, media_codes: List[str]) -> None:
+        outcomes = await self.check_media(user_id, media_codes)
+        for media_code, outcome in outcomes.items():
+            if outcome == AccessOutcome.NO_SUCH_USER:
+                raise NoUserFoundException(data={'user_id': user_id})
+            if outcome == AccessOutcome.NO_SUCH_RESOURCE:
+                raise InvalidMediaException(
+                    description=f"Invalid media code provided {media_code}",
+                    data={'media_code': media_code}
+                )
+            if outcome == AccessOutcome.NOT_ASSIGNED:
+                raise NotAssignedToUserException(data={'media_code': media_code, 'user_id': user_id})
+
+    @handle_db_exception
+    async def _check(
+            self,
+            user_id: str,
+            resource_ids: List[Hashable],
+            resource_model: Type[Base],
+            resource_column: Any,
+            owner_column: Any
+    ) -> Dict[Hashable, AccessOutcome]:
+        if not resource_ids:
+            return {}
+
+        stmt = select(
+            User.id.label("user_id"),
+            User.clerk_id.label("clerk_id"),
+            User.role.label("role"),
+            User.manager_id.label("manager_id"),
+            User.user_group.label("user_group"),
+            resource_column.label("resource_id"),
+            owner_column.label("owner_id")
+        ).select_from(
+            User
+        ).outerjoin(
+            resource_model,
+            resource_column.in_(resource_ids)
+        ).where(
+            User.clerk_id == user_id
+        )
+
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return {resource_id: AccessOutcome.NO_SUCH_USER for resource_id in resource_ids}
+
+        principal, owners = self._split_rows(rows)
+        get_principal_cache().set(user_id, principal)
+
+        outcomes = {}
+        for resource_id in resource_ids:
+            if resource_id not in owners:
+                outcomes[resource_id] = AccessOutcome.NO_SUCH_RESOURCE
+            elif principal.is_admin or owners[resource_id] == principal.user_id:
+                outcomes[resource_id] = AccessOutcome.GRANTED
+            else:
+                outcomes[resource_id] = AccessOutcome.NOT_ASSIGNED
+        return outcomes
+
+    @staticmethod
+    def _split_rows(rows: List[Any]) -> Tuple[Principal, Dict[Hashable, Optional[int]]]:
+        first = rows[0]._asdict()
+        principal = Principal(
+            user_id=first["user_id"],
+            clerk_id=first["clerk_id"],
+            role=first["role"],
+            manager_id=first["manager_id"],
+            user_group=first["user_group"]
+        )
+        owners = {
+            row.resource_id: row.owner_id
+            for row in rows
+            if row.resource_id is not None
+        }
+        return principal, owners
@@ -1,29 +1,56 @@
-from typing import Tuple, Any
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from boto3 import client
+from botocore.exceptions import ClientError
 from fastapi import Depends
 
+from app.src.common.cache.ttl_cache import TTLCache
+from app.src.common.concurrency.blocking_executor import run_blocking
 from app.src.common.exceptions.application_exception import BaseAppException
 from app.src.common.enum.custom_error_code import CustomErrorCode
+from app.src.common.exceptions.exceptions import InvalidRangeException
+from app.src.common.media.header_probe import RangeReader, probe_duration
 from app.src.common.config.app_settings import get_app_settings, Settings
 from app.src.core.repositories.media_repository import MediaRepository
 
 
+@lru_cache
+def get_aws_client(service: str):
+    """
+    One boto3 client per service for the worker process. Clients are thread-safe, so the
+    blocking executor threads share them instead of paying the client construction per call.
+    """
+    settings = get_app_settings()
+    return client(service, region_name=settings.REGION)
+
+
+@lru_cache
+def get_media_url_cache() -> TTLCache[Tuple[str, float]]:
+    """
+    Process-wide (media_code, clerk_id) -> (presigned GET url, expires at) cache.
+    """
+    settings = get_app_settings()
+    return TTLCache(maxsize=settings.MEDIA_URL_CACHE_SIZE)
+
+
 class AwsRepository:
     def __init__(self,
-                 service
+                 service,
+                 media_repository: MediaRepository
                  ) -> None:
         self.settings = get_app_settings()
-        self.media_repository = MediaRepository()
-        self.client = client(service, region_name=self.settings.REGION)
+        self.media_repository = media_repository
+        self.client = get_aws_client(service)
         self.media_bucket = self.settings.MEDIA_BUCKET
 
 
 class S3Repository(AwsRepository):
-    def __init__(self):
-        super().__init__('s3')
+    def __init__(self, media_repository: MediaRepository = Depends()):
+        super().__init__('s3', media_repository)
 
-    def get_media_stream(self, media_code: str) -> Tuple[str, bytes, Any]:
-        key = self.media_repository.get_media_name(media_code)
+    async def _get_media_key(self, media_code: str) -> str:
+        key = await self.media_repository.get_media_name(media_code)
         if not key:
             raise BaseAppException(
                 status_code=400,
@@ -31,14 +58,223 @@ class S3Repository(AwsRepository):
                 custom_error_code=CustomErrorCode.NOT_FOUND_ERROR,
                 data={'media_code': media_code}
             )
+        return key
+
+    async def get_presigned_media_url(self, media_code: str, clerk_id: str) -> Tuple[str, float]:
+        """
+        Returns a presigned GET url of the media and its expiry (epoch seconds). Urls are
+        cached per caller and dropped `MEDIA_URL_REFRESH_MARGIN` seconds before they expire,
+        so a cached url is always usable for at least that long.
+        """
+        cache = get_media_url_cache()
+        cached = cache.get((media_code, clerk_id))
+        if cached is not None:
+            return cached
+
+        key = await self._get_media_key(media_code)
+        expiry = int(self.settings.MEDIA_URL_EXPIRY)
+        signed_at = time.time()
+        url = await run_blocking(
+            self.client.generate_presigned_url,
+            'get_object',
+            Params={'Bucket': self.media_bucket, 'Key': key},
+            ExpiresIn=expiry
+        )
+        expires_at = signed_at + expiry
+        cache.set(
+            (media_code, clerk_id),
+            (url, expires_at),
+            expires_at=expires_at - int(self.settings.MEDIA_URL_REFRESH_MARGIN)
+        )
+        return url, expires_at
+
+    async def generate_presigned_posts(
+            self,
+            stored_files: List[str],
+            expires_in: int = 120
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Signs an upload form for every stored file in a single executor call. Signing is
+        local, so a failure is returned in place of that file's form instead of raised.
+        """
+        conditions = [
+            [
+                "content-length-range",
+                self.settings.MEDIA_MIN_SIZE,
+                self.settings.MEDIA_MAX_SIZE,
+            ]
+        ]
+
+        def sign_all() -> List[Union[Dict[str, Any], Exception]]:
+            posts = []
+            for stored_file in stored_files:
+                try:
+                    posts.append(self.client.generate_presigned_post(
+                        self.media_bucket,
+                        stored_file,
+                        ExpiresIn=expires_in,
+                        Conditions=conditions
+                    ))
+                except Exception as e:
+                    posts.append(e)
+            return posts
 
-        s3_response = self.client.get_object(Bucket=self.media_bucket, Key=key)
-        return key, s3_response["Body"].read(), s3_response['ContentType']
+        return await run_blocking(sign_all)
+
+    async def create_multipart_upload(self, key: str) -> str:
+        response = await run_blocking(
+            self.client.create_multipart_upload, Bucket=self.media_bucket, Key=key
+        )
+        return response['UploadId']
+
+    async def presign_upload_parts(
+            self,
+            key: str,
+            upload_id: str,
+            part_numbers: List[int],
+            expires_in: int
+    ) -> Dict[int, str]:
+        def sign_all() -> Dict[int, str]:
+            return {
+                part_number: self.client.generate_presigned_url(
+                    'upload_part',
+                    Params={
+                        'Bucket': self.media_bucket,
+                        'Key': key,
+                        'UploadId': upload_id,
+                        'PartNumber': part_number
+                    },
+                    ExpiresIn=expires_in
+                )
+                for part_number in part_numbers
+            }
+
+        return await run_blocking(sign_all)
+
+    async def list_upload_parts(self, key: str, upload_id: str) -> List[Dict[str, Any]]:
+        def list_all() -> List[Dict[str, Any]]:
+            paginator = self.client.get_paginator('list_parts')
+            parts = []
+            for page in paginator.paginate(Bucket=self.media_bucket, Key=key, UploadId=upload_id):
+                parts.extend(
+                    {'part_number': part['PartNumber'], 'etag': part['ETag'], 'size': part['Size']}
+                    for part in page.get('Parts', [])
+                )
+            return parts
 
-    def is_media_uploaded(self, media_name: str) -> bool:
-        status = True
         try:
-            self.client.head_object(Bucket=self.settings.MEDIA_BUCKET, Key=media_name)
-        except Exception as e:
-            status = False
-        return status
+            return await run_blocking(list_all)
+        except ClientError as e:
+            raise self._multipart_exception(e, key, upload_id)
+
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict[str, Any]]) -> None:
+        multipart = {
+            'Parts': [
+                {'PartNumber': part['part_number'], 'ETag': part['etag']}
+                for part in sorted(parts, key=lambda part: part['part_number'])
+            ]
+        }
+        try:
+            await run_blocking(
+                self.client.complete_multipart_upload,
+                Bucket=self.media_bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload=multipart
+            )
+        except ClientError as e:
+            raise self._multipart_exception(e, key, upload_id)
+
+    async def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        try:
+            await run_blocking(
+                self.client.abort_multipart_upload,
+                Bucket=self.media_bucket,
+                Key=key,
+                UploadId=upload_id
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'NoSuchUpload':
+                raise self._multipart_exception(e, key, upload_id)
+
+    @staticmethod
+    def _multipart_exception(e: ClientError, key: str, upload_id: str) -> BaseAppException:
+        error = e.response.get('Error', {})
+        return BaseAppException(
+            status_code=400,
+            description=error.get('Message') or str(e),
+            custom_error_code=CustomErrorCode.AWS_ERROR,
+            data={'key': key, 'upload_id': upload_id, 'aws_error_code': error.get('Code')}
+        )
+
+    async def get_media_stream(self, media_code: str, byte_range: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Opens the S3 object of a media without reading its body. `byte_range` is an HTTP
+        `Range` value (e.g. "bytes=0-1023") forwarded to S3 as is; the returned dict carries
+        the boto3 `get_object` metadata plus a `Stream` async iterator over the body.
+        """
+        key = await self._get_media_key(media_code)
+
+        params = {'Bucket': self.media_bucket, 'Key': key}
+        if byte_range:
+            params['Range'] = byte_range
+
+        try:
+            s3_response = await run_blocking(self.client.get_object, **params)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                raise InvalidRangeException(
+                    data={'media_code': media_code, 'range': byte_range}
+                )
+            raise
+
+        s3_response['Key'] = key
+        s3_response['Stream'] = self._iter_body(s3_response['Body'])
+        return s3_response
+
+    async def _iter_body(self, body) -> AsyncIterator[bytes]:
+        chunk_size = int(self.settings.MEDIA_STREAM_CHUNK_SIZE)
+        try:
+            while True:
+                chunk = await run_blocking(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def probe_media(self, key: str, file_type: str) -> Tuple[Optional[float], int]:
+        """
+        Reads only the container header of a media object with ranged GETs and returns its
+        duration in seconds (None when it cannot be determined) and its size in bytes.
+        """
+        def fetch(offset: int, length: int) -> Tuple[bytes, int]:
+            response = self.client.get_object(
+                Bucket=self.media_bucket,
+                Key=key,
+                Range=f"bytes={offset}-{offset + length - 1}"
+            )
+            with response['Body'] as body:
+                data = body.read()
+            total = response.get('ContentRange', '').rpartition('/')[2]
+            return data, int(total) if total.isdigit() else response['ContentLength']
+
+        def probe() -> Tuple[Optional[float], int]:
+            reader = RangeReader(fetch, int(self.settings.MEDIA_PROBE_BLOCK_SIZE))
+            return probe_duration(file_type, reader), reader.get_size()
+
+        return await run_blocking(probe)
+
+    async def iter_media_objects(self) -> AsyncIterator[Dict[str, int]]:
+        """
+        Pages through the media bucket with list_objects_v2, yielding {key: size} per page.
+        """
+        params = {'Bucket': self.media_bucket}
+        while True:
+            page = await run_blocking(self.client.list_objects_v2, **params)
+            objects = {obj['Key']: obj['Size'] for obj in page.get('Contents', [])}
+            if objects:
+                yield objects
+            if not page.get('IsTruncated'):
+                break
+            params['ContinuationToken'] = page['NextContinuationToken']
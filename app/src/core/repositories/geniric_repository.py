@@ -1,8 +1,10 @@
-from typing import Dict, Any, Type
+from typing import Dict, Any, Type, Optional
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.src.common.config.database import Database
+from app.src.common.config.database import Database, get_database
+from app.src.common.security.principal import Principal, get_principal_cache
 from app.src.common.exceptions.exceptions import NoUserFoundException, NoLeadFoundException, NotAssignedToUserException
 from app.src.core.models.db_models import Base, Activity, Lead, User
 from app.src.common.decorators.db_exception_handlers import handle_db_exception
@@ -11,83 +13,105 @@ from app.src.common.decorators.db_exception_handlers import handle_db_exception
 class GenericDBRepository:
     def __init__(
             self,
-            model: Type[Base]
+            model: Type[Base],
+            session: AsyncSession
     ):
-        self.db: Database = Database()
-        self.session = self.db.Session()
+        self.db: Database = get_database()
+        self.session = session
         self.model: Base = model
 
     @handle_db_exception
-    def insert(self, record: Dict[str, Any]) -> Base:
+    async def insert(self, record: Dict[str, Any]) -> Base:
         model_record = self.model(**record)
         self.session.add(model_record)
-        self.session.commit()
+        await self.session.flush()
         return model_record
 
     @handle_db_exception
-    def record_activity(self, params: Dict[str, Any]) -> None:
+    async def record_activity(self, params: Dict[str, Any]) -> None:
         activity = Activity(**params)
         self.session.add(activity)
-        self.session.commit()
+        await self.session.flush()
 
     @handle_db_exception
-    def is_user_exists(self, user_id: str) -> bool:
-        result: bool = False
-        # query = select(User).where(User.clerk_id==user_id)
-        response = self.session.query(User).filter_by(clerk_id=user_id)
-        if response:
-            result = True
-        return result
-
-    def assume_user_exists(self, user_id: str) -> None:
-        if not self.is_user_exists(user_id):
+    async def get_principal(self, clerk_id: str) -> Optional[Principal]:
+        cache = get_principal_cache()
+        principal = cache.get(clerk_id)
+        if principal is not None:
+            return principal
+
+        query = select(
+            User.id.label("user_id"),
+            User.clerk_id.label("clerk_id"),
+            User.role.label("role"),
+            User.manager_id.label("manager_id"),
+            User.user_group.label("user_group")
+        ).where(User.clerk_id == clerk_id)
+        row = (await self.session.execute(query)).first()
+        if row is None:
+            return None
+
+        principal = Principal(**row._asdict())
+        cache.set(clerk_id, principal)
+        return principal
+
+    async def require_principal(self, clerk_id: str) -> Principal:
+        principal = await self.get_principal(clerk_id)
+        if principal is None:
+            raise NoUserFoundException(
+                data={'user_id': clerk_id}
+            )
+        return principal
+
+    async def is_user_exists(self, user_id: str) -> bool:
+        return await self.get_principal(user_id) is not None
+
+    async def assume_user_exists(self, user_id: str) -> None:
+        if not await self.is_user_exists(user_id):
             raise NoUserFoundException(
                 data={'user_id': user_id}
             )
 
-    def assume_lead_exists(self, lead_id: int) -> None:
-        if not self.is_lead_exists(lead_id):
+    async def assume_lead_exists(self, lead_id: int) -> None:
+        if not await self.is_lead_exists(lead_id):
             raise NoLeadFoundException(
                 data={"lead_id": lead_id}
             )
 
     @handle_db_exception
-    def is_lead_exists(self, lead_id: int) -> bool:
-        result = False
+    async def is_lead_exists(self, lead_id: int) -> bool:
         query = select(Lead.id).where(Lead.id == lead_id)
-        response, = self.session.execute(query).fetchone()
-        if response:
-            result = True
-        return result
+        row = (await self.session.execute(query)).first()
+        return row is not None
 
-    @handle_db_exception
-    def is_admin(self, user_id: str) -> bool:
-        query = select(User.role).where(User.clerk_id == user_id)
-        role, = self.session.execute(query).fetchone()
-        return role == 'ADMIN'
+    async def is_admin(self, user_id: str) -> bool:
+        principal = await self.require_principal(user_id)
+        return principal.is_admin
 
-    @handle_db_exception
-    def get_user_id(self, clerk_id: str) -> int:
-        query = select(User.id).where(User.clerk_id == clerk_id)
-        uid, = self.session.execute(query).fetchone()
-        return uid
+    async def get_user_id(self, clerk_id: str) -> int:
+        principal = await self.require_principal(clerk_id)
+        return principal.user_id
 
-    def assume_lead_assigned_to(self, lead_id: int, user_id: str) -> None:
-        if self.is_admin(user_id):
+    async def assume_lead_assigned_to(self, lead_id: int, user_id: str) -> None:
+        if await self.is_admin(user_id):
             return
-        if not self.is_assigned_to(lead_id, user_id):
+        if not await self.is_assigned_to(lead_id, user_id):
             raise NotAssignedToUserException(
                 data={"lead_id": lead_id, "user_id": user_id}
             )
 
     @handle_db_exception
-    def is_assigned_to(self, lead_id: int, user_id: str) -> bool:
+    async def is_assigned_to(self, lead_id: int, user_id: str) -> bool:
         stmt = select(
             Lead.id
         ).join(
             User, User.id == Lead.assigned_to
-        ).where(User.clerk_id == user_id and Lead.id == lead_id)
-        cursor = self.session.execute(stmt)
+        ).where(
+            User.clerk_id == user_id
+        ).where(
+            Lead.id == lead_id
+        )
+        cursor = await self.session.execute(stmt)
         if cursor.first() is None:
             return False
         return True
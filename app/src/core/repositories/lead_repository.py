@@ -1,10 +1,14 @@
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 
-from sqlalchemy import select, update
+from fastapi import Depends
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
+from app.src.common.config.database import get_db_session
 from app.src.common.decorators.db_exception_handlers import handle_db_exception
+from app.src.common.security.principal import Principal
 from app.src.core.models.db_models import LeadTypes, Lead, LeadStages, Media, User, Activity
 from app.src.core.repositories.geniric_repository import GenericDBRepository
 from app.src.core.repositories.user_repository import UserRepository
@@ -12,26 +16,25 @@ from app.src.core.repositories.user_repository import UserRepository
 
 class LeadRepository(GenericDBRepository):
     def __init__(
-            self
+            self,
+            session: AsyncSession = Depends(get_db_session)
     ) -> None:
-        super().__init__(Lead)
-        self.user_repository = UserRepository()
+        super().__init__(Lead, session)
+        self.user_repository = UserRepository(session)
 
     @handle_db_exception
-    def add_lead(self, lead_model: Dict[str, Any]) -> Dict[str, Any]:
+    async def add_lead(self, lead_model: Dict[str, Any]) -> Dict[str, Any]:
         dump = lead_model
-        row = self.session.execute(
+        row = (await self.session.execute(
             select(LeadStages.id.label("stage_id")).where(LeadStages.code == dump['stage_code'])
-        ).fetchone()
+        )).fetchone()
         dump.update(row._asdict())
 
-        row = self.session.execute(
-            select(User.id.label("assigned_to")).where(User.clerk_id == dump.get("user_id"))
-        ).fetchone()
-        dump.update(row._asdict())
+        user_id = await self.get_user_id(dump.pop('user_id'))
+        dump['assigned_to'] = user_id
         activity = {
-            'done_by': self.get_user_id(dump.pop('user_id')),
-            'stage_id': self._get_stage_id(dump.pop('stage_code')),
+            'done_by': user_id,
+            'stage_id': await self._get_stage_id(dump.pop('stage_code')),
             'activity_code': 'CREATE',
             'activity_desc': "Lead Created",
             'event_date': datetime.now(),
@@ -39,32 +42,32 @@ class LeadRepository(GenericDBRepository):
         lead = Lead(**dump)
 
         self.session.add(lead)
-        self.session.commit()
+        await self.session.flush()
         activity['lead_id'] = lead.id
-        self.record_activity(activity)
+        await self.record_activity(activity)
         return activity
 
     @handle_db_exception
-    def _get_stage_id(self, stage_code: str) -> int:
+    async def _get_stage_id(self, stage_code: str) -> int:
         query = select(LeadStages.id).where(LeadStages.code == stage_code)
-        stage_id, = self.session.execute(query).fetchone()
+        stage_id, = (await self.session.execute(query)).fetchone()
         return stage_id
 
     @handle_db_exception
-    def add_lead_type(self, type_model: Dict[str, Any]) -> Optional[LeadTypes]:
+    async def add_lead_type(self, type_model: Dict[str, Any]) -> Optional[LeadTypes]:
         lead_type = LeadTypes(**type_model)
         self.session.add(lead_type)
-        self.session.commit()
+        await self.session.flush()
         return lead_type
 
     @handle_db_exception
-    def get_stages(self) -> List[Dict[str, Any]]:
+    async def get_stages(self) -> List[Dict[str, Any]]:
         stmt = select(
             LeadStages.id.label("stage_id"),
             LeadStages.code.label("stage_name")
         ).where(LeadStages.is_active == True)
 
-        cursor = self.session.execute(stmt)
+        cursor = await self.session.execute(stmt)
         stages = []
         for rec in cursor.fetchall():
             stages.append(rec._asdict())
@@ -72,7 +75,7 @@ class LeadRepository(GenericDBRepository):
         return stages
 
     @handle_db_exception
-    def get_assigned_leads(self, user_id: str) -> List[Dict[str, Any]]:
+    async def get_assigned_leads(self, user_id: str) -> List[Dict[str, Any]]:
         stmt = (select(
             Lead.id.label("lead_id"),
             Lead.name.label("lead_name"),
@@ -84,15 +87,15 @@ class LeadRepository(GenericDBRepository):
             User.id == Lead.assigned_to
         ))
 
-        if not self.is_admin(user_id):
+        if not await self.is_admin(user_id):
             stmt = stmt.where(User.clerk_id == user_id)
 
-        leads_cursor = self.session.execute(stmt)
+        leads_cursor = await self.session.execute(stmt)
         leads = [lead._asdict() for lead in leads_cursor.fetchall()]
         return leads
 
     @handle_db_exception
-    def get_lead_info(self, lead_id: int) -> Dict[str, Any]:
+    async def get_lead_info(self, lead_id: int) -> Dict[str, Any]:
         stmt = select(
             Lead.id.label("lead_id"),
             Lead.name.label("lead_name"),
@@ -107,11 +110,11 @@ class LeadRepository(GenericDBRepository):
             User.id == Lead.assigned_to
         ).where(Lead.id == lead_id)
 
-        row = self.session.execute(stmt).first()
+        row = (await self.session.execute(stmt)).first()
         return row._asdict()
 
     @handle_db_exception
-    def get_lead_conversations(self, lead_id: int) -> List[Dict[str, Any]]:
+    async def get_lead_conversations(self, lead_id: int) -> List[Dict[str, Any]]:
         ActionedUser = aliased(User)
         TargetedUser = aliased(User)
         stmt = (
@@ -145,10 +148,59 @@ class LeadRepository(GenericDBRepository):
             )
         )
 
-        result = self.session.execute(stmt).fetchall()
+        result = (await self.session.execute(stmt)).fetchall()
         rows = [self._format_conversation(row._asdict()) for row in result]
         return rows
 
+    @staticmethod
+    def activity_query(
+            principal: Principal,
+            lead_id: Optional[int] = None,
+            from_date: Optional[datetime] = None,
+            to_date: Optional[datetime] = None
+    ) -> Select:
+        """
+        Flat cns_activity rows for reporting; non admins only see leads assigned to them.
+        """
+        ActionedUser = aliased(User)
+        TargetedUser = aliased(User)
+        stmt = (
+            select(
+                Activity.id.label("activity_id"),
+                Activity.event_date.label("event_date"),
+                Activity.activity_code.label("event_type"),
+                Activity.activity_desc.label("comment"),
+                Lead.id.label("lead_id"),
+                Lead.name.label("lead_name"),
+                ActionedUser.clerk_id.label("user_id"),
+                ActionedUser.first_name.label("user_name"),
+                TargetedUser.clerk_id.label("assigned_to"),
+                Activity.stage_id.label("stage_id"),
+                Activity.media_code.label("media_code")
+            ).join(
+                Lead,
+                Lead.id == Activity.lead_id
+            ).join(
+                ActionedUser,
+                ActionedUser.id == Activity.done_by,
+                isouter=True
+            ).join(
+                TargetedUser,
+                TargetedUser.id == Activity.affected_user,
+                isouter=True
+            )
+        )
+        if not principal.is_admin:
+            stmt = stmt.where(Lead.assigned_to == principal.user_id)
+        if lead_id is not None:
+            stmt = stmt.where(Activity.lead_id == lead_id)
+        if from_date is not None:
+            stmt = stmt.where(Activity.event_date >= from_date)
+        if to_date is not None:
+            stmt = stmt.where(Activity.event_date < to_date)
+
+        return stmt.order_by(Activity.id)
+
     def _format_conversation(self, record: Dict[str, Any]) -> Dict[str, Any]:
         event_type = record.get("event_type")
         event_info = {'comment': record.get('comment')}
@@ -175,12 +227,12 @@ class LeadRepository(GenericDBRepository):
         }
 
     @handle_db_exception
-    def update_stage(self, lead_id: int, stage_id: int, user_id: str) -> Optional[Dict[str, Any]]:
+    async def update_stage(self, lead_id: int, stage_id: int, user_id: str) -> Optional[Dict[str, Any]]:
         stmt = update(Lead).where(Lead.id == lead_id).values({'stage_id': stage_id})
-        self.session.execute(stmt)
-        self.session.commit()
+        await self.session.execute(stmt)
+        await self.session.flush()
         activity = {
-            'done_by': self.user_repository.get_user_id(user_id),
+            'done_by': await self.user_repository.get_user_id(user_id),
             'lead_id': lead_id,
             'activity_code': 'TRANSFER',
             'activity_desc': 'Stage updated',
@@ -189,26 +241,22 @@ class LeadRepository(GenericDBRepository):
         }
         return activity
 
-    @handle_db_exception
-    def is_admin_user(self, user_id: str) -> bool:
-        query = select(User.id).filter(User.clerk_id == user_id).filter(User.role == 'ADMIN')
-        row = self.session.execute(query).fetchone()
-        status = True if row else False
-        return status
+    async def is_admin_user(self, user_id: str) -> bool:
+        principal = await self.get_principal(user_id)
+        return principal is not None and principal.is_admin
 
     @handle_db_exception
-    def assign_lead(self, lead_id: int, user_id: str) -> Optional[Dict[str, Any]]:
-        user_query = select(User.id.label('user_id')).where(User.clerk_id == user_id)
-        uid, = self.session.execute(user_query).fetchone()
+    async def assign_lead(self, lead_id: int, user_id: str) -> Optional[Dict[str, Any]]:
+        uid = await self.get_user_id(user_id)
         query = update(Lead).where(Lead.id == lead_id).values(
             {
                 'assigned_to': uid
             }
         )
-        self.session.execute(query)
-        self.session.commit()
+        await self.session.execute(query)
+        await self.session.flush()
         activity = {
-            'done_by': self.user_repository.get_user_id(user_id),
+            'done_by': await self.user_repository.get_user_id(user_id),
             'lead_id': lead_id,
             'activity_code': 'ASSIGNED',
             'activity_desc': 'Lead assigned to user',
@@ -1,57 +1,73 @@
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from sqlalchemy import Row, select
+from fastapi import Depends
+from sqlalchemy import Row, Select, and_, case, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.src.common.decorators.db_exception_handlers import handle_db_exception
-from app.src.common.exceptions.exceptions import NotAssignedToUserException
-from app.src.core.models.db_models import Media, Lead, User, MediaStatus
+from app.src.common.security.principal import Principal
+from app.src.core.models.db_models import Activity, Media, Lead, LeadStages, User, MediaStatus, MediaUploadPart
+from app.src.core.repositories.access_repository import AccessRepository
 from app.src.core.repositories.user_repository import UserRepository
 from app.src.core.repositories.geniric_repository import GenericDBRepository
-from app.src.common.config.database import get_mongodb
+from app.src.common.concurrency.blocking_executor import run_blocking
+from app.src.common.constants.global_constants import COMPLETED_STATUS_CODES
+from app.src.common.config.database import get_mongodb, get_db_session
 
 
 class MediaRepository(GenericDBRepository):
     def __init__(
-            self
+            self,
+            session: AsyncSession = Depends(get_db_session)
     ):
-        super().__init__(Media)
+        super().__init__(Media, session)
         self.mongo_db = get_mongodb()
-        self.user_repository = UserRepository()
+        self.user_repository = UserRepository(session)
+        self.access_repository = AccessRepository(session)
 
     @handle_db_exception
-    def register_media(self, media_model: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        clerk_id = media_model.get('user_id')
-        # media_model['clerk_id'] = clerk_id
-        media_model['user_id'] = self.user_repository.get_user_id(clerk_id)
-        model = self.model(**media_model)
-        self.session.add(model)
-        self.session.commit()
-        activity = {
-            'done_by': self.user_repository.get_user_id(clerk_id),
-            'lead_id': media_model.get('lead_id'),
-            'activity_code': 'UPLOAD',
-            'activity_desc': 'Media uploaded',
-            'event_date': datetime.now(),
-            'stage_id': media_model.get('stage_id'),
-            'media_code': media_model.get('media_code')
-        }
-
-        return activity
-
-    @handle_db_exception
-    def get_id_for_clerk(self, clerk_id: str) -> int:
-        stmt = select(User.id.label("user_id")).where(User.clerk_id == clerk_id)
-        row = self.session.execute(stmt).fetchone()
-        user_id = row._asdict().get("user_id")
-        return user_id
-
-    @handle_db_exception
-    def get_uploads(self, user_id: str) -> List[Row]:
-        user_cur = self.session.execute(select(User.role).where(User.clerk_id == user_id))
-        user_role, = user_cur.fetchone()
+    async def register_media(self, clerk_id: str, media_models: List[Dict[str, Any]]) -> None:
+        """
+        Inserts all media rows of an upload request and their UPLOAD activities with one
+        executemany each, inside the request's transaction.
+        """
+        if not media_models:
+            return
 
+        user_id = await self.get_user_id(clerk_id)
+        now = datetime.now()
+        media_rows = [{**media_model, 'user_id': user_id} for media_model in media_models]
+        activities = [
+            {
+                'done_by': user_id,
+                'lead_id': media_model.get('lead_id'),
+                'activity_code': 'UPLOAD',
+                'activity_desc': 'Media uploaded',
+                'event_date': now,
+                'stage_id': media_model.get('stage_id'),
+                'media_code': media_model.get('media_code')
+            }
+            for media_model in media_models
+        ]
+
+        await self.session.execute(insert(Media), media_rows)
+        await self.session.execute(insert(Activity), activities)
+
+    async def get_id_for_clerk(self, clerk_id: str) -> int:
+        return await self.get_user_id(clerk_id)
+
+    @staticmethod
+    def uploads_query(
+            principal: Principal,
+            lead_id: Optional[int] = None,
+            conv_type: Optional[str] = None,
+            from_date: Optional[datetime] = None,
+            to_date: Optional[datetime] = None,
+            is_uploaded: Optional[bool] = None
+    ) -> Select:
         query = (
             select(
+                Media.id.label("media_id"),
                 Media.media_code.label("media_code"),
                 Media.file_type.label("media_type"),
                 Media.media_size.label("media_size"),
@@ -60,7 +76,9 @@ class MediaRepository(GenericDBRepository):
                 User.first_name.label("user_name"),
                 Lead.id.label("lead_id"),
                 Lead.name.label("lead_name"),
-                Media.conv_type.label("conv_type")
+                Media.conv_type.label("conv_type"),
+                Media.event_date.label("event_date"),
+                Media.is_uploaded.label("is_uploaded")
             ).join(
                 Lead,
                 Lead.id == Media.lead_id,
@@ -70,38 +88,167 @@ class MediaRepository(GenericDBRepository):
                 User.id == Media.user_id
             )
         )
-        if user_role.upper() != 'ADMIN':
-            query = query.filter(
-                User.clerk_id == user_id
-            )
+        if not principal.is_admin:
+            query = query.where(Media.user_id == principal.user_id)
+        if lead_id is not None:
+            query = query.where(Media.lead_id == lead_id)
+        if conv_type is not None:
+            query = query.where(Media.conv_type == conv_type)
+        if from_date is not None:
+            query = query.where(Media.event_date >= from_date)
+        if to_date is not None:
+            query = query.where(Media.event_date < to_date)
+        if is_uploaded is not None:
+            query = query.where(Media.is_uploaded.is_(is_uploaded))
+
+        return query.order_by(Media.event_date.desc(), Media.id.desc())
 
-        print("Get Uploads query:", query)
-        print("user_id", user_id)
-
-        records = self.session.execute(query).all()
+    @handle_db_exception
+    async def get_uploads(
+            self,
+            user_id: str,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None,
+            **filters: Any
+    ) -> List[Row]:
+        """
+        One page of media, newest first, ordered by (event_date, id). `after` is the
+        (event_date, id) of the last row of the previous page, so every page is an index range
+        scan on idx_cns_media_def_user_event / _lead_event / _event instead of an OFFSET.
+        """
+        principal = await self.require_principal(user_id)
+
+        query = self.uploads_query(principal, **filters)
+        if after is not None:
+            event_date, media_id = after
+            query = query.where(
+                or_(
+                    Media.event_date < event_date,
+                    and_(Media.event_date == event_date, Media.id < media_id)
+                )
+            )
 
-        return records
+        return (await self.session.execute(query.limit(limit))).all()
 
     @handle_db_exception
-    def get_media_name(self, media_code) -> Optional[str]:
-        rows = (self.session.query(
-            Media.stored_file
-        ).filter(Media.media_code == media_code).all())
+    async def get_media_name(self, media_code) -> Optional[str]:
+        query = select(Media.stored_file).where(Media.media_code == media_code)
+        rows = (await self.session.execute(query)).all()
 
         if not rows:
             return None
 
         return rows[0][0]
 
-    def get_feedback(self, media_code: str) -> Dict[str, Any]:
-        if self.is_uploaded(media_code):
-            return self.mongo_db.get_feedback(media_code)
+    @handle_db_exception
+    async def get_upload_target(self, media_code: str) -> Optional[Row]:
+        query = select(
+            Media.id.label("media_id"),
+            Media.stored_file.label("stored_file"),
+            Media.file_type.label("file_type"),
+            Media.upload_id.label("upload_id"),
+            Media.is_uploaded.label("is_uploaded")
+        ).where(Media.media_code == media_code)
+        return (await self.session.execute(query)).first()
+
+    @handle_db_exception
+    async def set_upload_id(self, media_id: int, upload_id: Optional[str]) -> None:
+        await self.session.execute(
+            update(Media).where(Media.id == media_id).values(upload_id=upload_id)
+        )
+        if upload_id is None:
+            await self.session.execute(
+                delete(MediaUploadPart).where(MediaUploadPart.media_id == media_id)
+            )
+
+    @handle_db_exception
+    async def get_upload_parts(self, media_id: int) -> List[Row]:
+        query = select(
+            MediaUploadPart.part_number.label("part_number"),
+            MediaUploadPart.etag.label("etag"),
+            MediaUploadPart.part_size.label("size")
+        ).where(
+            MediaUploadPart.media_id == media_id
+        ).order_by(MediaUploadPart.part_number)
+        return (await self.session.execute(query)).all()
+
+    @handle_db_exception
+    async def record_upload_parts(self, media_id: int, parts: List[Dict[str, Any]]) -> None:
+        """
+        Replaces the stored state of the given parts; a re-uploaded part gets a new ETag.
+        """
+        if not parts:
+            return
 
-    def get_transcription(self, media_code: str) -> Any:
-        if self.is_uploaded(media_code):
-            return self.mongo_db.get_transcription(media_code)
+        await self.session.execute(
+            delete(MediaUploadPart).where(
+                MediaUploadPart.media_id == media_id
+            ).where(
+                MediaUploadPart.part_number.in_([part['part_number'] for part in parts])
+            )
+        )
+        now = datetime.now()
+        await self.session.execute(
+            insert(MediaUploadPart),
+            [
+                {
+                    'media_id': media_id,
+                    'part_number': part['part_number'],
+                    'etag': part['etag'],
+                    'part_size': part.get('size'),
+                    'uploaded_dt': now
+                }
+                for part in parts
+            ]
+        )
 
-    def is_assigned_to(self, media_code: str, user_id: str) -> bool:
+    @handle_db_exception
+    async def mark_uploaded(self, media_id: int, media_size: Optional[int] = None) -> None:
+        values: Dict[str, Any] = {'is_uploaded': True, 'upload_id': None}
+        if media_size:
+            values['media_size'] = media_size
+        await self.session.execute(update(Media).where(Media.id == media_id).values(**values))
+        await self.session.execute(
+            delete(MediaUploadPart).where(MediaUploadPart.media_id == media_id)
+        )
+
+    async def get_feedback(self, media_code: str, check_uploaded: bool = True) -> Dict[str, Any]:
+        if not check_uploaded or await self.is_uploaded(media_code):
+            return await run_blocking(self.mongo_db.get_feedback, media_code)
+
+    async def get_transcription(self, media_code: str, check_uploaded: bool = True) -> Any:
+        if not check_uploaded or await self.is_uploaded(media_code):
+            return await run_blocking(self.mongo_db.get_transcription, media_code)
+
+    async def get_document_revision(self, kind: str, media_code: str) -> Optional[str]:
+        collection_name = "transcriptions" if kind == "transcription" else "feedbacks"
+        return await run_blocking(self.mongo_db.get_revision, media_code, collection_name)
+
+    async def get_segment_index(self, media_code: str) -> Optional[Dict[str, Any]]:
+        return await run_blocking(self.mongo_db.get_segment_index, media_code)
+
+    async def get_transcription_segments(self, media_code: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+        return await run_blocking(self.mongo_db.get_transcription_segments, media_code, skip, limit)
+
+    async def search_transcripts(
+            self,
+            query: str,
+            owner_ids: Optional[List[int]],
+            offset: int,
+            limit: int,
+            max_candidates: int,
+            max_highlights: int
+    ) -> Dict[str, Any]:
+        return await run_blocking(
+            self.mongo_db.search_transcripts, query, owner_ids, offset, limit, max_candidates, max_highlights
+        )
+
+    @handle_db_exception
+    async def get_media_owners(self, media_codes: List[str]) -> Dict[str, int]:
+        query = select(Media.media_code, Media.user_id).where(Media.media_code.in_(media_codes))
+        return {media_code: user_id for media_code, user_id in (await self.session.execute(query)).all()}
+
+    async def is_assigned_to(self, media_code: str, user_id: str) -> bool:
         result: bool = False
 
         query = select(
@@ -115,33 +262,171 @@ class MediaRepository(GenericDBRepository):
             Media.media_code == media_code
         )
 
-        rec = self.session.execute(query).fetchone()
+        rec = (await self.session.execute(query)).fetchone()
         if rec:
             result = True
 
         return result
 
-    def assume_media_assigned_to(self, media_code: str, user_id: str) -> None:
-        if self.user_repository.is_admin(user_id):
-            return
+    async def assume_media_assigned_to(self, media_code: str, user_id: str) -> None:
+        await self.access_repository.assume_media_access(user_id, [media_code])
 
-        if not self.is_assigned_to(media_code, user_id):
-            raise NotAssignedToUserException(
-                data={
-                    'media_code': media_code,
-                    'user_id': user_id
-                }
+    @handle_db_exception
+    async def is_uploaded(self, media_code: str) -> bool:
+        query = select(Media.is_uploaded).where(Media.media_code == media_code)
+        row = (await self.session.execute(query)).fetchone()
+
+        return bool(row and row[0])
+
+    @handle_db_exception
+    async def get_unprobed_media(self, limit: int, max_attempts: int) -> List[Row]:
+        """
+        Uploaded media without a media_len, skipping those whose probe already failed
+        `max_attempts` times so they cannot crowd every batch.
+        """
+        query = select(
+            Media.id.label("media_id"),
+            Media.stored_file.label("stored_file"),
+            Media.file_type.label("file_type")
+        ).where(
+            Media.is_uploaded.is_(True)
+        ).where(
+            Media.media_len.is_(None)
+        ).where(
+            Media.probe_attempts < max_attempts
+        ).order_by(Media.id).limit(limit)
+        return (await self.session.execute(query)).all()
+
+    @handle_db_exception
+    async def update_media_probes(self, probes: List[Dict[str, Any]]) -> None:
+        """
+        Writes media_len/media_size for a batch of media with one executemany keyed by id.
+        """
+        if probes:
+            await self.session.execute(update(Media), probes)
+
+    @handle_db_exception
+    async def count_failed_probes(self, media_ids: List[int]) -> None:
+        if media_ids:
+            await self.session.execute(
+                update(Media).where(Media.id.in_(media_ids)).values(probe_attempts=Media.probe_attempts + 1)
             )
 
     @handle_db_exception
-    def is_uploaded(self, media_code: str) -> bool:
-        query = select(Media.is_uploaded).where(Media.media_code == media_code)
-        status, = self.session.execute(query).fetchone()
+    async def mark_uploaded_by_keys(self, bucket: str, objects: Dict[str, Optional[int]]) -> int:
+        """
+        Flips is_uploaded for every not yet uploaded media stored under one of the given keys
+        of `bucket` in a single UPDATE, filling media_size from the object sizes when known.
+        Returns the number of rows changed.
+        """
+        if not objects:
+            return 0
+
+        values: Dict[str, Any] = {'is_uploaded': True}
+        sizes = {key: size for key, size in objects.items() if size is not None}
+        if sizes:
+            values['media_size'] = case(sizes, value=Media.stored_file, else_=Media.media_size)
+
+        result = await self.session.execute(
+            update(Media).where(
+                Media.bucket == bucket
+            ).where(
+                Media.stored_file.in_(list(objects))
+            ).where(
+                Media.is_uploaded.is_(False)
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @handle_db_exception
+    async def get_media_state(self, media_code: str) -> Optional[Row]:
+        query = select(
+            Media.user_id.label("owner_id"),
+            Media.is_uploaded.label("is_uploaded"),
+            MediaStatus.trans_status_cd.label("trans_status_cd"),
+            MediaStatus.fedbk_status_cd.label("fedbk_status_cd")
+        ).join(
+            MediaStatus,
+            MediaStatus.media_id == Media.id,
+            isouter=True
+        ).where(
+            Media.media_code == media_code
+        )
+        return (await self.session.execute(query)).first()
 
-        return True #status
+    @handle_db_exception
+    async def get_media_detail(self, media_code: str) -> Optional[Row]:
+        """
+        Media row, both generation statuses and the lead summary in a single query.
+        """
+        query = select(
+            Media.media_code.label("media_code"),
+            Media.user_id.label("owner_id"),
+            Media.original_name.label("original_name"),
+            Media.file_type.label("file_type"),
+            Media.media_len.label("media_len"),
+            Media.media_size.label("media_size"),
+            Media.event_date.label("event_date"),
+            Media.conv_type.label("conv_type"),
+            Media.lang_code.label("lang_code"),
+            Media.product.label("product"),
+            Media.is_uploaded.label("is_uploaded"),
+            MediaStatus.trans_status_cd.label("trans_status_cd"),
+            MediaStatus.fedbk_status_cd.label("fedbk_status_cd"),
+            Lead.id.label("lead_id"),
+            Lead.name.label("lead_name"),
+            Lead.email.label("lead_email"),
+            Lead.phone.label("lead_phone"),
+            LeadStages.code.label("lead_stage_code"),
+            User.clerk_id.label("lead_assigned_clerk_id")
+        ).join(
+            MediaStatus,
+            MediaStatus.media_id == Media.id,
+            isouter=True
+        ).join(
+            Lead,
+            Lead.id == Media.lead_id,
+            isouter=True
+        ).join(
+            LeadStages,
+            LeadStages.id == Lead.stage_id,
+            isouter=True
+        ).join(
+            User,
+            User.id == Lead.assigned_to,
+            isouter=True
+        ).where(
+            Media.media_code == media_code
+        )
+        return (await self.session.execute(query)).first()
+
+    @handle_db_exception
+    async def get_statuses(self, media_codes: List[str]) -> List[Row]:
+        """
+        Generation status of many media with a single IN query against cns_media_status.
+        """
+        if not media_codes:
+            return []
+
+        query = select(
+            Media.media_code.label("media_code"),
+            MediaStatus.trans_status_cd.label("trans_status_cd"),
+            MediaStatus.trans_start_dt.label("trans_start_dt"),
+            MediaStatus.trans_end_dt.label("trans_end_dt"),
+            MediaStatus.fedbk_status_cd.label("fedbk_status_cd"),
+            MediaStatus.fedbk_start_dt.label("fedbk_start_dt"),
+            MediaStatus.fedbk_end_dt.label("fedbk_end_dt")
+        ).join(
+            MediaStatus,
+            MediaStatus.media_id == Media.id,
+            isouter=True
+        ).where(
+            Media.media_code.in_(media_codes)
+        )
+        return (await self.session.execute(query)).all()
 
     @handle_db_exception
-    def is_feedback_generated(self, media_code) -> bool:
+    async def is_feedback_generated(self, media_code) -> bool:
         return_value = False
 
         query = select(
@@ -153,15 +438,15 @@ class MediaRepository(GenericDBRepository):
             Media.media_code == media_code
         )
 
-        row = self.session.execute(query).fetchone()
+        row = (await self.session.execute(query)).fetchone()
         status, = row
-        if status in ['S', 'C']:
+        if status in COMPLETED_STATUS_CODES:
             return_value = True
 
         return return_value
 
     @handle_db_exception
-    def is_transcript_generated(self, media_code) -> bool:
+    async def is_transcript_generated(self, media_code) -> bool:
         return_value = False
 
         query = select(
@@ -173,9 +458,9 @@ class MediaRepository(GenericDBRepository):
             Media.media_code == media_code
         )
 
-        row = self.session.execute(query).fetchone()
+        row = (await self.session.execute(query)).fetchone()
         status, = row
-        if status in ['S', 'C']:
+        if status in COMPLETED_STATUS_CODES:
             return_value = True
 
         return return_value
@@ -1,9 +1,13 @@
 import select
 from typing import List, Any, Dict
 
+from fastapi import Depends
 from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.src.common.config.database import get_db_session
 from app.src.common.decorators.db_exception_handlers import handle_db_exception
+from app.src.common.security.principal import evict_principal_on_commit
 from app.src.core.repositories.geniric_repository import GenericDBRepository
 from app.src.core.models.db_models import User, UserGroup
 from app.src.core.schemas.requests.create_user_request import CreateUserRequest
@@ -12,48 +16,51 @@ from app.src.core.schemas.requests.create_user_group_request import CreateUserGr
 
 class UserRepository(GenericDBRepository):
     def __init__(
-            self
+            self,
+            session: AsyncSession = Depends(get_db_session)
     ) -> None:
-        super().__init__(User)
+        super().__init__(User, session)
 
     @handle_db_exception
-    def add_user(self, user_model: CreateUserRequest) -> User:
+    async def add_user(self, user_model: CreateUserRequest) -> User:
         manager_id = None
         if user_model.manager_id is not None and user_model.manager_id != "":
-            manager_id, = self.session.execute(select(User.id).where(User.clerk_id == user_model.manager_id)).fetchone()
+            manager_id = await self.get_user_id(user_model.manager_id)
         user_dump = user_model.model_dump()
         user_dump['clerk_id'] = user_dump['user_name']
         user_dump['manager_id'] = manager_id
 
         user = User(**user_dump)
         self.session.add(user)
-        self.session.commit()
+        await self.session.flush()
         return user
 
     @handle_db_exception
-    def add_user_group(self, user_group_model: CreateUserGroupRequest) -> UserGroup:
+    async def add_user_group(self, user_group_model: CreateUserGroupRequest) -> UserGroup:
         user_group = UserGroup(**user_group_model.model_dump())
         self.session.add(user_group)
-        self.session.commit()
+        await self.session.flush()
         return user_group
 
     @handle_db_exception
-    def get_team(self, user_id: str) -> List[Any]:
+    async def get_team(self, user_id: str) -> List[Any]:
         cte = select(User.id, User.clerk_id).where(User.clerk_id == user_id).cte(recursive=True)
         cte = cte.union_all(
             select(User.id, User.clerk_id).where(User.manager_id == cte.c.id)
         )
-        result = self.session.execute(select([cte]))
+        result = await self.session.execute(select(cte.c.id))
         return [usr_id for usr_id, in result.all()]
 
     @handle_db_exception
-    def update_user(self, user_id: str, user_data: Dict[str, Any]) -> None:
+    async def update_user(self, user_id: str, user_data: Dict[str, Any]) -> None:
         cte = update(User).where(User.clerk_id == user_id).values(user_data)
-        self.session.execute(cte)
-        self.session.commit()
+        await self.session.execute(cte)
+        await self.session.flush()
+        evict_principal_on_commit(self.session, user_id)
 
     @handle_db_exception
-    def delete_user(self, user_id: str) -> None:
+    async def delete_user(self, user_id: str) -> None:
         cte = delete(User).where(User.clerk_id == user_id)
-        self.session.execute(cte)
-        self.session.commit()
+        await self.session.execute(cte)
+        await self.session.flush()
+        evict_principal_on_commit(self.session, user_id)
@@ -1,8 +1,11 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from app.src.common.config.database import UnitOfWorkRoute
+from app.src.common.enum.export_format import ExportFormat
 from app.src.common.security.authorization import DecodedPayload, JWTBearer
 from app.src.core.schemas.requests.create_lead_request import CreateLeadRequestModel
 from app.src.core.schemas.requests.create_lead_type_request import CreateLeadTypeRequestModel
@@ -10,9 +13,10 @@ from app.src.core.schemas.responses.create_lead_response import CreateLeadRespon
 from app.src.core.schemas.responses.create_lead_type_response import CreateLeadTypeResponseModel
 from app.src.core.schemas.responses.lead_info_response import LeadInfoResponse
 # from app.src.core.schemas.responses.get_leads_response import GetLeadsResponse
+from app.src.core.services.export_service import ExportService
 from app.src.core.services.lead_service import LeadService
 
-lead_router = APIRouter(tags=['Lead'])
+lead_router = APIRouter(tags=['Lead'], route_class=UnitOfWorkRoute)
 
 
 @lead_router.post(
@@ -27,7 +31,7 @@ async def create_lead(
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    response = lead_service.create_lead(lead_input, user_id)
+    response = await lead_service.create_lead(lead_input, user_id)
     return JSONResponse(content=response)
 
 
@@ -43,7 +47,7 @@ async def create_lead_type(
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    response = lead_service.create_lead_type(lead_type_input, user_id)
+    response = await lead_service.create_lead_type(lead_type_input, user_id)
     return JSONResponse(content=response)
 
 
@@ -59,7 +63,7 @@ async def lead_info(
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    response = lead_service.get_lead_info(lead_id, user_id)
+    response = await lead_service.get_lead_info(lead_id, user_id)
     return JSONResponse(content=response.model_dump())
 
 
@@ -75,7 +79,7 @@ async def update_lead_stage(
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    status = lead_service.update_stage(lead_id, user_id, stage_id)
+    status = await lead_service.update_stage(lead_id, user_id, stage_id)
     return JSONResponse(content=status)
 
 
@@ -91,7 +95,7 @@ async def assign_to(
         decoded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoded_payload.get('user_id')
-    response = lead_service.assign_to(lead_ids, user_id, target_user)
+    response = await lead_service.assign_to(lead_ids, user_id, target_user)
     return JSONResponse(content=response)
 
 
@@ -107,5 +111,28 @@ async def comment(
         decoded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoded_payload.get('user_id')
-    response = lead_service.add_comment(lead_id, user_id, user_comment)
+    response = await lead_service.add_comment(lead_id, user_id, user_comment)
     return JSONResponse(content=response)
+
+
+@lead_router.get(
+    "/export-activity",
+    summary="Export lead activity as NDJSON or CSV",
+    response_model_by_alias=False
+)
+async def export_activity(
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        lead_id: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        service: ExportService = Depends(),
+        decoded_payload: DecodedPayload = Depends(JWTBearer())
+) -> StreamingResponse:
+    user_id = decoded_payload.get('user_id')
+    return await service.export_activity(
+        user_id,
+        export_format,
+        lead_id=lead_id,
+        from_date=from_date,
+        to_date=to_date
+    )
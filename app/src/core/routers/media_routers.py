@@ -1,15 +1,30 @@
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-from app.src.common.security.authorization import JWTBearer, DecodedPayload
+from app.src.common.config.database import UnitOfWorkRoute
+from app.src.common.enum.export_format import ExportFormat
+from app.src.common.enum.media_delivery_mode import MediaDeliveryMode
+from app.src.common.enum.search_scope import SearchScope
+from app.src.common.enum.status_stream_mode import StatusStreamMode
+
+from app.src.common.security.authorization import JWTBearer, DecodedPayload, ServiceTokenBearer
 from app.src.core.schemas.responses.upload_response import MediaResponse
 from app.src.core.schemas.requests.upload_request import UploadMediaInputsModel
+from app.src.core.schemas.requests.media_status_request import MediaStatusRequestModel
+from app.src.core.schemas.responses.media_detail_response import MediaDetailResponse
+from app.src.core.schemas.responses.media_status_response import MediaStatusResponse
+from app.src.core.schemas.responses.transcript_search_response import TranscriptSearchPage
+from app.src.core.schemas.requests.multipart_request import PresignPartsRequestModel, CompleteUploadRequestModel
+from app.src.core.schemas.responses.multipart_response import MultipartUploadResponse, PresignedPartsResponse
+from app.src.core.services.export_service import ExportService
 from app.src.core.services.media_service import MediaService
-from app.src.core.schemas.responses import GetUploadsResponseModel
+from app.src.core.services.upload_state_service import UploadStateService
+from app.src.core.schemas.responses import GetUploadsPageModel
 
-media_router = APIRouter(tags=["Media"])
+media_router = APIRouter(tags=["Media"], route_class=UnitOfWorkRoute)
 
 
 @media_router.post(
@@ -25,38 +40,88 @@ async def upload_media(
 ) -> JSONResponse:
     input_dict = inputs.model_dump()
     input_dict['user_id'] = decoaded_payload.get('user_id')
-    response = upload_service.register_media(input_dict)
+    response = await upload_service.register_media(input_dict)
 
     return JSONResponse(content=[model.model_dump() for model in response])
 
 
 @media_router.get(
     "/get-uploads",
-    summary="Get list of media uploaded by a specific user",
-    response_model=List[GetUploadsResponseModel],
+    summary="Get a page of media uploaded by a specific user, newest first",
+    response_model=GetUploadsPageModel,
     response_model_by_alias=False
 )
 async def get_uploads(
+        limit: Optional[int] = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        lead_id: Optional[int] = None,
+        conv_type: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        is_uploaded: Optional[bool] = None,
         service: MediaService = Depends(),
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    response = service.get_uploads(user_id)
-    return JSONResponse(content=[model.model_dump() for model in response])
+    response = await service.get_uploads(
+        user_id,
+        limit=limit,
+        cursor=cursor,
+        lead_id=lead_id,
+        conv_type=conv_type,
+        from_date=from_date,
+        to_date=to_date,
+        is_uploaded=is_uploaded
+    )
+    return JSONResponse(content=response)
+
+
+@media_router.get(
+    "/export-uploads",
+    summary="Export the uploads visible to the user as NDJSON or CSV",
+    response_model_by_alias=False
+)
+async def export_uploads(
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        lead_id: Optional[int] = None,
+        conv_type: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        is_uploaded: Optional[bool] = None,
+        service: ExportService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> StreamingResponse:
+    user_id = decoaded_payload.get('user_id')
+    return await service.export_uploads(
+        user_id,
+        export_format,
+        lead_id=lead_id,
+        conv_type=conv_type,
+        from_date=from_date,
+        to_date=to_date,
+        is_uploaded=is_uploaded
+    )
 
 
 @media_router.get(
     "/get-media",
-    summary="Stream media bytes",
+    summary="Stream media bytes, or hand out a short-lived presigned S3 url (as JSON or a 307 redirect)",
     response_model_by_alias=False
 )
 async def get_media(
         media_code: str,
+        mode: MediaDeliveryMode = MediaDeliveryMode.STREAM,
+        range_header: Optional[str] = Header(None, alias="Range"),
         media_service: MediaService = Depends(),
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
-) -> StreamingResponse:
+) -> Response:
     user_id = decoaded_payload.get('user_id')
-    return media_service.get_media_stream(media_code, user_id)
+    if mode == MediaDeliveryMode.URL:
+        response = await media_service.get_media_url(media_code, user_id)
+        return JSONResponse(content=response.model_dump(mode="json"))
+    if mode == MediaDeliveryMode.REDIRECT:
+        return await media_service.get_media_redirect(media_code, user_id)
+    return await media_service.get_media_stream(media_code, user_id, range_header)
 
 
 @media_router.get(
@@ -66,11 +131,12 @@ async def get_media(
 )
 async def get_feedback(
         media_code: str,
+        if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
         media_service: MediaService = Depends(),
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
-) -> JSONResponse:
+) -> Response:
     user_id = decoaded_payload.get('user_id')
-    return JSONResponse(**media_service.get_feedback(media_code, user_id))
+    return await media_service.get_feedback(media_code, user_id, if_none_match)
 
 
 @media_router.get(
@@ -79,9 +145,192 @@ async def get_feedback(
     response_model_by_alias=False
 )
 async def get_transcript(
+        media_code: str,
+        if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> Response:
+    user_id = decoaded_payload.get('user_id')
+    return await media_service.get_transcription(media_code, user_id, if_none_match)
+
+
+@media_router.get(
+    "/detail",
+    summary="Media, statuses, lead summary, transcript and feedback of one media in one request",
+    response_model=MediaDetailResponse,
+    response_model_by_alias=False
+)
+async def get_media_detail(
         media_code: str,
         media_service: MediaService = Depends(),
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> JSONResponse:
     user_id = decoaded_payload.get('user_id')
-    return JSONResponse(**media_service.get_transcription(media_code, user_id))
+    response = await media_service.get_media_detail(media_code, user_id)
+    return JSONResponse(content=response.model_dump(mode="json"))
+
+
+@media_router.post(
+    "/statuses",
+    summary="Transcription and feedback status of many media in one request",
+    response_model=List[MediaStatusResponse],
+    response_model_by_alias=False
+)
+async def get_statuses(
+        inputs: MediaStatusRequestModel,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    response = await media_service.get_statuses(inputs.media_codes, user_id)
+    return JSONResponse(content=[model.model_dump(mode="json") for model in response])
+
+
+@media_router.get(
+    "/status-stream",
+    summary="Wait on transcription/feedback status of one or many media, as server-sent events or a long-poll",
+    response_model_by_alias=False
+)
+async def status_stream(
+        media_codes: List[str] = Query(..., alias="media_code"),
+        mode: StatusStreamMode = StatusStreamMode.SSE,
+        timeout: Optional[int] = Query(None, ge=1),
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> Response:
+    user_id = decoaded_payload.get('user_id')
+    return await media_service.watch_statuses(media_codes, user_id, mode, timeout)
+
+
+@media_router.get(
+    "/transcript-window",
+    summary="Segments of a transcript by time range (seconds) or segment index range",
+    response_model_by_alias=False
+)
+async def get_transcript_window(
+        media_code: str,
+        from_index: Optional[int] = Query(None, ge=0),
+        to_index: Optional[int] = Query(None, ge=0),
+        from_time: Optional[float] = Query(None, ge=0),
+        to_time: Optional[float] = Query(None, ge=0),
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> Response:
+    user_id = decoaded_payload.get('user_id')
+    return await media_service.get_transcript_window(
+        media_code,
+        user_id,
+        from_index=from_index,
+        to_index=to_index,
+        from_time=from_time,
+        to_time=to_time
+    )
+
+
+@media_router.get(
+    "/search-transcripts",
+    summary="Full-text search over the transcripts of the user's own or their team's media",
+    response_model=TranscriptSearchPage,
+    response_model_by_alias=False
+)
+async def search_transcripts(
+        q: str = Query(..., min_length=1),
+        scope: SearchScope = SearchScope.TEAM,
+        offset: int = Query(0, ge=0),
+        limit: Optional[int] = Query(None, ge=1),
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    response = await media_service.search_transcripts(q, user_id, scope, offset=offset, limit=limit)
+    return JSONResponse(content=response.model_dump(mode="json"))
+
+
+@media_router.post(
+    "/multipart/initiate",
+    summary="Start, or resume, a multipart upload of a registered media",
+    response_model=MultipartUploadResponse,
+    response_model_by_alias=False
+)
+async def initiate_multipart_upload(
+        media_code: str,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    response = await media_service.initiate_multipart_upload(media_code, user_id)
+    return JSONResponse(content=response.model_dump())
+
+
+@media_router.post(
+    "/multipart/presign",
+    summary="Presign upload urls for a batch of parts",
+    response_model=PresignedPartsResponse,
+    response_model_by_alias=False
+)
+async def presign_upload_parts(
+        inputs: PresignPartsRequestModel,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    response = await media_service.presign_upload_parts(inputs.media_code, user_id, inputs.part_numbers)
+    return JSONResponse(content=response.model_dump())
+
+
+@media_router.get(
+    "/multipart/parts",
+    summary="Parts already uploaded for an in-progress multipart upload",
+    response_model=MultipartUploadResponse,
+    response_model_by_alias=False
+)
+async def get_upload_parts(
+        media_code: str,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    response = await media_service.get_upload_parts(media_code, user_id)
+    return JSONResponse(content=response.model_dump())
+
+
+@media_router.post(
+    "/multipart/complete",
+    summary="Complete a multipart upload and mark the media as uploaded",
+    response_model_by_alias=False
+)
+async def complete_multipart_upload(
+        inputs: CompleteUploadRequestModel,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    parts = [part.model_dump() for part in inputs.parts] if inputs.parts else None
+    return JSONResponse(content=await media_service.complete_multipart_upload(inputs.media_code, user_id, parts))
+
+
+@media_router.delete(
+    "/multipart/abort",
+    summary="Abort a multipart upload and discard its parts",
+    response_model_by_alias=False
+)
+async def abort_multipart_upload(
+        media_code: str,
+        media_service: MediaService = Depends(),
+        decoaded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoaded_payload.get('user_id')
+    return JSONResponse(content=await media_service.abort_multipart_upload(media_code, user_id))
+
+
+@media_router.post(
+    "/events/s3",
+    summary="Ingest S3 ObjectCreated notifications and mark the media as uploaded",
+    dependencies=[Depends(ServiceTokenBearer())],
+    response_model_by_alias=False
+)
+async def ingest_s3_events(
+        payload: Dict[str, Any],
+        service: UploadStateService = Depends()
+) -> JSONResponse:
+    return JSONResponse(content=await service.ingest_s3_events(payload))
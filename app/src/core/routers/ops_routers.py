@@ -0,0 +1,48 @@
+from typing import Dict, Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.src.common.config.database import UnitOfWorkRoute
+from app.src.common.concurrency.blocking_executor import get_blocking_executor
+from app.src.common.config.database import get_database, mongo_pool_metrics
+from app.src.common.enum.custom_error_code import CustomErrorCode
+from app.src.common.exceptions.application_exception import BaseAppException
+from app.src.common.security.authorization import DecodedPayload, JWTBearer, jwt_decoder
+from app.src.common.security.principal import get_principal_cache
+from app.src.core.repositories.aws_repositories import get_media_url_cache
+from app.src.core.repositories.user_repository import UserRepository
+from app.src.core.services.media_service import get_document_cache
+from app.src.core.services.status_watcher import get_status_watcher
+
+ops_router = APIRouter(tags=["Ops"], route_class=UnitOfWorkRoute)
+
+
+@ops_router.get(
+    "/metrics",
+    summary="Runtime metrics of the worker process, for admins only"
+)
+async def metrics(
+        user_repository: UserRepository = Depends(),
+        decoded_payload: DecodedPayload = Depends(JWTBearer())
+) -> JSONResponse:
+    user_id = decoded_payload.get('user_id')
+    if not await user_repository.is_admin(user_id):
+        raise BaseAppException(
+            status_code=403,
+            description="Only admins can read the worker metrics",
+            custom_error_code=CustomErrorCode.AUTHORIZATION_ERROR,
+            data={'user_id': user_id}
+        )
+
+    response: Dict[str, Any] = {
+        "database": get_database().get_pool_stats(),
+        "mongodb": mongo_pool_metrics.get_stats(),
+        "blocking_executor": get_blocking_executor().get_stats(),
+        "jwt": jwt_decoder.get_stats(),
+        "principals": get_principal_cache().get_stats(),
+        "media_urls": get_media_url_cache().get_stats(),
+        "documents": get_document_cache().get_stats(),
+        "status_watcher": get_status_watcher().get_stats()
+    }
+    return JSONResponse(content=response)
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 
+from app.src.common.config.database import UnitOfWorkRoute
 from app.src.common.security.authorization import DecodedPayload, JWTBearer
 from app.src.core.services.user_services import UserService
 from app.src.core.schemas.responses.user_workspace_response import UserWorkspaceResponse
 
-user_router = APIRouter(tags=["Users"])
+user_router = APIRouter(tags=["Users"], route_class=UnitOfWorkRoute)
 
 
 @user_router.get(
@@ -19,5 +20,5 @@ async def user_workspace(
         decoaded_payload: DecodedPayload = Depends(JWTBearer())
 ) -> UserWorkspaceResponse:
     user_id = decoaded_payload.get('user_id')
-    response = service.get_user_workspace(user_id)
+    response = await service.get_user_workspace(user_id)
     return response
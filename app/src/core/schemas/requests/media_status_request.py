@@ -0,0 +1,7 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class MediaStatusRequestModel(BaseModel):
+    media_codes: List[str] = Field(min_length=1)
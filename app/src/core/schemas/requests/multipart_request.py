@@ -0,0 +1,19 @@
+from typing import Annotated, Optional, List
+
+from pydantic import BaseModel, Field
+
+
+class UploadPartModel(BaseModel):
+    part_number: int = Field(ge=1, le=10000)
+    etag: str
+    size: Optional[int] = None
+
+
+class PresignPartsRequestModel(BaseModel):
+    media_code: str
+    part_numbers: List[Annotated[int, Field(ge=1, le=10000)]] = Field(min_length=1)
+
+
+class CompleteUploadRequestModel(BaseModel):
+    media_code: str
+    parts: Optional[List[UploadPartModel]] = None
@@ -1 +1 @@
-from app.src.core.schemas.responses.get_uploads_response import GetUploadsResponseModel
\ No newline at end of file
+from app.src.core.schemas.responses.get_uploads_response import GetUploadsResponseModel, GetUploadsPageModel
\ No newline at end of file
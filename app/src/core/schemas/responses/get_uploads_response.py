@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -13,4 +14,12 @@ class GetUploadsResponseModel(BaseModel):
     lead_id: int
     lead_name: str
     conv_type: str
+    event_date: Optional[datetime] = None
+    is_uploaded: Optional[bool] = None
+
+
+class GetUploadsPageModel(BaseModel):
+    items: List[GetUploadsResponseModel]
+    next_cursor: Optional[str] = None
+    limit: int
 
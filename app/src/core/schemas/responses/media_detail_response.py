@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class MediaLeadSummary(BaseModel):
+    lead_id: int
+    lead_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    stage_code: Optional[str] = None
+    assigned_clerk_id: Optional[str] = None
+
+
+class MediaDetailResponse(BaseModel):
+    media_code: str
+    original_name: Optional[str] = None
+    file_type: Optional[str] = None
+    media_len: Optional[int] = None
+    media_size: Optional[int] = None
+    event_date: Optional[datetime] = None
+    conv_type: Optional[str] = None
+    lang_code: Optional[str] = None
+    product: Optional[str] = None
+    is_uploaded: bool
+    trans_status_cd: Optional[str] = None
+    fedbk_status_cd: Optional[str] = None
+    lead: Optional[MediaLeadSummary] = None
+    transcription: Optional[Any] = None
+    feedback: Optional[Any] = None
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MediaStatusResponse(BaseModel):
+    media_code: str
+    trans_status_cd: Optional[str] = None
+    trans_start_dt: Optional[datetime] = None
+    trans_end_dt: Optional[datetime] = None
+    fedbk_status_cd: Optional[str] = None
+    fedbk_start_dt: Optional[datetime] = None
+    fedbk_end_dt: Optional[datetime] = None
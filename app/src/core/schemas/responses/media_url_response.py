@@ -0,0 +1,9 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class MediaUrlResponse(BaseModel):
+    media_code: str
+    url: str
+    expires_at: datetime
@@ -0,0 +1,19 @@
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from app.src.core.schemas.requests.multipart_request import UploadPartModel
+
+
+class MultipartUploadResponse(BaseModel):
+    media_code: str
+    upload_id: str
+    part_size: int
+    parts: List[UploadPartModel]
+
+
+class PresignedPartsResponse(BaseModel):
+    media_code: str
+    upload_id: str
+    expires_in: int
+    urls: Dict[int, str]
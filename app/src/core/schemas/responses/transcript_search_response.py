@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TranscriptHit(BaseModel):
+    index: int
+    start: Optional[float] = None
+    end: Optional[float] = None
+    text: str
+
+
+class TranscriptSearchResult(BaseModel):
+    media_code: str
+    score: float
+    hit_count: int
+    hits: List[TranscriptHit]
+
+
+class TranscriptSearchPage(BaseModel):
+    query: str
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int] = None
+    # True when the rarest query term matched more transcripts than SEARCH_MAX_CANDIDATES,
+    # so only the first SEARCH_MAX_CANDIDATES of them (by media code) were ranked
+    truncated: bool = False
+    items: List[TranscriptSearchResult]
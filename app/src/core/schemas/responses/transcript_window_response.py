@@ -0,0 +1,12 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class TranscriptWindowResponse(BaseModel):
+    media_code: str
+    total_segments: int
+    start_index: int
+    end_index: int
+    next_index: Optional[int] = None
+    segments: List[Dict[str, Any]]
@@ -0,0 +1,93 @@
+import csv
+import datetime
+import io
+import json
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select
+
+from app.src.common.config.app_settings import get_app_settings, Settings
+from app.src.common.config.database import stream_partitions
+from app.src.common.enum.export_format import ExportFormat
+from app.src.core.repositories.lead_repository import LeadRepository
+from app.src.core.repositories.media_repository import MediaRepository
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def _format_partition(rows: Sequence[Row], columns: Sequence[str], export_format: ExportFormat) -> str:
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([[_to_text(value) for value in row] for row in rows])
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps({column: _to_text(value) for column, value in zip(columns, row)}) + "\n"
+        for row in rows
+    )
+
+
+class ExportService:
+    """
+    Streams report exports straight from a server-side cursor to the client; only one
+    partition of EXPORT_BATCH_SIZE rows is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        media_repository: MediaRepository = Depends(),
+        lead_repository: LeadRepository = Depends(),
+        settings: Settings = Depends(get_app_settings),
+    ):
+        self.media_repository = media_repository
+        self.lead_repository = lead_repository
+        self.settings = settings
+
+    async def export_uploads(
+        self, user_id: str, export_format: ExportFormat, **filters: Any
+    ) -> StreamingResponse:
+        principal = await self.media_repository.require_principal(user_id)
+        query = self.media_repository.uploads_query(principal, **filters)
+        # media_id is only the keyset tiebreaker of get-uploads, which does not expose it either
+        query = query.with_only_columns(
+            *[column for column in query.selected_columns if column.name != "media_id"],
+            maintain_column_froms=True,
+        )
+        return self._stream(query, export_format, "uploads")
+
+    async def export_activity(
+        self, user_id: str, export_format: ExportFormat, lead_id: Optional[int] = None, **filters: Any
+    ) -> StreamingResponse:
+        principal = await self.lead_repository.require_principal(user_id)
+        if lead_id is not None:
+            await self.lead_repository.assume_lead_exists(lead_id)
+        query = self.lead_repository.activity_query(principal, lead_id=lead_id, **filters)
+        return self._stream(query, export_format, "activity")
+
+    def _stream(self, query: Select, export_format: ExportFormat, name: str) -> StreamingResponse:
+        columns = [column.name for column in query.selected_columns]
+        yield_per = int(self.settings.EXPORT_BATCH_SIZE)
+
+        async def rows() -> AsyncIterator[str]:
+            if export_format == ExportFormat.CSV:
+                yield _format_partition([columns], columns, export_format)
+            async for partition in stream_partitions(query, yield_per):
+                yield _format_partition(partition, columns, export_format)
+
+        file_name = f"{name}-{datetime.date.today().isoformat()}.{export_format.value}"
+        return StreamingResponse(
+            rows(),
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+        )
@@ -5,6 +5,9 @@ from fastapi import Depends
 from pydantic import BaseModel
 
 from app.src.common.config.app_settings import get_app_settings, Settings
+from app.src.common.enum.access_outcome import AccessOutcome
+from app.src.common.exceptions.exceptions import NoUserFoundException, NoLeadFoundException
+from app.src.core.repositories.access_repository import AccessRepository
 from app.src.core.repositories.user_repository import UserRepository
 from app.src.core.repositories.lead_repository import LeadRepository
 from app.src.core.schemas.responses.create_lead_response import CreateLeadResponseModel
@@ -17,78 +20,81 @@ class LeadService(BaseService):
     def __init__(
             self,
             repository: LeadRepository = Depends(),
+            user_repository: UserRepository = Depends(),
+            access_repository: AccessRepository = Depends(),
             settings: Settings = Depends(get_app_settings)
     ):
         super().__init__("LeadService")
-        self.user_repository = UserRepository()
+        self.user_repository = user_repository
+        self.access_repository = access_repository
         self.repository = repository
         self.settings = settings
 
-    def create_lead(self, model: BaseModel, user_id: str) -> Optional[Dict[str, Any]]:
-        self.repository.assume_user_exists(user_id)
+    async def create_lead(self, model: BaseModel, user_id: str) -> Optional[Dict[str, Any]]:
+        await self.repository.assume_user_exists(user_id)
 
         dump = model.model_dump()
         dump['user_id'] = user_id
-        lead = self.repository.add_lead(dump)
+        lead = await self.repository.add_lead(dump)
         return CreateLeadResponseModel.model_validate(
             {
                 'lead_id': lead.get("lead_id")
             }
         ).model_dump()
 
-    def create_lead_type(self, model: BaseModel, user_id: str) -> Optional[Dict[str, Any]]:
+    async def create_lead_type(self, model: BaseModel, user_id: str) -> Optional[Dict[str, Any]]:
         dump = model.model_dump()
         dump['user_id'] = user_id
-        lead_type = self.repository.add_lead_type(dump)
+        lead_type = await self.repository.add_lead_type(dump)
         return CreateLeadTypeResponseModel.model_validate(
             {
                 'id': lead_type.id
             }
         ).model_dump()
 
-    def get_lead_info(self, lead_id: int, user_id: str) -> LeadInfoResponse:
-        self.repository.assume_lead_exists(lead_id)
-        self.repository.assume_user_exists(user_id)
-        self.repository.assume_lead_assigned_to(lead_id, user_id)
+    async def get_lead_info(self, lead_id: int, user_id: str) -> LeadInfoResponse:
+        await self.access_repository.assume_lead_access(user_id, lead_id)
 
-        data = self.repository.get_lead_info(lead_id)
-        data['conversations'] = self.repository.get_lead_conversations(lead_id)
+        data = await self.repository.get_lead_info(lead_id)
+        data['conversations'] = await self.repository.get_lead_conversations(lead_id)
 
         # data['conversations'] = [LeadConversation(**conversation) for conversation in data['conversations']]
         response = LeadInfoResponse(**data)
         return response
 
-    def update_stage(self, lead_id: int, user_id: str, stage_id: int) -> Optional[str]:
-        self.repository.assume_lead_exists(lead_id)
-        self.repository.assume_user_exists(user_id)
-        self.repository.assume_lead_assigned_to(lead_id, user_id)
+    async def update_stage(self, lead_id: int, user_id: str, stage_id: int) -> Optional[str]:
+        await self.access_repository.assume_lead_access(user_id, lead_id)
 
-        activity = self.repository.update_stage(lead_id, stage_id, user_id)
-        self.repository.record_activity(activity)
+        activity = await self.repository.update_stage(lead_id, stage_id, user_id)
+        await self.repository.record_activity(activity)
         return "SUCCESS"
 
-    def assign_to(self, lead_ids: List[int], user_id: str, target_user: str) -> List[Dict[str, Any]]:
+    async def assign_to(self, lead_ids: List[int], user_id: str, target_user: str) -> List[Dict[str, Any]]:
         response = []
         has_target_user: bool = False
-        self.repository.assume_user_exists(user_id)
-        is_admin = self.repository.is_admin_user(user_id)
+        outcomes = await self.access_repository.check_leads(user_id, lead_ids)
+        for lead_id, outcome in outcomes.items():
+            if outcome == AccessOutcome.NO_SUCH_USER:
+                raise NoUserFoundException(data={'user_id': user_id})
+            if outcome == AccessOutcome.NO_SUCH_RESOURCE:
+                raise NoLeadFoundException(data={'lead_id': lead_id})
+        is_admin = await self.repository.is_admin_user(user_id)
 
         if target_user is not None or target_user != '':
             has_target_user = not has_target_user
-            self.repository.assume_user_exists(target_user)
+            await self.repository.assume_user_exists(target_user)
 
         for lead_id in lead_ids:
             status = 'SUCCESS'
-            self.repository.assume_lead_exists(lead_id)
 
             to_user = user_id
             if is_admin and has_target_user:
-                activity = self.repository.assign_lead(lead_id, target_user)
+                activity = await self.repository.assign_lead(lead_id, target_user)
                 to_user = target_user
-                self.repository.record_activity(activity)
+                await self.repository.record_activity(activity)
             elif not is_admin:
-                activity = self.repository.assign_lead(lead_id, user_id)
-                self.repository.record_activity(activity)
+                activity = await self.repository.assign_lead(lead_id, user_id)
+                await self.repository.record_activity(activity)
             else:
                 to_user = None
                 status = 'FAILED'
@@ -103,18 +109,16 @@ class LeadService(BaseService):
 
         return response
 
-    def add_comment(self, lead_id: int, user_id: str, user_comment: str) -> str:
-        self.repository.assume_lead_exists(lead_id)
-        self.repository.assume_user_exists(user_id)
-        self.repository.assume_lead_assigned_to(lead_id, user_id)
+    async def add_comment(self, lead_id: int, user_id: str, user_comment: str) -> str:
+        await self.access_repository.assume_lead_access(user_id, lead_id)
 
         activity = {
-            'done_by': self.user_repository.get_user_id(user_id),
+            'done_by': await self.user_repository.get_user_id(user_id),
             'lead_id': lead_id,
             'activity_code': 'COMMENT',
             'activity_desc': user_comment,
             'event_date': datetime.now()
         }
 
-        self.repository.record_activity(activity)
+        await self.repository.record_activity(activity)
         return 'SUCCESS'
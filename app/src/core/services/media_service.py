@@ -1,131 +1,771 @@
+import base64
 import datetime
-import io
-from typing import Optional, List, Dict, Any
+import json
+import asyncio
+import math
+import re
+import time
+from functools import lru_cache
+from hashlib import sha256
+from typing import Optional, List, Dict, Any, AsyncIterator, NamedTuple, Tuple
 from uuid import uuid4
 
-import boto3 as aws
 from fastapi import Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 
+from app.src.common.cache.byte_lru_cache import ByteLRUCache
 from app.src.common.config.app_settings import get_app_settings, Settings
+from app.src.common.config.database import session_scope
+from app.src.common.constants.global_constants import COMPLETED_STATUS_CODES, TERMINAL_STATUS_CODES
+from app.src.common.enum.custom_error_code import CustomErrorCode
+from app.src.common.enum.search_scope import SearchScope
+from app.src.common.enum.status_stream_mode import StatusStreamMode
+from app.src.common.exceptions.exceptions import InvalidMediaException
+from app.src.common.media.segment_index import window_for_time_range
+from app.src.common.exceptions.application_exception import BaseAppException
+from app.src.common.security.principal import get_principal_cache
 from app.src.core.repositories.aws_repositories import S3Repository
 from app.src.core.repositories.media_repository import MediaRepository
-from app.src.core.schemas.responses.get_uploads_response import GetUploadsResponseModel
+from app.src.core.schemas.responses.get_uploads_response import GetUploadsPageModel
+from app.src.core.schemas.responses.media_detail_response import MediaDetailResponse, MediaLeadSummary
+from app.src.core.schemas.responses.media_status_response import MediaStatusResponse
+from app.src.core.schemas.responses.media_url_response import MediaUrlResponse
+from app.src.core.schemas.responses.transcript_search_response import TranscriptSearchPage
+from app.src.core.schemas.responses.transcript_window_response import TranscriptWindowResponse
+from app.src.core.schemas.responses.multipart_response import MultipartUploadResponse, PresignedPartsResponse
 from app.src.core.schemas.responses.upload_response import MediaResponse
+from app.src.core.services.status_watcher import MediaState, get_status_watcher
+
+
+SINGLE_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _single_byte_range(range_header: Optional[str]) -> Optional[str]:
+    # Only a single "bytes=" range is forwarded to S3; anything else is ignored and the
+    # whole object is served, which RFC 9110 allows.
+    if not range_header:
+        return None
+    match = SINGLE_BYTE_RANGE.match(range_header.strip().replace(" ", ""))
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    return match.group(0)
+
+
+class CachedDocument(NamedTuple):
+    body: bytes
+    etag: str
+    owner_id: int
+    revision: str
+
+
+@lru_cache
+def get_document_cache() -> ByteLRUCache[CachedDocument]:
+    """
+    Process-wide (kind, media_code) -> serialized transcript/feedback cache. Only completed
+    documents are stored; an entry is served only while its revision is still the one in Mongo,
+    so a regenerated document replaces it on the next read.
+    """
+    return ByteLRUCache(max_bytes=int(get_app_settings().DOCUMENT_CACHE_BYTES))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def _status_event(media_code: str, state: MediaState) -> Dict[str, Any]:
+    trans_status_cd, fedbk_status_cd = state
+    return {
+        "media_code": media_code,
+        "trans_status_cd": trans_status_cd,
+        "fedbk_status_cd": fedbk_status_cd,
+        "is_final": trans_status_cd in TERMINAL_STATUS_CODES and fedbk_status_cd in TERMINAL_STATUS_CODES,
+    }
+
+
+def encode_cursor(event_date: datetime.datetime, media_id: int) -> str:
+    raw = f"{event_date.isoformat()}|{media_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        event_date, media_id = raw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(event_date), int(media_id)
+    except ValueError:
+        raise BaseAppException(
+            status_code=400,
+            description="Invalid pagination cursor",
+            custom_error_code=CustomErrorCode.INVALID_CURSOR,
+            data={"cursor": cursor},
+        )
 
 
 class MediaService:
     def __init__(
         self,
         media_repository: MediaRepository = Depends(),
+        s3_repository: S3Repository = Depends(),
         settings: Settings = Depends(get_app_settings),
     ):
         self.media_repository = media_repository
         self.settings = settings
-        self.s3_repository = S3Repository()
+        self.s3_repository = s3_repository
 
-    def register_media(
+    async def register_media(
         self, media_input: Dict[str, Any]
     ) -> Optional[List[MediaResponse]]:
-        response = []
-
         request_dump = media_input
-        files = request_dump.get("files")
-        del request_dump["files"]
+        files = request_dump.pop("files") or []
+        clerk_id = request_dump.pop("user_id")
 
-        self.media_repository.assume_lead_exists(request_dump.get("lead_id"))
-        self.media_repository.assume_user_exists(request_dump.get("user_id"))
+        await self.media_repository.assume_lead_exists(request_dump.get("lead_id"))
+        await self.media_repository.assume_user_exists(clerk_id)
 
+        event_date = datetime.datetime.now()
+        media_models = []
         for file in files:
-            file_response = {}
             media_code = str(uuid4())
             file_type = file.split(".")[-1]
-            request_dump["original_name"] = file
-            request_dump["file_type"] = file_type
-            request_dump["media_code"] = media_code
-            request_dump["stored_file"] = media_code + "." + file_type
-            request_dump["bucket"] = self.settings.MEDIA_BUCKET
-            request_dump["event_date"] = str(datetime.datetime.now())
-
-            activity = self.media_repository.register_media(request_dump)
-
-            file_response["file"] = file
-            file_response["media_code"] = media_code
-            try:
-                s3 = aws.client("s3", region_name=self.settings.REGION)
-                s3_url_response = s3.generate_presigned_post(
-                    self.settings.MEDIA_BUCKET,
-                    request_dump.get("stored_file"),
-                    ExpiresIn=120,
-                    Conditions=[
-                        [
-                            "content-length-range",
-                            self.settings.MEDIA_MIN_SIZE,
-                            self.settings.MEDIA_MAX_SIZE,
-                        ]
-                    ],
-                )
-                file_response["presigned_url"] = s3_url_response
-                file_response["message"] = "URL Generated"
+            media_models.append(
+                {
+                    **request_dump,
+                    "original_name": file,
+                    "file_type": file_type,
+                    "media_code": media_code,
+                    "stored_file": media_code + "." + file_type,
+                    "bucket": self.settings.MEDIA_BUCKET,
+                    "event_date": event_date,
+                }
+            )
 
-            except Exception as e:
-                file_response["audio_code"] = None
-                file_response["presigned_url"] = {}
-                file_response["message"] = str(e)
+        await self.media_repository.register_media(clerk_id, media_models)
+        presigned_posts = await self.s3_repository.generate_presigned_posts(
+            [media_model["stored_file"] for media_model in media_models]
+        )
 
+        response = []
+        for media_model, presigned_post in zip(media_models, presigned_posts):
+            file_response = {
+                "file": media_model["original_name"],
+                "media_code": media_model["media_code"],
+            }
+            if isinstance(presigned_post, Exception):
+                file_response["presigned_url"] = {}
+                file_response["message"] = str(presigned_post)
+            else:
+                file_response["presigned_url"] = presigned_post
+                file_response["message"] = "URL Generated"
             response.append(MediaResponse.model_validate(file_response))
-            self.media_repository.record_activity(activity)
 
         return response
 
-    def get_uploads(self, user_id: str) -> List[GetUploadsResponseModel]:
-        self.media_repository.assume_user_exists(user_id)
+    async def get_uploads(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        lead_id: Optional[int] = None,
+        conv_type: Optional[str] = None,
+        from_date: Optional[datetime.datetime] = None,
+        to_date: Optional[datetime.datetime] = None,
+        is_uploaded: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        limit = min(limit or int(self.settings.PAGE_SIZE_DEFAULT), int(self.settings.PAGE_SIZE_MAX))
+        after = decode_cursor(cursor) if cursor else None
 
-        records = self.media_repository.get_uploads(user_id)
-        response = [
-            GetUploadsResponseModel.model_validate(record._asdict())
-            for record in records
-        ]
-        return response
+        records = await self.media_repository.get_uploads(
+            user_id,
+            limit + 1,
+            after=after,
+            lead_id=lead_id,
+            conv_type=conv_type,
+            from_date=from_date,
+            to_date=to_date,
+            is_uploaded=is_uploaded,
+        )
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor(records[-1].event_date, records[-1].media_id)
+
+        items = []
+        for record in records:
+            item = record._asdict()
+            del item["media_id"]
+            if item["event_date"] is not None:
+                item["event_date"] = item["event_date"].isoformat()
+            items.append(item)
+
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
 
-    def get_media_stream(self, media_code: str, user_id: str) -> StreamingResponse:
-        self.media_repository.assume_media_assigned_to(media_code, user_id)
+    async def get_media_stream(
+        self, media_code: str, user_id: str, range_header: Optional[str] = None
+    ) -> StreamingResponse:
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
 
-        key, media_content, content_type = self.s3_repository.get_media_stream(
-            media_code
+        s3_object = await self.s3_repository.get_media_stream(
+            media_code, _single_byte_range(range_header)
         )
-        if media_content is not None:
-            return StreamingResponse(io.BytesIO(media_content), media_type=content_type)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(s3_object["ContentLength"]),
+            # Marks the body as already encoded so GZipMiddleware streams it through untouched.
+            "Content-Encoding": "identity",
+        }
+        if s3_object.get("ETag"):
+            headers["ETag"] = s3_object["ETag"]
+        if s3_object.get("LastModified"):
+            headers["Last-Modified"] = s3_object["LastModified"].strftime("%a, %d %b %Y %H:%M:%S GMT")
 
-    def get_feedback(self, media_code: str, user_id: str) -> Dict[str, Any]:
-        self.media_repository.assume_media_assigned_to(media_code, user_id)
+        status_code = 200
+        if s3_object.get("ContentRange"):
+            status_code = 206
+            headers["Content-Range"] = s3_object["ContentRange"]
 
-        if self.media_repository.is_feedback_generated(media_code):
-            return {
-                "status_code": 200,
-                "content": self.media_repository.get_feedback(media_code),
-            }
+        return StreamingResponse(
+            s3_object["Stream"],
+            status_code=status_code,
+            media_type=s3_object.get("ContentType"),
+            headers=headers,
+        )
+
+    async def get_media_url(self, media_code: str, user_id: str) -> MediaUrlResponse:
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
+
+        url, expires_at = await self.s3_repository.get_presigned_media_url(media_code, user_id)
+        return MediaUrlResponse(
+            media_code=media_code,
+            url=url,
+            expires_at=datetime.datetime.fromtimestamp(expires_at, tz=datetime.timezone.utc),
+        )
+
+    async def get_media_redirect(self, media_code: str, user_id: str) -> RedirectResponse:
+        media_url = await self.get_media_url(media_code, user_id)
+        max_age = int(media_url.expires_at.timestamp() - time.time()) - int(
+            self.settings.MEDIA_URL_REFRESH_MARGIN
+        )
+        return RedirectResponse(
+            media_url.url,
+            status_code=307,
+            headers={"Cache-Control": f"private, max-age={max(max_age, 0)}"},
+        )
+
+    async def _get_upload_target(self, media_code: str, user_id: str, in_progress: bool = True):
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
+
+        target = await self.media_repository.get_upload_target(media_code)
+        if target.is_uploaded:
+            raise BaseAppException(
+                status_code=409,
+                description=f"Media {media_code} is already uploaded",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code},
+            )
+        if in_progress and not target.upload_id:
+            raise BaseAppException(
+                status_code=400,
+                description=f"No multipart upload in progress for media {media_code}",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code},
+            )
+        return target
+
+    def _assume_uploaded(self, media_code: str, is_uploaded: bool) -> None:
+        if not is_uploaded and self.settings.REQUIRE_UPLOADED_MEDIA:
+            raise BaseAppException(
+                status_code=409,
+                description=f"Media {media_code} is not uploaded yet",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code},
+            )
+
+    async def _sync_upload_parts(self, target) -> List[Dict[str, Any]]:
+        # S3 is the source of truth for uploaded parts; the table mirrors it for resuming clients.
+        parts = await self.s3_repository.list_upload_parts(target.stored_file, target.upload_id)
+        await self.media_repository.record_upload_parts(target.media_id, parts)
+        return parts
+
+    async def initiate_multipart_upload(self, media_code: str, user_id: str) -> MultipartUploadResponse:
+        """
+        Starts a multipart upload for a registered media, or resumes the one in progress
+        together with the parts S3 already holds.
+        """
+        target = await self._get_upload_target(media_code, user_id, in_progress=False)
+
+        if target.upload_id:
+            upload_id = target.upload_id
+            parts = await self._sync_upload_parts(target)
         else:
-            return {
-                "status_code": 202,
-                "content": {
-                    "media_code": media_code,
-                    "status": "Feedback generation is still under progress",
-                },
-            }
+            upload_id = await self.s3_repository.create_multipart_upload(target.stored_file)
+            await self.media_repository.set_upload_id(target.media_id, upload_id)
+            parts = []
 
-    def get_transcription(self, media_code: str, user_id: str) -> Dict[str, Any]:
-        self.media_repository.assume_media_assigned_to(media_code, user_id)
-        if self.media_repository.is_transcript_generated(media_code):
-            return {
-                "status_code": 200,
-                "content": self.media_repository.get_transcription(media_code),
-            }
+        return MultipartUploadResponse(
+            media_code=media_code,
+            upload_id=upload_id,
+            part_size=int(self.settings.MEDIA_PART_SIZE),
+            parts=parts,
+        )
+
+    async def presign_upload_parts(
+        self, media_code: str, user_id: str, part_numbers: List[int]
+    ) -> PresignedPartsResponse:
+        max_parts = int(self.settings.MEDIA_MAX_PARTS_PER_REQUEST)
+        if len(part_numbers) > max_parts:
+            raise BaseAppException(
+                status_code=400,
+                description=f"At most {max_parts} parts can be presigned per request",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code, "part_count": len(part_numbers)},
+            )
+
+        # Parts past the one that reaches MEDIA_MAX_SIZE can only make the upload too large
+        last_part = math.ceil(int(self.settings.MEDIA_MAX_SIZE) / int(self.settings.MEDIA_PART_SIZE))
+        if max(part_numbers) > last_part:
+            raise BaseAppException(
+                status_code=400,
+                description=f"Part numbers above {last_part} exceed the maximum media size",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code, "max_part_number": last_part},
+            )
+
+        target = await self._get_upload_target(media_code, user_id)
+        expires_in = int(self.settings.MEDIA_PART_URL_EXPIRY)
+        urls = await self.s3_repository.presign_upload_parts(
+            target.stored_file, target.upload_id, sorted(set(part_numbers)), expires_in
+        )
+        return PresignedPartsResponse(
+            media_code=media_code,
+            upload_id=target.upload_id,
+            expires_in=expires_in,
+            urls=urls,
+        )
+
+    async def get_upload_parts(self, media_code: str, user_id: str) -> MultipartUploadResponse:
+        target = await self._get_upload_target(media_code, user_id)
+        parts = await self._sync_upload_parts(target)
+        return MultipartUploadResponse(
+            media_code=media_code,
+            upload_id=target.upload_id,
+            part_size=int(self.settings.MEDIA_PART_SIZE),
+            parts=parts,
+        )
+
+    async def complete_multipart_upload(
+        self, media_code: str, user_id: str, parts: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        target = await self._get_upload_target(media_code, user_id)
+        uploaded = await self.s3_repository.list_upload_parts(target.stored_file, target.upload_id)
+        if not parts:
+            parts = uploaded
+        if not parts:
+            raise BaseAppException(
+                status_code=400,
+                description=f"No parts uploaded for media {media_code}",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code, "upload_id": target.upload_id},
+            )
+
+        # Sizes come from S3, not the client, since presigned parts bypass the upload size policy
+        sizes = {part["part_number"]: part["size"] for part in uploaded}
+        media_size = sum(sizes.get(part["part_number"], 0) for part in parts)
+        min_size, max_size = int(self.settings.MEDIA_MIN_SIZE), int(self.settings.MEDIA_MAX_SIZE)
+        if not min_size <= media_size <= max_size:
+            await self._discard_upload(target)
+            raise BaseAppException(
+                status_code=400,
+                description=f"Media size {media_size} is outside the allowed {min_size} to {max_size} bytes",
+                custom_error_code=CustomErrorCode.INVALID_UPLOAD,
+                data={"media_code": media_code, "media_size": media_size},
+            )
+
+        await self.s3_repository.complete_multipart_upload(
+            target.stored_file, target.upload_id, parts
+        )
+        await self.media_repository.mark_uploaded(target.media_id, media_size)
+
+        return {"media_code": media_code, "is_uploaded": True, "parts": len(parts)}
+
+    async def _discard_upload(self, target) -> None:
+        # Own unit of work: the request's is rolled back by the error that follows, and the
+        # aborted upload id must not be offered for resuming.
+        await self.s3_repository.abort_multipart_upload(target.stored_file, target.upload_id)
+        async with session_scope() as session:
+            await MediaRepository(session).set_upload_id(target.media_id, None)
+
+    async def abort_multipart_upload(self, media_code: str, user_id: str) -> Dict[str, Any]:
+        target = await self._get_upload_target(media_code, user_id)
+        await self.s3_repository.abort_multipart_upload(target.stored_file, target.upload_id)
+        await self.media_repository.set_upload_id(target.media_id, None)
+
+        return {"media_code": media_code, "upload_id": target.upload_id, "aborted": True}
+
+    async def get_feedback(
+        self, media_code: str, user_id: str, if_none_match: Optional[str] = None
+    ) -> Response:
+        return await self._get_document(
+            "feedback", media_code, user_id, if_none_match
+        )
+
+    async def get_transcription(
+        self, media_code: str, user_id: str, if_none_match: Optional[str] = None
+    ) -> Response:
+        return await self._get_document(
+            "transcription", media_code, user_id, if_none_match
+        )
+
+    async def _get_document(
+        self, kind: str, media_code: str, user_id: str, if_none_match: Optional[str]
+    ) -> Response:
+        """
+        Serves a completed transcript/feedback from the document cache when possible. A hit is
+        authorized against the cached principal and owner and validated by reading only the
+        revision of the stored document, so a conditional GET answered with 304 touches no
+        MySQL row and no document content.
+        """
+        cached = get_document_cache().get((kind, media_code))
+        if cached is not None:
+            await self._assume_document_access(media_code, user_id, cached.owner_id)
+            document = await self._load_document(kind, media_code, cached.owner_id)
+            if document is not None:
+                return self._document_response(document, if_none_match)
+
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
+        state = await self.media_repository.get_media_state(media_code)
+        status_cd = state.trans_status_cd if kind == "transcription" else state.fedbk_status_cd
+        if status_cd not in COMPLETED_STATUS_CODES:
+            return self._pending_response(kind, media_code)
+
+        self._assume_uploaded(media_code, state.is_uploaded)
+
+        document = await self._load_document(kind, media_code, state.owner_id)
+        if document is None:
+            raise BaseAppException(
+                status_code=404,
+                description=f"No {kind} found for media {media_code}",
+                custom_error_code=CustomErrorCode.NOT_FOUND_ERROR,
+                data={"media_code": media_code},
+            )
+        return self._document_response(document, if_none_match)
+
+    async def get_transcript_window(
+        self,
+        media_code: str,
+        user_id: str,
+        from_index: Optional[int] = None,
+        to_index: Optional[int] = None,
+        from_time: Optional[float] = None,
+        to_time: Optional[float] = None,
+    ) -> Response:
+        """
+        Segments of a transcript selected by time range (seconds) or by [from_index, to_index).
+        The segment offset index maps the range to positions and Mongo slices only those
+        segments out of the document, capped at TRANSCRIPT_WINDOW_MAX_SEGMENTS per call.
+        """
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
+        state = await self.media_repository.get_media_state(media_code)
+        if state.trans_status_cd not in COMPLETED_STATUS_CODES:
+            return self._pending_response("transcription", media_code)
+        self._assume_uploaded(media_code, state.is_uploaded)
+
+        index = await self.media_repository.get_segment_index(media_code)
+        if index is None:
+            return JSONResponse(status_code=200, content=None)
+
+        total = index["count"]
+        if from_time is not None or to_time is not None:
+            first, last = window_for_time_range(index, from_time, to_time)
         else:
-            return {
-                "status_code": 202,
-                "content": {
-                    "media_code": media_code,
-                    "status": "Transcription generation is still under process",
-                },
-            }
+            first = min(from_index or 0, total)
+            last = total if to_index is None else min(to_index, total)
+        last = max(first, min(last, first + int(self.settings.TRANSCRIPT_WINDOW_MAX_SEGMENTS)))
+
+        segments = []
+        if last > first:
+            segments = await self.media_repository.get_transcription_segments(
+                media_code, first, last - first
+            )
+        window = TranscriptWindowResponse(
+            media_code=media_code,
+            total_segments=total,
+            start_index=first,
+            end_index=first + len(segments),
+            next_index=first + len(segments) if first + len(segments) < total else None,
+            segments=segments,
+        )
+        return JSONResponse(content=window.model_dump(mode="json"))
+
+    async def search_transcripts(
+        self,
+        query: str,
+        user_id: str,
+        scope: SearchScope = SearchScope.TEAM,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> TranscriptSearchPage:
+        """
+        Ranked transcripts containing every term of `query` within one segment, over the
+        caller's own media or those of their whole reporting line (everything for admins).
+        """
+        limit = min(limit or int(self.settings.PAGE_SIZE_DEFAULT), int(self.settings.PAGE_SIZE_MAX))
+        principal = await self.media_repository.require_principal(user_id)
+        if scope == SearchScope.TEAM and principal.is_admin:
+            owner_ids = None
+        else:
+            owner_ids = [principal.user_id]
+            if scope == SearchScope.TEAM:
+                owner_ids = await self.media_repository.user_repository.get_team(user_id)
+
+        result = await self.media_repository.search_transcripts(
+            query,
+            owner_ids,
+            offset,
+            limit,
+            int(self.settings.SEARCH_MAX_CANDIDATES),
+            int(self.settings.SEARCH_MAX_HIGHLIGHTS),
+        )
+        next_offset = offset + limit if offset + limit < result["total"] else None
+        return TranscriptSearchPage(
+            query=query,
+            total=result["total"],
+            offset=offset,
+            limit=limit,
+            next_offset=next_offset,
+            truncated=result["truncated"],
+            items=result["items"],
+        )
+
+    def _pending_response(self, kind: str, media_code: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=202,
+            content={
+                "media_code": media_code,
+                "status": "Transcription generation is still under process"
+                if kind == "transcription"
+                else "Feedback generation is still under progress",
+            },
+            headers={"Cache-Control": "no-store"},
+        )
+
+    async def _load_document(self, kind: str, media_code: str, owner_id: int) -> Optional[CachedDocument]:
+        """
+        Completed transcript/feedback as a cached, serialized document; read from Mongo on a miss
+        or when the stored revision no longer matches the cached one. None when Mongo has no
+        document yet, which is never cached.
+        """
+        revision = await self.media_repository.get_document_revision(kind, media_code)
+        if revision is None:
+            return None
+        cache = get_document_cache()
+        document = cache.get((kind, media_code))
+        if document is not None and document.revision == revision:
+            return document
+
+        if kind == "transcription":
+            content = await self.media_repository.get_transcription(media_code, check_uploaded=False)
+        else:
+            content = await self.media_repository.get_feedback(media_code, check_uploaded=False)
+        if content is None:
+            return None
+
+        body = json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+        # Documents written before revisions were stored are tagged by their content instead.
+        document = CachedDocument(
+            body=body,
+            etag=f'"{revision or sha256(body).hexdigest()[:32]}"',
+            owner_id=owner_id,
+            revision=revision,
+        )
+        cache.set((kind, media_code), document, len(body))
+        return document
+
+    async def get_media_detail(self, media_code: str, user_id: str) -> MediaDetailResponse:
+        """
+        Everything the call-review screen needs in one request: the media row, its statuses and
+        lead summary from one MySQL query, then the completed transcript and feedback fetched
+        from Mongo concurrently (or straight from the document cache).
+        """
+        detail = await self.media_repository.get_media_detail(media_code)
+        if detail is None:
+            raise InvalidMediaException(
+                description=f"Invalid media code provided {media_code}",
+                data={'media_code': media_code}
+            )
+        await self._assume_document_access(media_code, user_id, detail.owner_id)
+
+        kinds = []
+        if detail.is_uploaded or not self.settings.REQUIRE_UPLOADED_MEDIA:
+            if detail.trans_status_cd in COMPLETED_STATUS_CODES:
+                kinds.append("transcription")
+            if detail.fedbk_status_cd in COMPLETED_STATUS_CODES:
+                kinds.append("feedback")
+        documents = await asyncio.gather(
+            *(self._load_document(kind, media_code, detail.owner_id) for kind in kinds)
+        )
+        contents = {
+            kind: json.loads(document.body)
+            for kind, document in zip(kinds, documents) if document is not None
+        }
+
+        lead = None
+        if detail.lead_id is not None:
+            lead = MediaLeadSummary(
+                lead_id=detail.lead_id,
+                lead_name=detail.lead_name,
+                email=detail.lead_email,
+                phone=detail.lead_phone,
+                stage_code=detail.lead_stage_code,
+                assigned_clerk_id=detail.lead_assigned_clerk_id,
+            )
+        return MediaDetailResponse(
+            media_code=detail.media_code,
+            original_name=detail.original_name,
+            file_type=detail.file_type,
+            media_len=detail.media_len,
+            media_size=detail.media_size,
+            event_date=detail.event_date,
+            conv_type=detail.conv_type,
+            lang_code=detail.lang_code,
+            product=detail.product,
+            is_uploaded=bool(detail.is_uploaded),
+            trans_status_cd=detail.trans_status_cd,
+            fedbk_status_cd=detail.fedbk_status_cd,
+            lead=lead,
+            transcription=contents.get("transcription"),
+            feedback=contents.get("feedback"),
+        )
+
+    async def _assume_document_access(self, media_code: str, user_id: str, owner_id: int) -> None:
+        principal = get_principal_cache().get(user_id)
+        if principal is not None and (principal.is_admin or principal.user_id == owner_id):
+            return
+        await self.media_repository.assume_media_assigned_to(media_code, user_id)
+
+    def _document_response(self, document: CachedDocument, if_none_match: Optional[str]) -> Response:
+        headers = {
+            "ETag": document.etag,
+            "Cache-Control": "private, no-cache",
+        }
+        if _etag_matches(if_none_match, document.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(document.body, media_type="application/json", headers=headers)
+
+    async def get_statuses(self, media_codes: List[str], user_id: str) -> List[MediaStatusResponse]:
+        """
+        Transcription/feedback status of many media: one access check and one IN query.
+        """
+        media_codes = list(dict.fromkeys(media_codes))
+        max_codes = int(self.settings.STATUS_BULK_MAX_CODES)
+        if len(media_codes) > max_codes:
+            raise BaseAppException(
+                status_code=400,
+                description=f"At most {max_codes} media codes can be queried per request",
+                custom_error_code=CustomErrorCode.INVALID_MEDIA,
+                data={"media_count": len(media_codes)},
+            )
+
+        await self.media_repository.access_repository.assume_media_access(user_id, media_codes)
+        rows = await self.media_repository.get_statuses(media_codes)
+        statuses = {row.media_code: MediaStatusResponse(**row._asdict()) for row in rows}
+        return [statuses[code] for code in media_codes if code in statuses]
+
+    async def watch_statuses(
+        self,
+        media_codes: List[str],
+        user_id: str,
+        mode: StatusStreamMode = StatusStreamMode.SSE,
+        timeout: Optional[int] = None,
+    ) -> Response:
+        """
+        Waits on the transcription/feedback status of the given media through the shared status
+        watcher. SSE pushes every transition until all media reach a final state; long-poll
+        returns the latest statuses once they are all final or the timeout expires.
+        """
+        media_codes = list(dict.fromkeys(media_codes))
+        max_codes = int(self.settings.STATUS_STREAM_MAX_CODES)
+        if not media_codes or len(media_codes) > max_codes:
+            raise BaseAppException(
+                status_code=400,
+                description=f"Between 1 and {max_codes} media codes can be watched per request",
+                custom_error_code=CustomErrorCode.INVALID_MEDIA,
+                data={"media_count": len(media_codes)},
+            )
+
+        await self.media_repository.access_repository.assume_media_access(user_id, media_codes)
+
+        max_timeout = int(self.settings.STATUS_STREAM_TIMEOUT)
+        timeout = max_timeout if timeout is None else min(timeout, max_timeout)
+        if mode == StatusStreamMode.LONG_POLL:
+            # The wait runs in the body, once the request's DB connection is back in the pool.
+            return StreamingResponse(
+                self._long_poll_body(media_codes, timeout),
+                media_type="application/json",
+                headers={"Cache-Control": "no-store"},
+            )
+
+        return StreamingResponse(
+            self._sse_stream(media_codes, timeout),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-store",
+                "X-Accel-Buffering": "no",
+                # Keeps GZipMiddleware from buffering events until its block fills up.
+                "Content-Encoding": "identity",
+            },
+        )
+
+    async def _long_poll_body(self, media_codes: List[str], timeout: int) -> AsyncIterator[str]:
+        statuses: Dict[str, Dict[str, Any]] = {}
+        async for event in self._status_events(media_codes, timeout):
+            if event is not None:
+                statuses[event["media_code"]] = event
+        yield json.dumps([statuses[code] for code in media_codes if code in statuses])
+
+    async def _sse_stream(self, media_codes: List[str], timeout: int) -> AsyncIterator[str]:
+        async for event in self._status_events(media_codes, timeout):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    async def _status_events(
+        self, media_codes: List[str], timeout: int
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Status transitions of the given media, with None as a heartbeat while nothing changes.
+        Ends once every media is final or the timeout expires.
+        """
+        watcher = get_status_watcher()
+        heartbeat = int(self.settings.STATUS_STREAM_HEARTBEAT)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = set(media_codes)
+
+        queue = watcher.subscribe(media_codes)
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    media_code, state = await asyncio.wait_for(
+                        queue.get(), timeout=min(heartbeat, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                event = _status_event(media_code, state)
+                if event["is_final"]:
+                    pending.discard(media_code)
+                yield event
+        finally:
+            watcher.unsubscribe(queue, media_codes)
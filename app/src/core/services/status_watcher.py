@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.common.config.database import session_scope
+from app.src.core.repositories.media_repository import MediaRepository
+
+# (trans_status_cd, fedbk_status_cd)
+MediaState = Tuple[Optional[str], Optional[str]]
+
+
+class MediaStatusWatcher:
+    """
+    Single poller of cns_media_status shared by every status stream of the worker process.
+
+    Subscribers register the media codes they wait on and get a queue; each tick reads the
+    status of every watched code with one batched IN query and pushes only the transitions to
+    the queues of the subscribers of that code. The polling task runs only while somebody
+    is subscribed.
+    """
+
+    def __init__(self, interval: float, batch_size: int = 500) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._states: Dict[str, MediaState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.ticks = 0
+        self.queries = 0
+
+    def subscribe(self, media_codes: Iterable[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        for media_code in media_codes:
+            self._subscribers.setdefault(media_code, set()).add(queue)
+            if media_code in self._states:
+                queue.put_nowait((media_code, self._states[media_code]))
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, media_codes: Iterable[str]) -> None:
+        for media_code in media_codes:
+            subscribers = self._subscribers.get(media_code)
+            if subscribers is None:
+                continue
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[media_code]
+                self._states.pop(media_code, None)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def poll(self) -> None:
+        media_codes = list(self._subscribers)
+        self.ticks += 1
+        for start in range(0, len(media_codes), self.batch_size):
+            batch = media_codes[start:start + self.batch_size]
+            async with session_scope() as session:
+                rows = await MediaRepository(session).get_statuses(batch)
+            self.queries += 1
+
+            for row in rows:
+                state = (row.trans_status_cd, row.fedbk_status_cd)
+                if row.media_code not in self._subscribers or self._states.get(row.media_code) == state:
+                    continue
+                self._states[row.media_code] = state
+                for queue in self._subscribers.get(row.media_code, ()):
+                    queue.put_nowait((row.media_code, state))
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.poll()
+            except Exception as e:
+                logging.error(f"Media status poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "watched_media": len(self._subscribers),
+            "subscriptions": sum(len(queues) for queues in self._subscribers.values()),
+            "ticks": self.ticks,
+            "queries": self.queries
+        }
+
+
+@lru_cache
+def get_status_watcher() -> MediaStatusWatcher:
+    return MediaStatusWatcher(float(get_app_settings().STATUS_WATCH_INTERVAL))
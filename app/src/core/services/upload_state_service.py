@@ -0,0 +1,172 @@
+"""
+Upload state maintenance. `reconcile` is also the one-shot backfill of cm_is_uploaded for rows
+created before S3 events were ingested; run it before enabling REQUIRE_UPLOADED_MEDIA.
+
+    python -m app.src.core.services.upload_state_service reconcile
+    python -m app.src.core.services.upload_state_service probe
+    python -m app.src.core.services.upload_state_service watch --interval 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote_plus
+
+from fastapi import Depends
+
+from app.src.common.config.app_settings import get_app_settings, Settings
+from app.src.common.config.database import session_scope
+from app.src.core.repositories.aws_repositories import S3Repository
+from app.src.core.repositories.media_repository import MediaRepository
+
+
+class UploadStateService:
+    """
+    Keeps Media.is_uploaded in step with the media bucket, either from S3 event
+    notifications or by reconciling against a listing of the bucket, and probes the
+    headers of uploaded media for their duration and size.
+    """
+
+    def __init__(
+        self,
+        media_repository: MediaRepository = Depends(),
+        s3_repository: S3Repository = Depends(),
+        settings: Settings = Depends(get_app_settings),
+    ):
+        self.media_repository = media_repository
+        self.s3_repository = s3_repository
+        self.settings = settings
+
+    async def ingest_s3_events(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Accepts an S3 event notification, either as sent to a Lambda/SQS consumer or wrapped
+        in an SNS envelope, and marks the created media objects as uploaded in one update.
+        """
+        objects: Dict[str, Optional[int]] = {}
+        ignored = 0
+        for record in self._event_records(payload):
+            s3 = record.get("s3", {})
+            bucket = s3.get("bucket", {}).get("name")
+            key = s3.get("object", {}).get("key")
+            if (
+                not str(record.get("eventName", "")).startswith("ObjectCreated")
+                or bucket != self.settings.MEDIA_BUCKET
+                or not key
+            ):
+                ignored += 1
+                continue
+            objects[unquote_plus(key)] = s3.get("object", {}).get("size")
+
+        updated = await self.media_repository.mark_uploaded_by_keys(self.settings.MEDIA_BUCKET, objects)
+        return {"received": len(objects), "ignored": ignored, "updated": updated}
+
+    async def reconcile(self) -> Dict[str, Any]:
+        """
+        Marks the media of every listed bucket page as uploaded. Each page is its own unit of
+        work, so no transaction stays open for the whole listing and a failing page keeps the
+        pages before it.
+        """
+        listed = updated = 0
+        async for objects in self.s3_repository.iter_media_objects():
+            listed += len(objects)
+            async with session_scope() as session:
+                updated += await MediaRepository(session).mark_uploaded_by_keys(
+                    self.settings.MEDIA_BUCKET, objects
+                )
+        return {"listed": listed, "updated": updated}
+
+    async def probe(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fills media_len (seconds) and media_size for uploaded media that were not probed yet.
+        Media whose header cannot be read get a media_len of 0 so they are not retried;
+        media whose probe failed on S3 are retried by later runs, up to
+        MEDIA_PROBE_MAX_ATTEMPTS failures in total.
+        """
+        limit = limit or int(self.settings.MEDIA_PROBE_BATCH_SIZE)
+        candidates = await self.media_repository.get_unprobed_media(
+            limit, int(self.settings.MEDIA_PROBE_MAX_ATTEMPTS)
+        )
+        results = await asyncio.gather(
+            *[
+                self.s3_repository.probe_media(media.stored_file, media.file_type)
+                for media in candidates
+            ],
+            return_exceptions=True,
+        )
+
+        probes = []
+        failed = []
+        for media, result in zip(candidates, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Could not probe media {media.stored_file}: {result}")
+                failed.append(media.media_id)
+                continue
+            duration, size = result
+            probes.append(
+                {
+                    "id": media.media_id,
+                    "media_len": round(duration) if duration is not None else 0,
+                    "media_size": size,
+                }
+            )
+
+        await self.media_repository.update_media_probes(probes)
+        await self.media_repository.count_failed_probes(failed)
+        return {"probed": len(probes), "failed": len(failed)}
+
+    @staticmethod
+    def _event_records(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if payload.get("Type") == "Notification" and isinstance(payload.get("Message"), str):
+            payload = json.loads(payload["Message"])
+        return payload.get("Records") or []
+
+
+async def reconcile_uploads() -> Dict[str, Any]:
+    async with session_scope() as session:
+        media_repository = MediaRepository(session)
+        service = UploadStateService(
+            media_repository, S3Repository(media_repository), get_app_settings()
+        )
+        return await service.reconcile()
+
+
+async def probe_uploads() -> Dict[str, Any]:
+    async with session_scope() as session:
+        media_repository = MediaRepository(session)
+        service = UploadStateService(
+            media_repository, S3Repository(media_repository), get_app_settings()
+        )
+        return await service.probe()
+
+
+async def run_upload_reconciler(interval: int) -> None:
+    while True:
+        for stage in (reconcile_uploads, probe_uploads):
+            try:
+                result = await stage()
+                logging.info(f"{stage.__name__} finished: {result}")
+            except Exception as e:
+                logging.error(f"{stage.__name__} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("reconcile", help="mark media found in the bucket as uploaded, once")
+    commands.add_parser("probe", help="probe duration and size of uploaded media, once")
+    watch = commands.add_parser("watch", help="reconcile and probe forever, every --interval seconds")
+    watch.add_argument("--interval", type=int, default=int(get_app_settings().UPLOAD_RECONCILE_INTERVAL) or 300)
+
+    args = parser.parse_args()
+    if args.command == "reconcile":
+        print(await reconcile_uploads())
+    elif args.command == "probe":
+        print(await probe_uploads())
+    else:
+        await run_upload_reconciler(args.interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
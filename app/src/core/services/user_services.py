@@ -19,22 +19,24 @@ class UserService(BaseService):
     def __init__(
             self,
             repository: UserRepository = Depends(),
+            lead_repository: LeadRepository = Depends(),
             settings: Settings = Depends(get_app_settings)
     ) -> None:
         super().__init__("UserService")
         self.repository = repository
+        self.lead_repository = lead_repository
         self.settings = settings
 
-    def create_user(self, model: BaseModel) -> Optional[Dict[str, Any]]:
-        user = self.repository.add_user(model)
+    async def create_user(self, model: BaseModel) -> Optional[Dict[str, Any]]:
+        user = await self.repository.add_user(model)
         return CreateUserResponse.model_validate(
             {
                 'user_id': user.id
             }
         ).model_dump()
 
-    def create_user_group(self, model: BaseModel) -> Optional[Dict[str, Any]]:
-        user_group = self.repository.add_user_group(model)
+    async def create_user_group(self, model: BaseModel) -> Optional[Dict[str, Any]]:
+        user_group = await self.repository.add_user_group(model)
         return CreateUserGroupResponse.model_validate(
             {
                 'id': user_group.id,
@@ -42,9 +44,9 @@ class UserService(BaseService):
             }
         ).model_dump()
 
-    def update_user(self, user_id: str, user_details: UpdateUserRequest) -> str:
+    async def update_user(self, user_id: str, user_details: UpdateUserRequest) -> str:
         status = "FAILED"
-        if not self.repository.is_user_exists(user_id):
+        if not await self.repository.is_user_exists(user_id):
             raise BaseAppException(
                 status_code=404,
                 description="No Such User found",
@@ -52,14 +54,14 @@ class UserService(BaseService):
                 custom_error_code=CustomErrorCode.NOT_FOUND_ERROR
             )
 
-        self.repository.update_user(user_id, user_details.model_dump())
+        await self.repository.update_user(user_id, user_details.model_dump())
         status = "SUCCESS"
 
         return status
 
-    def delete_user(self, user_id: str) -> str:
+    async def delete_user(self, user_id: str) -> str:
         status = "FAILED"
-        if not self.repository.is_user_exists(user_id):
+        if not await self.repository.is_user_exists(user_id):
             raise BaseAppException(
                 status_code=404,
                 description="No Such User found",
@@ -67,19 +69,18 @@ class UserService(BaseService):
                 custom_error_code=CustomErrorCode.NOT_FOUND_ERROR
             )
 
-        self.repository.delete_user(user_id)
+        await self.repository.delete_user(user_id)
         satus = "SUCCESS"
         return status
 
-    def get_user_workspace(
+    async def get_user_workspace(
             self,
             user_id: str,
     ) -> UserWorkspaceResponse:
-        lead_repo: LeadRepository = LeadRepository()
-        self.repository.assume_user_exists(user_id)
+        await self.repository.assume_user_exists(user_id)
 
-        stages = lead_repo.get_stages()
-        leads = lead_repo.get_assigned_leads(user_id)
+        stages = await self.lead_repository.get_stages()
+        leads = await self.lead_repository.get_assigned_leads(user_id)
 
         workspace_response = UserWorkspaceResponse(stages=stages, leads=leads)
         return workspace_response
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime
 
 import uvicorn
@@ -7,6 +8,9 @@ from fastapi.exception_handlers import http_exception_handler
 from fastapi.exceptions import RequestValidationError
 from starlette.middleware.cors import CORSMiddleware
 
+from app.src.common.concurrency.blocking_executor import get_blocking_executor, run_blocking
+from app.src.common.config.app_settings import get_app_settings
+from app.src.common.config.database import get_database, get_mongodb, close_mongo_client
 from app.src.common.constants.global_constants import (
     ALLOWED_ORIGINS,
     ALLOWED_METHODS,
@@ -22,6 +26,8 @@ from app.src.common.exceptions.exception_handlers import (
 from app.src.core.routers.media_routers import media_router
 from app.src.core.routers.users_routers import user_router
 from app.src.core.routers.lead_routers import lead_router
+from app.src.core.routers.ops_routers import ops_router
+from app.src.core.services.status_watcher import get_status_watcher
 from fastapi.middleware.gzip import GZipMiddleware
 
 from app.src.common.security.authorization import JWTBearer
@@ -51,6 +57,28 @@ application.add_exception_handler(Exception, general_exception_handler)
 application.include_router(media_router, prefix="/media")
 application.include_router(user_router, prefix="/user")
 application.include_router(lead_router, prefix="/lead")
+application.include_router(ops_router, prefix="/ops")
+
+
+@application.on_event("startup")
+async def startup() -> None:
+    settings = get_app_settings()
+    if settings.MONGO_ENSURE_INDEXES:
+        try:
+            await run_blocking(get_mongodb().ensure_indexes)
+        except Exception as e:
+            logging.error(f"Failed to ensure MongoDB indexes: {e}")
+
+
+@application.on_event("shutdown")
+async def shutdown() -> None:
+    if get_status_watcher.cache_info().currsize:
+        get_status_watcher().stop()
+    if get_database.cache_info().currsize:
+        await get_database().dispose()
+    close_mongo_client()
+    if get_blocking_executor.cache_info().currsize:
+        get_blocking_executor().shutdown()
 
 
 @application.get("/", dependencies=[Depends(JWTBearer())], tags=["Home"])
@@ -0,0 +1,211 @@
+import datetime
+import io
+import os
+import tempfile
+
+# Settings are read from the environment at import time; tests never reach AWS or MySQL.
+for name, value in {
+    "MYSQLDB_SECRET": "test/mysql",
+    "MONGODB_SECRET": "test/mongodb",
+    "CLERK_SECRET": "test",
+    "CLERK_AUDIENCE": "test",
+    "REGION": "us-east-1",
+    "DEFAULT_SCHEMA": "callensights",
+    "MEDIA_BUCKET": "media",
+    "TRANSCRIPT_BUCKET": "transcripts",
+    "ANALYSIS_BUCKET": "analysis",
+    "MEDIA_MIN_SIZE": "1024",
+    "MEDIA_MAX_SIZE": "1073741824",
+    "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'callensights.db')}",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import MetaData, create_engine, make_url  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.src.common.config.app_settings import get_app_settings  # noqa: E402
+from app.src.common.config.database import get_mongodb  # noqa: E402
+from app.src.common.security import authorization  # noqa: E402
+from app.src.common.security.principal import get_principal_cache  # noqa: E402
+from app.src.core.models.db_models import (  # noqa: E402
+    Base, Lead, LeadStages, LeadTypes, Media, MediaStatus, User, UserGroup
+)
+from app.src.core.repositories import aws_repositories  # noqa: E402
+from app.src.core.services.media_service import get_document_cache  # noqa: E402
+from app.src.core.services.status_watcher import get_status_watcher  # noqa: E402
+
+
+def _test_metadata() -> MetaData:
+    # Seeds fill in only the columns the tests read, so every non-key column is nullable.
+    # cns_group_message is left out: its foreign key names a class rather than a table.
+    metadata = MetaData()
+    for name, table in Base.metadata.tables.items():
+        if name != "cns_group_message":
+            for column in table.to_metadata(metadata).columns:
+                column.nullable = not column.primary_key
+    return metadata
+
+
+@pytest.fixture
+def database():
+    """
+    The DATABASE_URL sqlite file, recreated with an admin (id 1) managing two reps, "rep" (2)
+    and "rep2" (3). rep owns lead 1 and media mc1-mc3, rep2 lead 2 and mc4-mc5; media with an
+    odd number are uploaded, mc1-mc2 are transcribed and mc1 has its feedback.
+    """
+    engine = create_engine(make_url(get_app_settings().DATABASE_URL).set(drivername="sqlite"))
+    metadata = _test_metadata()
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(UserGroup(id=1, group_name="sales"))
+        session.add_all([
+            User(id=1, clerk_id="admin", user_name="admin", role="ADMIN", user_group=1),
+            User(id=2, clerk_id="rep", user_name="rep", role="REP", user_group=1, manager_id=1),
+            User(id=3, clerk_id="rep2", user_name="rep2", role="REP", user_group=1, manager_id=1),
+        ])
+        session.add(LeadStages(id=1, code="NEW", description="New", is_active=True))
+        session.add(LeadTypes(id=1, code="T", name="T", description="T"))
+        session.add_all([
+            Lead(id=1, name="Lead 1", phone="1", assigned_to=2, lead_type_code="T", stage_id=1),
+            Lead(id=2, name="Lead 2", phone="2", assigned_to=3, lead_type_code="T", stage_id=1),
+        ])
+        for number in range(1, 6):
+            session.add(Media(
+                id=number,
+                media_code=f"mc{number}",
+                user_id=2 if number < 4 else 3,
+                lead_id=1 if number < 4 else 2,
+                original_name=f"call{number}.wav",
+                file_type="wav",
+                stored_file=f"mc{number}.wav",
+                bucket=get_app_settings().MEDIA_BUCKET,
+                event_date=datetime.datetime(2024, 1, number),
+                is_uploaded=number % 2 == 1,
+                conv_type="call",
+            ))
+            session.add(MediaStatus(
+                id=number,
+                media_id=number,
+                trans_status_cd="S" if number < 3 else "N",
+                fedbk_status_cd="C" if number == 1 else "R",
+            ))
+        session.commit()
+    get_principal_cache().clear()
+    yield engine
+    engine.dispose()
+
+
+def auth(clerk_id: str = "rep") -> dict:
+    """
+    Authorization header of a user; the client fixture accepts the clerk id as the token.
+    """
+    return {"Authorization": f"Bearer {clerk_id}"}
+
+
+@pytest.fixture
+def client(database, monkeypatch):
+    """
+    TestClient of the application on the seeded database, with tokens decoded to their
+    clerk id. Startup is not run, so nothing connects to MongoDB unless a test patches it in.
+    """
+    from application import application
+
+    monkeypatch.setattr(authorization.jwt_decoder, "decode_jwt", lambda token: {"user_id": token})
+    get_document_cache().clear()
+    aws_repositories.get_media_url_cache().clear()
+    yield TestClient(application)
+    if get_status_watcher.cache_info().currsize:
+        get_status_watcher().stop()
+        get_status_watcher.cache_clear()
+
+
+class FakeS3:
+    """
+    The S3 client calls the repositories make, over objects and multipart uploads kept in memory.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.completed = {}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://s3.test/{operation}/{Params['Key']}?part={Params.get('PartNumber')}"
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads) + len(self.completed) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def put_part(self, upload_id, part_number, size):
+        self.uploads[upload_id][part_number] = {"PartNumber": part_number, "ETag": f'"etag-{part_number}"', "Size": size}
+
+    def get_paginator(self, operation):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Key, UploadId):
+                yield {"Parts": [part for _, part in sorted(fake._upload(UploadId).items())]}
+
+        return Paginator()
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self._upload(UploadId)
+        self.completed[UploadId] = MultipartUpload["Parts"]
+        del self.uploads[UploadId]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._upload(UploadId)
+        del self.uploads[UploadId]
+
+    def _upload(self, upload_id):
+        if upload_id not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "No such upload"}}, "Upload")
+        return self.uploads[upload_id]
+
+    def list_objects_v2(self, Bucket, ContinuationToken=None):
+        keys = sorted(self.objects)
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + 2]
+        response = {
+            "Contents": [{"Key": key, "Size": len(self.objects[key])} for key in page],
+            "IsTruncated": start + 2 < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + 2)
+        return response
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[Key]
+        if Range is None:
+            return {"Body": io.BytesIO(data), "ContentLength": len(data)}
+        first, last = (int(bound) for bound in Range[len("bytes="):].split("-"))
+        chunk = data[first:last + 1]
+        return {
+            "Body": io.BytesIO(chunk),
+            "ContentLength": len(chunk),
+            "ContentRange": f"bytes {first}-{first + len(chunk) - 1}/{len(data)}",
+        }
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(aws_repositories, "client", lambda *args, **kwargs: fake)
+    aws_repositories.get_aws_client.cache_clear()
+    yield fake
+    aws_repositories.get_aws_client.cache_clear()
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """
+    The application's MongoDB on an in-memory mongomock client.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(get_mongodb(), "client", mongomock.MongoClient())
+    return get_mongodb()
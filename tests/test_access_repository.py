@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.src.common.config.database import session_scope
+from app.src.common.enum.access_outcome import AccessOutcome
+from app.src.common.exceptions.exceptions import (
+    InvalidMediaException, NoUserFoundException, NotAssignedToUserException
+)
+from app.src.common.security.principal import get_principal_cache
+from app.src.core.repositories.access_repository import AccessRepository
+
+
+def _run(check):
+    async def run():
+        async with session_scope() as session:
+            return await check(AccessRepository(session))
+
+    return asyncio.run(run())
+
+
+def test_media_outcomes(database):
+    outcomes = _run(lambda repository: repository.check_media("rep", ["mc1", "mc4", "missing"]))
+    assert outcomes == {
+        "mc1": AccessOutcome.GRANTED,
+        "mc4": AccessOutcome.NOT_ASSIGNED,
+        "missing": AccessOutcome.NO_SUCH_RESOURCE,
+    }
+    assert get_principal_cache().get("rep").user_id == 2
+
+
+def test_admin_is_granted_everything_that_exists(database):
+    outcomes = _run(lambda repository: repository.check_leads("admin", [1, 2, 3]))
+    assert outcomes == {
+        1: AccessOutcome.GRANTED,
+        2: AccessOutcome.GRANTED,
+        3: AccessOutcome.NO_SUCH_RESOURCE,
+    }
+
+
+def test_unknown_user(database):
+    outcomes = _run(lambda repository: repository.check_leads("nobody", [1, 2]))
+    assert outcomes == {1: AccessOutcome.NO_SUCH_USER, 2: AccessOutcome.NO_SUCH_USER}
+
+
+def test_no_resources_skips_the_query(database):
+    assert _run(lambda repository: repository.check_media("rep", [])) == {}
+
+
+@pytest.mark.parametrize("user_id, media_codes, exception", [
+    ("nobody", ["mc1"], NoUserFoundException),
+    ("rep", ["mc1", "missing"], InvalidMediaException),
+    ("rep", ["mc1", "mc4"], NotAssignedToUserException),
+])
+def test_assume_media_access_raises(database, user_id, media_codes, exception):
+    with pytest.raises(exception):
+        _run(lambda repository: repository.assume_media_access(user_id, media_codes))
+
+
+def test_assume_media_access_passes(database):
+    assert _run(lambda repository: repository.assume_media_access("rep2", ["mc4", "mc5"])) is None
@@ -0,0 +1,82 @@
+import pytest
+
+from app.src.common.cache import ttl_cache
+from app.src.common.cache.byte_lru_cache import ByteLRUCache
+from app.src.common.cache.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    cache.set("c", 3, expires_at=clock[0] + 60)
+
+    clock[0] += 10
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock[0] += 30
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    assert cache.get_stats() == {"size": 1, "maxsize": 10, "hits": 3, "misses": 2}
+
+
+def test_ttl_cache_without_ttl_never_expires(clock):
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1)
+    clock[0] += 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.pop("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+
+
+def test_byte_lru_cache_is_bounded_by_bytes():
+    cache = ByteLRUCache(max_bytes=100)
+    cache.set("a", "A", 40)
+    cache.set("b", "B", 40)
+    cache.get("a")
+    cache.set("c", "C", 40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.get_stats()["bytes"] == 80
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_lru_cache_replaces_and_skips_oversized_values():
+    cache = ByteLRUCache(max_bytes=100)
+    cache.set("a", "A", 40)
+    cache.set("a", "A2", 70)
+    assert cache.get("a") == "A2"
+    assert cache.get_stats()["bytes"] == 70
+
+    cache.set("huge", "H", 101)
+    assert cache.get("huge") is None
+    assert cache.get("a") == "A2"
+
+    cache.pop("a")
+    assert cache.get_stats()["bytes"] == 0
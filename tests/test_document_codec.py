@@ -0,0 +1,68 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from bson import Decimal128, ObjectId
+
+from app.src.common.storage.document_codec import (
+    PACKED_FIELD, REVISION_FIELD, decode_document, encode_document, is_encoded, projection_for, zstandard
+)
+
+CODECS = ["zlib"] + (["zstd"] if zstandard is not None else [])
+
+
+def _document():
+    return {
+        "_id": ObjectId(),
+        "media_code": "mc1",
+        "segments": [{"start": 0.0, "end": 1.5, "text": "hello"}],
+        "created_at": datetime.datetime(2024, 5, 1, 12, 30, 15, 123000),
+        "owner": ObjectId(),
+        "price": Decimal128(Decimal("1234.5600")),
+        "audio_hash": b"\x00\x01\xfe\xff" * 8,
+        "analysis": {"summary": "long text " * 200, "scores": [1, 2.5, None, True]},
+    }
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip_keeps_types(codec):
+    document = _document()
+    encoded = encode_document(document, codec, min_bytes=0)
+
+    assert is_encoded(encoded)
+    assert set(encoded[PACKED_FIELD]) == {"created_at", "owner", "price", "audio_hash", "analysis"}
+    assert encoded["segments"] == document["segments"]
+
+    decoded = decode_document(encoded)
+    assert decoded == document
+    assert isinstance(decoded["created_at"], datetime.datetime)
+    assert isinstance(decoded["owner"], ObjectId)
+    assert isinstance(decoded["price"], Decimal128)
+    assert decoded["price"].to_decimal() == Decimal("1234.5600")
+    assert isinstance(decoded["audio_hash"], bytes)
+
+
+def test_small_fields_stay_plain():
+    document = {"media_code": "mc1", "text": "short"}
+    assert encode_document(document, "zlib", min_bytes=1024) is document
+    assert decode_document(document) is document
+
+
+def test_decode_only_requested_fields():
+    encoded = encode_document(_document(), "zlib", min_bytes=0)
+    decoded = decode_document(encoded, ["analysis.summary"])
+
+    assert "analysis" in decoded
+    assert "created_at" not in decoded
+    assert decoded["media_code"] == "mc1"
+
+
+def test_projection_for_includes_packed_fields():
+    assert projection_for(None) == {"_id": 0, REVISION_FIELD: 0}
+    assert projection_for(["analysis.summary"]) == {
+        "_id": 0,
+        "analysis.summary": 1,
+        f"{PACKED_FIELD}.analysis": 1,
+        "_schema": 1,
+        "_codec": 1,
+    }
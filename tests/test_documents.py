@@ -0,0 +1,53 @@
+from conftest import auth
+
+TRANSCRIPT = "/media/get-transcript?media_code=mc1"
+
+
+def test_transcript_etag_and_304(client, mongo):
+    mongo.put_transcription({"media_code": "mc1", "text": "hello"}, 2)
+
+    response = client.get(TRANSCRIPT, headers=auth())
+    assert response.status_code == 200
+    assert response.json() == {"media_code": "mc1", "text": "hello"}
+    assert response.headers["cache-control"] == "private, no-cache"
+    etag = response.headers["etag"]
+
+    response = client.get(TRANSCRIPT, headers={**auth(), "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert client.get(TRANSCRIPT, headers={**auth(), "If-None-Match": '"stale", *'}).status_code == 304
+
+
+def test_rewritten_document_is_served_with_a_new_etag(client, mongo):
+    mongo.put_feedback({"media_code": "mc1", "score": 1})
+    etag = client.get("/media/get-feedback?media_code=mc1", headers=auth()).headers["etag"]
+
+    mongo.put_feedback({"media_code": "mc1", "score": 2})
+    response = client.get("/media/get-feedback?media_code=mc1", headers={**auth(), "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == {"media_code": "mc1", "score": 2}
+    assert response.headers["etag"] != etag
+    assert client.get("/media/detail?media_code=mc1", headers=auth()).json()["feedback"]["score"] == 2
+
+
+def test_documents_written_before_revisions_are_tagged_by_content(client, mongo):
+    mongo.get_connection()[mongo.database]["transcriptions"].insert_one({"media_code": "mc1", "text": "legacy"})
+
+    first = client.get(TRANSCRIPT, headers=auth())
+    second = client.get(TRANSCRIPT, headers=auth())
+    assert first.json() == {"media_code": "mc1", "text": "legacy"}
+    assert first.headers["etag"] == second.headers["etag"]
+
+
+def test_cached_documents_are_still_authorized(client, mongo):
+    mongo.put_transcription({"media_code": "mc1", "text": "hello"}, 2)
+    assert client.get(TRANSCRIPT, headers=auth()).status_code == 200
+
+    assert client.get(TRANSCRIPT, headers=auth("rep2")).status_code == 410
+    assert client.get(TRANSCRIPT, headers=auth("admin")).status_code == 200
+
+
+def test_pending_document_is_not_cached(client, mongo):
+    response = client.get("/media/get-transcript?media_code=mc3", headers=auth())
+    assert response.status_code == 202
+    assert response.headers["cache-control"] == "no-store"
@@ -0,0 +1,74 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.core.models.db_models import Activity
+from conftest import auth
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "EXPORT_BATCH_SIZE", 2)
+
+
+@pytest.fixture
+def activity(database):
+    with Session(database) as session:
+        session.add_all(
+            Activity(
+                done_by=2 if number < 3 else 3,
+                lead_id=1 if number < 3 else 2,
+                activity_code="COMMENT",
+                activity_desc=f"comment, {number}",
+                event_date=datetime.datetime(2024, 2, number + 1),
+            )
+            for number in range(5)
+        )
+        session.commit()
+
+
+def test_uploads_ndjson(client):
+    response = client.get("/media/export-uploads", headers=auth("admin"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"].startswith('attachment; filename="uploads-')
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["media_code"] for row in rows] == ["mc5", "mc4", "mc3", "mc2", "mc1"]
+    assert rows[-1]["user_id"] == "rep" and rows[-1]["is_uploaded"] is True
+    assert all("media_id" not in row for row in rows)
+
+
+def test_uploads_csv_is_limited_to_the_users_media(client):
+    response = client.get("/media/export-uploads", params={"format": "csv", "lead_id": 1}, headers=auth())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["media_code"] for row in rows] == ["mc3", "mc2", "mc1"]
+    assert "media_id" not in rows[0]
+    assert client.get("/media/export-uploads", params={"lead_id": 2}, headers=auth()).text == ""
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get("/media/export-uploads", params={"format": "xml"}, headers=auth()).status_code == 400
+
+
+def test_activity_csv(client, activity):
+    response = client.get("/lead/export-activity", params={"format": "csv"}, headers=auth())
+    assert response.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["comment"] for row in rows] == ["comment, 0", "comment, 1", "comment, 2"]
+    assert {row["lead_id"] for row in rows} == {"1"}
+
+
+def test_activity_ndjson_of_a_lead(client, activity):
+    response = client.get("/lead/export-activity", params={"lead_id": 2}, headers=auth("admin"))
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["activity_id"], row["user_id"]) for row in rows] == [(4, "rep2"), (5, "rep2")]
@@ -0,0 +1,109 @@
+import asyncio
+import struct
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.common.media.header_probe import RangeReader, probe_duration
+from app.src.core.models.db_models import Media
+from app.src.core.services.upload_state_service import probe_uploads
+
+
+def _reader(data, block_size=64):
+    fetches = []
+
+    def fetch(offset, length):
+        fetches.append((offset, length))
+        return data[offset:offset + length], len(data)
+
+    return RangeReader(fetch, block_size), fetches
+
+
+def _wav(seconds, byte_rate=16000, extra=b""):
+    fmt = struct.pack("<HHIIHH", 1, 1, byte_rate // 2, byte_rate, 2, 16)
+    audio = b"\x00" * int(seconds * byte_rate)
+    chunks = b"fmt " + struct.pack("<I", len(fmt)) + fmt + extra + b"data" + struct.pack("<I", len(audio)) + audio
+    return b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks
+
+
+def _box(box_type, body):
+    return struct.pack(">I", 8 + len(body)) + box_type + body
+
+
+def test_reads_inside_the_buffer_do_not_fetch():
+    reader, fetches = _reader(bytes(range(256)), block_size=64)
+
+    assert reader.read(10, 4) == bytes([10, 11, 12, 13])
+    assert reader.read(60, 4) == bytes([60, 61, 62, 63])
+    assert fetches == [(10, 64)]
+
+    assert reader.read(100, 8) == bytes(range(100, 108))
+    assert fetches == [(10, 64), (100, 64)]
+    assert reader.get_size() == 256
+    assert reader.read(300, 4) == b""
+    assert reader.requests == 2
+
+
+def test_wav_duration_skips_chunks_before_data():
+    # odd sized chunk, followed by its pad byte
+    data = _wav(2.5, extra=b"LIST" + struct.pack("<I", 101) + b"x" * 101 + b"\x00")
+    reader, _ = _reader(data, block_size=1024)
+    assert probe_duration("wav", reader) == 2.5
+
+
+def test_wav_streaming_size_uses_rest_of_file():
+    data = bytearray(_wav(1.0))
+    data[40:44] = struct.pack("<I", 0xFFFFFFFF)
+    reader, _ = _reader(bytes(data))
+    assert probe_duration("WAV", reader) == 1.0
+
+
+def test_mp3_cbr_duration_after_id3_tag():
+    tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 20]) + b"\x00" * 20
+    frame = b"\xff\xfb\x90\x00" + b"\x00" * 413
+    data = tag + frame * 100
+    reader, _ = _reader(data, block_size=4096)
+    assert abs(probe_duration("mp3", reader) - len(frame) * 100 * 8 / 128000) < 1e-9
+
+
+def test_mp4_jumps_over_mdat_to_moov():
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 90500) + b"\x00" * 80)
+    data = _box(b"ftyp", b"isom\x00\x00\x02\x00") + _box(b"mdat", b"\x00" * 100000) + _box(b"moov", mvhd)
+    reader, fetches = _reader(data, block_size=64)
+
+    assert probe_duration("m4a", reader) == 90.5
+    assert all(offset < 32 or offset > 100000 for offset, _ in fetches)
+
+
+def test_unknown_or_broken_headers_give_none():
+    reader, _ = _reader(b"not a media file")
+    assert probe_duration("ogg", reader) is None
+    assert probe_duration("wav", reader) is None
+    assert probe_duration("mp4", _reader(b"\x00\x00\x00\x04abcd")[0]) is None
+
+
+def test_failing_probes_stop_after_max_attempts(database, s3, monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "MEDIA_PROBE_BATCH_SIZE", 1)
+    monkeypatch.setattr(get_app_settings(), "MEDIA_PROBE_MAX_ATTEMPTS", 2)
+    # mc1.wav is missing from the bucket, mc5.wav is not a wav file
+    s3.objects = {"mc3.wav": _wav(3.0), "mc5.wav": b"not a media file"}
+
+    runs = [asyncio.run(probe_uploads()) for _ in range(5)]
+    assert runs == [
+        {"probed": 0, "failed": 1},
+        {"probed": 0, "failed": 1},
+        {"probed": 1, "failed": 0},
+        {"probed": 1, "failed": 0},
+        {"probed": 0, "failed": 0},
+    ]
+    with Session(database) as session:
+        rows = session.execute(
+            select(Media.media_code, Media.media_len, Media.media_size, Media.probe_attempts)
+            .where(Media.is_uploaded.is_(True))
+        ).all()
+    assert sorted(rows) == [
+        ("mc1", None, None, 2),
+        ("mc3", 3, len(_wav(3.0)), 0),
+        ("mc5", 0, 16, 0),
+    ]
@@ -0,0 +1,82 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.src.core.models.db_models import Media, MediaUploadPart
+from conftest import auth
+
+
+def _media(database, media_code):
+    with Session(database) as session:
+        return session.execute(
+            select(Media.is_uploaded, Media.upload_id, Media.media_size).where(Media.media_code == media_code)
+        ).one()
+
+
+def test_initiate_presign_resume_and_complete(client, database, s3):
+    response = client.post("/media/multipart/initiate?media_code=mc2", headers=auth())
+    assert response.status_code == 200
+    upload_id = response.json()["upload_id"]
+    assert response.json()["parts"] == []
+
+    response = client.post(
+        "/media/multipart/presign", json={"media_code": "mc2", "part_numbers": [2, 1, 1]}, headers=auth()
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()["urls"]) == ["1", "2"]
+
+    s3.put_part(upload_id, 2, 700)
+    s3.put_part(upload_id, 1, 1000)
+    response = client.post("/media/multipart/initiate?media_code=mc2", headers=auth())
+    assert response.json()["upload_id"] == upload_id
+    assert [part["part_number"] for part in response.json()["parts"]] == [1, 2]
+
+    response = client.post("/media/multipart/complete", json={"media_code": "mc2"}, headers=auth())
+    assert response.status_code == 200
+    assert response.json() == {"media_code": "mc2", "is_uploaded": True, "parts": 2}
+    assert [part["PartNumber"] for part in s3.completed[upload_id]] == [1, 2]
+    assert _media(database, "mc2") == (True, None, 1700)
+    with Session(database) as session:
+        assert session.execute(select(MediaUploadPart)).all() == []
+
+    response = client.post("/media/multipart/initiate?media_code=mc2", headers=auth())
+    assert response.status_code == 409
+
+
+def test_presign_is_capped_by_the_maximum_media_size(client, s3):
+    client.post("/media/multipart/initiate?media_code=mc2", headers=auth())
+
+    response = client.post(
+        "/media/multipart/presign", json={"media_code": "mc2", "part_numbers": [1, 65]}, headers=auth()
+    )
+    assert response.status_code == 400
+    assert response.json()["error_data"]["max_part_number"] == 64
+
+
+def test_complete_rejects_a_size_outside_the_limits(client, database, s3):
+    upload_id = client.post("/media/multipart/initiate?media_code=mc2", headers=auth()).json()["upload_id"]
+    s3.put_part(upload_id, 1, 100)
+
+    response = client.post("/media/multipart/complete", json={"media_code": "mc2"}, headers=auth())
+    assert response.status_code == 400
+    assert response.json()["error_data"] == {"media_code": "mc2", "media_size": 100}
+    assert upload_id not in s3.uploads and upload_id not in s3.completed
+    assert _media(database, "mc2") == (False, None, None)
+
+
+def test_abort(client, database, s3):
+    upload_id = client.post("/media/multipart/initiate?media_code=mc4", headers=auth("rep2")).json()["upload_id"]
+
+    response = client.delete("/media/multipart/abort?media_code=mc4", headers=auth("rep2"))
+    assert response.status_code == 200
+    assert response.json() == {"media_code": "mc4", "upload_id": upload_id, "aborted": True}
+    assert s3.uploads == {}
+    assert _media(database, "mc4") == (False, None, None)
+
+    response = client.delete("/media/multipart/abort?media_code=mc4", headers=auth("rep2"))
+    assert response.status_code == 400
+
+
+def test_uploads_of_other_users_media_are_refused(client, s3):
+    response = client.post("/media/multipart/initiate?media_code=mc4", headers=auth())
+    assert response.status_code == 410
+    assert s3.uploads == {}
@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+from app.src.common.enum.custom_error_code import CustomErrorCode
+from app.src.common.exceptions.application_exception import BaseAppException
+from app.src.core.services.media_service import decode_cursor, encode_cursor
+from conftest import auth
+
+
+@pytest.mark.parametrize("event_date", [
+    datetime.datetime(2024, 1, 2, 3, 4, 5),
+    datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+    datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc),
+])
+def test_cursor_round_trip(event_date):
+    cursor = encode_cursor(event_date, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (event_date, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor(datetime.datetime(2024, 1, 1), 1)[:-3] + "$$$"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(BaseAppException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
+    assert error.value.custom_error_code == CustomErrorCode.INVALID_CURSOR.value
+
+
+def test_get_uploads_pages_by_cursor(client):
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/media/get-uploads", params=params, headers=auth("admin")).json()
+        pages.append([item["media_code"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [["mc5", "mc4"], ["mc3", "mc2"], ["mc1"]]
+
+
+def test_get_uploads_filters(client):
+    page = client.get("/media/get-uploads", params={"is_uploaded": True}, headers=auth()).json()
+    assert [item["media_code"] for item in page["items"]] == ["mc3", "mc1"]
+    assert page["next_cursor"] is None
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.src.common.config.database import session_scope
+from app.src.common.security.principal import get_principal_cache
+from app.src.core.repositories.user_repository import UserRepository
+
+
+def _run(change):
+    # The entry must survive until the session commits, so the change is checked against it first.
+    async def run():
+        async with session_scope() as session:
+            repository = UserRepository(session)
+            await repository.get_principal("rep")
+            await change(repository)
+            assert get_principal_cache().get("rep") is not None
+
+    asyncio.run(run())
+
+
+def test_principal_is_cached(database):
+    async def resolve():
+        async with session_scope() as session:
+            return await UserRepository(session).get_principal("rep")
+
+    principal = asyncio.run(resolve())
+    assert (principal.user_id, principal.role, principal.manager_id) == (2, "REP", 1)
+    assert get_principal_cache().get("rep") == principal
+
+
+def test_update_evicts_the_principal_once_committed(database):
+    _run(lambda repository: repository.update_user("rep", {"role": "ADMIN"}))
+    assert get_principal_cache().get("rep") is None
+
+
+def test_delete_evicts_the_principal_once_committed(database):
+    _run(lambda repository: repository.delete_user("rep"))
+    assert get_principal_cache().get("rep") is None
+
+
+def test_rollback_keeps_the_principal(database):
+    async def fail(repository):
+        await repository.update_user("rep", {"role": "ADMIN"})
+        raise RuntimeError("abort")
+
+    with pytest.raises(RuntimeError):
+        _run(fail)
+    assert get_principal_cache().get("rep").role == "REP"
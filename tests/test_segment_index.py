@@ -0,0 +1,57 @@
+from app.src.common.config.app_settings import get_app_settings
+from app.src.common.media.segment_index import build_segment_index, segment_bounds, window_for_time_range
+from conftest import auth
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "text": "a"},
+    {"start": 2.0, "end": 5.0, "text": "b"},
+    {"start": 5.0, "end": 6.0, "text": "c"},
+    {"start": 8.0, "end": 9.5, "text": "d"},
+]
+
+
+def test_segment_bounds_by_transcriber():
+    assert segment_bounds({"start": 1, "end": "2.5"}) == (1.0, 2.5)
+    assert segment_bounds({"start_time": 3, "end_time": 4}) == (3.0, 4.0)
+    assert segment_bounds({"start": 1}) == (1.0, None)
+    assert segment_bounds({"text": "no timings"}) == (None, None)
+
+
+def test_build_carries_missing_bounds_and_keeps_order():
+    index = build_segment_index("mc1", [
+        {"start": 1.0, "end": 2.0},
+        {"text": "untimed"},
+        {"start": 0.5, "end": 3.0},
+        {"start_time": 4.0},
+    ])
+    assert index == {
+        "media_code": "mc1",
+        "count": 4,
+        "starts": [1.0, 1.0, 1.0, 4.0],
+        "ends": [2.0, 1.0, 3.0, 4.0],
+    }
+
+
+def test_window_for_time_range():
+    index = build_segment_index("mc1", SEGMENTS)
+
+    assert window_for_time_range(index, None, None) == (0, 4)
+    assert window_for_time_range(index, 1.0, 5.5) == (0, 3)
+    assert window_for_time_range(index, 2.0, 5.0) == (1, 2)
+    # a start inside a gap begins with the next segment
+    assert window_for_time_range(index, 6.5, None) == (3, 4)
+    assert window_for_time_range(index, 10.0, None) == (4, 4)
+    assert window_for_time_range(index, 5.0, 1.0) == (2, 2)
+
+
+def test_transcript_window_endpoint(client, mongo, monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "TRANSCRIPT_WINDOW_MAX_SEGMENTS", 2)
+    mongo.put_transcription({"media_code": "mc1", "segments": SEGMENTS}, 2)
+
+    window = client.get("/media/transcript-window?media_code=mc1&from_time=1.0", headers=auth()).json()
+    assert (window["total_segments"], window["start_index"], window["end_index"], window["next_index"]) == (4, 0, 2, 2)
+    assert [segment["text"] for segment in window["segments"]] == ["a", "b"]
+
+    window = client.get("/media/transcript-window?media_code=mc1&from_index=2", headers=auth()).json()
+    assert [segment["text"] for segment in window["segments"]] == ["c", "d"]
+    assert window["next_index"] is None
@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.core.models.db_models import MediaStatus
+from conftest import auth
+
+
+@pytest.fixture(autouse=True)
+def fast_watcher(monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "STATUS_WATCH_INTERVAL", 0.05)
+    monkeypatch.setattr(get_app_settings(), "STATUS_STREAM_HEARTBEAT", 1)
+
+
+def _finish_later(database):
+    def finish():
+        time.sleep(0.3)
+        with Session(database) as session:
+            session.execute(update(MediaStatus).where(MediaStatus.media_id == 2).values(fedbk_status_cd="C"))
+            session.execute(
+                update(MediaStatus).where(MediaStatus.media_id == 3).values(trans_status_cd="E", fedbk_status_cd="E")
+            )
+            session.commit()
+
+    thread = threading.Thread(target=finish)
+    thread.start()
+    return thread
+
+
+def test_sse_pushes_transitions_until_final(client, database):
+    thread = _finish_later(database)
+    with client.stream("GET", "/media/status-stream?media_code=mc2&media_code=mc3", headers=auth()) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        lines = [line for line in response.iter_lines() if line.startswith(("event:", "data:"))]
+    thread.join()
+
+    events = [json.loads(data[len("data: "):]) for data in lines[1::2]]
+    assert lines[-2:] == ["event: end", "data: {}"]
+    assert events[:2] == [
+        {"media_code": "mc2", "trans_status_cd": "S", "fedbk_status_cd": "R", "is_final": False},
+        {"media_code": "mc3", "trans_status_cd": "N", "fedbk_status_cd": "R", "is_final": False},
+    ]
+    assert {event["media_code"] for event in events[2:-1] if event["is_final"]} == {"mc2", "mc3"}
+
+
+def test_long_poll_waits_for_final_statuses(client, database):
+    thread = _finish_later(database)
+    response = client.get("/media/status-stream?media_code=mc1&media_code=mc2&mode=long-poll", headers=auth())
+    thread.join()
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"media_code": "mc1", "trans_status_cd": "S", "fedbk_status_cd": "C", "is_final": True},
+        {"media_code": "mc2", "trans_status_cd": "S", "fedbk_status_cd": "C", "is_final": True},
+    ]
+
+
+def test_long_poll_returns_latest_statuses_on_timeout(client):
+    started = time.monotonic()
+    response = client.get("/media/status-stream?media_code=mc3&mode=long-poll&timeout=1", headers=auth())
+
+    assert response.json() == [
+        {"media_code": "mc3", "trans_status_cd": "N", "fedbk_status_cd": "R", "is_final": False}
+    ]
+    assert time.monotonic() - started >= 1
+
+
+def test_status_stream_checks_access(client, monkeypatch):
+    assert client.get("/media/status-stream?media_code=mc4", headers=auth()).status_code == 410
+
+    monkeypatch.setattr(get_app_settings(), "STATUS_STREAM_MAX_CODES", 1)
+    response = client.get("/media/status-stream?media_code=mc1&media_code=mc2", headers=auth())
+    assert response.status_code == 400
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.src.common.config.app_settings import get_app_settings
+from app.src.core.models.db_models import Media
+from app.src.core.services.upload_state_service import reconcile_uploads
+from conftest import auth
+
+
+def _event(event_name, key, size=None, bucket=None):
+    s3_object = {"key": key} if size is None else {"key": key, "size": size}
+    return {
+        "eventName": event_name,
+        "s3": {"bucket": {"name": bucket or get_app_settings().MEDIA_BUCKET}, "object": s3_object},
+    }
+
+
+EVENT = {"Records": [
+    _event("ObjectCreated:Put", "mc2.wav", 2048),
+    _event("ObjectCreated:CompleteMultipartUpload", "mc4.wav"),
+    _event("ObjectRemoved:Delete", "mc1.wav"),
+    _event("ObjectCreated:Put", "mc2.wav", 2048, bucket="elsewhere"),
+]}
+
+
+def _uploads(database):
+    with Session(database) as session:
+        return dict(session.execute(select(Media.media_code, Media.is_uploaded)).all())
+
+
+@pytest.fixture
+def ingest_token(monkeypatch):
+    monkeypatch.setattr(get_app_settings(), "INGEST_TOKEN", "service-token")
+    return "service-token"
+
+
+@pytest.mark.parametrize("headers", [{}, auth("service"), auth("rep")])
+def test_ingest_requires_the_service_token(client, database, ingest_token, headers):
+    response = client.post("/media/events/s3", json=EVENT, headers=headers)
+    assert response.status_code == 403
+    assert _uploads(database)["mc2"] is False
+
+
+def test_ingest_is_closed_without_a_configured_token(client):
+    assert get_app_settings().INGEST_TOKEN is None
+    response = client.post("/media/events/s3", json=EVENT, headers=auth("service-token"))
+    assert response.status_code == 403
+
+
+def test_ingest_marks_created_objects_uploaded(client, database, ingest_token):
+    response = client.post("/media/events/s3", json=EVENT, headers=auth(ingest_token))
+    assert response.status_code == 200
+    assert response.json() == {"received": 2, "ignored": 2, "updated": 2}
+    assert _uploads(database) == {"mc1": True, "mc2": True, "mc3": True, "mc4": True, "mc5": True}
+    with Session(database) as session:
+        assert session.scalar(select(Media.media_size).where(Media.media_code == "mc2")) == 2048
+
+
+def test_ingest_unwraps_sns_notifications(client, database, ingest_token):
+    envelope = {"Type": "Notification", "Message": json.dumps({"Records": EVENT["Records"][:1]})}
+    response = client.post("/media/events/s3", json=envelope, headers=auth(ingest_token))
+    assert response.json() == {"received": 1, "ignored": 0, "updated": 1}
+
+
+def test_reconcile_pages_through_the_bucket(database, s3):
+    s3.objects = {"mc1.wav": b"1", "mc2.wav": b"22", "mc4.wav": b"4444", "unknown.wav": b"?"}
+
+    assert asyncio.run(reconcile_uploads()) == {"listed": 4, "updated": 2}
+    assert _uploads(database) == {"mc1": True, "mc2": True, "mc3": True, "mc4": True, "mc5": True}